@@ -0,0 +1,66 @@
+"""
+Opaque cursors of the listings: the sort values of the first or last entity of a page, so the next page is
+read right after them (Elasticsearch `search_after`) instead of skipping every entity before it.
+
+A cursor is the compact JSON of its fields in base64url, followed by an HMAC of it: clients cannot forge
+the position, nor reuse a cursor with another sort, direction or search.
+"""
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import os
+import secrets
+from dataclasses import dataclass
+
+# Shared by every instance of the API. The random default is only stable within a process tree
+# (gunicorn workers fork from a preloaded master)
+CURSOR_SECRET_KEY = os.getenv("CURSOR_SECRET_KEY", "").encode() or secrets.token_bytes(32)
+SIGNATURE_SIZE = 12
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class Cursor:
+    sort_values: list
+    backward: bool
+    # Listing the cursor was made for
+    sort: str
+    direction: str
+    search: str | None
+
+    def encode(self, key: bytes = CURSOR_SECRET_KEY) -> str:
+        payload = json.dumps(
+            [self.sort_values, self.backward, self.sort, self.direction, self.search],
+            separators=(",", ":"),
+            ensure_ascii=False,
+        ).encode()
+        return f"{_b64encode(payload)}.{_b64encode(_sign(payload, key))}"
+
+    @classmethod
+    def decode(cls, cursor: str, key: bytes = CURSOR_SECRET_KEY) -> "Cursor":
+        try:
+            encoded_payload, encoded_signature = cursor.split(".")
+            payload, signature = _b64decode(encoded_payload), _b64decode(encoded_signature)
+        except (ValueError, binascii.Error):
+            raise InvalidCursorError("Malformed cursor")
+        if not hmac.compare_digest(signature, _sign(payload, key)):
+            raise InvalidCursorError("Invalid cursor signature")
+        sort_values, backward, sort, direction, search = json.loads(payload)
+        return cls(sort_values=sort_values, backward=backward, sort=sort, direction=direction, search=search)
+
+
+def _sign(payload: bytes, key: bytes) -> bytes:
+    return hmac.new(key, payload, hashlib.sha256).digest()[:SIGNATURE_SIZE]
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
\ No newline at end of file
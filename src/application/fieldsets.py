@@ -0,0 +1,42 @@
+"""
+Sparse fieldsets: listings that return only some fields of their entities (`fields=id,title,banner_url`).
+
+Entities cannot be built from partial documents, so each combination of fields gets its own model with only
+those fields, created once and cached.
+"""
+from functools import lru_cache
+
+from pydantic import BaseModel, create_model
+
+from src.application.listing import ListOutput
+from src.domain.entity import Entity
+
+# Returned by every fieldset: entities are identified by it
+ALWAYS_INCLUDED = frozenset({"id"})
+
+
+class InvalidFieldsError(ValueError):
+    pass
+
+
+def parse_fields(value: str | None) -> frozenset[str] | None:
+    """`id,title` -> {"id", "title"}, None when every field is requested."""
+    if not value:
+        return None
+    return frozenset(field.strip() for field in value.split(",") if field.strip()) | ALWAYS_INCLUDED
+
+
+@lru_cache(maxsize=256)
+def sparse_model(entity: type[Entity], fields: frozenset[str]) -> type[BaseModel]:
+    if unknown := fields - entity.model_fields.keys():
+        raise InvalidFieldsError(f"Unknown {entity.__name__} fields: {', '.join(sorted(unknown))}")
+    return create_model(
+        f"{entity.__name__}Fields",
+        # Same order as the entity, whatever the order they were requested in
+        **{name: (info.annotation, info) for name, info in entity.model_fields.items() if name in fields},
+    )
+
+
+@lru_cache(maxsize=256)
+def sparse_list_output(entity: type[Entity], fields: frozenset[str]) -> type[ListOutput]:
+    return ListOutput[sparse_model(entity, fields)]
\ No newline at end of file
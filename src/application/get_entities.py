@@ -0,0 +1,29 @@
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+from src.application.timing import timed
+from src.domain.entity import Entity
+from src.domain.repository import Repository
+
+# Ids per lookup, like the largest listing page
+MAX_IDS = 100
+
+
+class GetEntitiesInput(BaseModel):
+    ids: list[UUID] = Field(min_length=1, max_length=MAX_IDS)
+
+
+class GetEntitiesOutput[T: Entity](BaseModel):
+    data: list[T] = Field(default_factory=list)
+
+
+class GetEntities[T: Entity]:
+    """Entities with the given ids, in the same order. Unknown ids are left out."""
+
+    def __init__(self, repository: Repository[T]) -> None:
+        self.repository = repository
+
+    def execute(self, input: GetEntitiesInput) -> GetEntitiesOutput[T]:
+        with timed("use_case"):
+            return GetEntitiesOutput(data=self.repository.get_by_ids(input.ids))
\ No newline at end of file
@@ -14,4 +14,4 @@ class ListCastMemberInput(ListInput[CastMemberSortableFields]):
 
 
 class ListCastMember(ListEntity[CastMember]):
-    pass
\ No newline at end of file
+    entity = CastMember
\ No newline at end of file
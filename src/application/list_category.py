@@ -15,4 +15,4 @@ class ListCategoryInput(ListInput[CategorySortableFields]):
 
 
 class ListCategory(ListEntity[Category]):
-    pass
\ No newline at end of file
+    entity = Category
\ No newline at end of file
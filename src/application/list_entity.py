@@ -1,4 +1,8 @@
+from src.application.cursor import Cursor, InvalidCursorError
+from src.application.fieldsets import sparse_list_output
 from src.application.listing import ListInput, ListOutput, ListOutputMeta
+from src.application.read_models import ReadModelListOutput
+from src.application.timing import timed
 from src.domain.entity import Entity
 from src.domain.repository import Repository
 
@@ -14,21 +18,73 @@ Também poderíamos fazer:
 """
 
 class ListEntity[T: Entity]:
-    def __init__(self, repository: Repository[T]) -> None:
+    entity: type[T]
+
+    def __init__(self, repository: Repository[T], read_models: bool = False) -> None:
+        """
+        :param read_models: Page the read models of the documents (see `read_models`) instead of entities,
+            for callers that only serialize them. Sparse fieldsets are still paged as models of the fieldset
+        """
         self.repository = repository
+        self.read_models = read_models
+
+    def execute(self, input: ListInput) -> ListOutput[T] | ReadModelListOutput:
+        with timed("use_case"):
+            return self._execute(input)
 
-    def execute(self, input: ListInput) -> ListOutput[T]:
+    def _execute(self, input: ListInput) -> ListOutput[T] | ReadModelListOutput:
+        cursor = self._decode_cursor(input) if input.cursor else None
+        backward = cursor is not None and cursor.backward
+        fields = None
+        if input.fields is not None:
+            # Cursors are made of the sort field and the id: both are fetched
+            fields = input.fields | {input.sort} if input.sort else input.fields
+        output_type = sparse_list_output(self.entity, fields) if fields else ListOutput
         entities = self.repository.search(
             search=input.search,
             page=input.page,
             per_page=input.per_page,
             sort=input.sort,
-            direction=input.direction,
+            # A previous page is read backwards from its cursor, then put back in order
+            direction=input.direction.reversed() if backward else input.direction,
+            search_after=cursor.sort_values if cursor else None,
+            fields=fields,
+            read_models=self.read_models,
         )
+        if backward:
+            entities.reverse()
+
         meta = ListOutputMeta(
             page=input.page,
             per_page=input.per_page,
             sort=input.sort,
             direction=input.direction,
         )
-        return ListOutput(data=entities, meta=meta)
\ No newline at end of file
+        if input.sort and entities:
+            # A full page may be followed by more entities, a partial one ends the listing
+            full_page = len(entities) == input.per_page
+            if full_page or backward:
+                meta.next_cursor = self._cursor(input, entities[-1], backward=False)
+            if (full_page and backward) or (cursor and not backward) or (not cursor and input.page > 1):
+                meta.prev_cursor = self._cursor(input, entities[0], backward=True)
+        if self.read_models and not fields:
+            return ReadModelListOutput(data=entities, meta=meta)
+        return output_type(data=entities, meta=meta)
+
+    @staticmethod
+    def _decode_cursor(input: ListInput) -> Cursor:
+        cursor = Cursor.decode(input.cursor)
+        if (cursor.sort, cursor.direction, cursor.search) != (input.sort, input.direction, input.search):
+            raise InvalidCursorError("Cursor of another listing: keep the sort, direction and search of its page")
+        return cursor
+
+    @staticmethod
+    def _cursor(input: ListInput, entity: T, backward: bool) -> str:
+        # Same values, in the same order, as the sort of the repository: the sort field, then the id
+        return Cursor(
+            sort_values=[getattr(entity, input.sort), str(entity.id)],
+            backward=backward,
+            sort=input.sort,
+            direction=input.direction,
+            search=input.search,
+        ).encode()
\ No newline at end of file
@@ -14,4 +14,4 @@ class ListGenreInput(ListInput[GenreSortableFields]):
 
 
 class ListGenre(ListEntity[Genre]):
-    pass
\ No newline at end of file
+    entity = Genre
\ No newline at end of file
@@ -14,4 +14,4 @@ class ListVideoInput(ListInput):
 
 
 class ListVideo(ListEntity[Video]):
-    pass
\ No newline at end of file
+    entity = Video
\ No newline at end of file
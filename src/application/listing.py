@@ -11,12 +11,17 @@ class SortDirection(StrEnum):
     ASC = "asc"
     DESC = "desc"
 
+    def reversed(self) -> "SortDirection":
+        return SortDirection.DESC if self == SortDirection.ASC else SortDirection.ASC
+
 
 class ListOutputMeta(BaseModel):
     page: int = 1
     per_page: int = DEFAULT_PAGINATION_SIZE
     sort: str | None = None
     direction: SortDirection = SortDirection.ASC
+    next_cursor: str | None = None
+    prev_cursor: str | None = None
 
 
 class ListOutput[T: Entity](BaseModel):
@@ -29,4 +34,8 @@ class ListInput[SortableFieldsType: StrEnum](BaseModel):
     page: int = 1
     per_page: int = DEFAULT_PAGINATION_SIZE
     sort: SortableFieldsType | None = None
-    direction: SortDirection = SortDirection.ASC
\ No newline at end of file
+    direction: SortDirection = SortDirection.ASC
+    # Opaque position from the meta of a previous page. Takes precedence over `page`
+    cursor: str | None = None
+    # Sparse fieldset, every field when None
+    fields: frozenset[str] | None = None
\ No newline at end of file
@@ -0,0 +1,171 @@
+"""
+Read-only representations of the listed entities, for the query side.
+
+The REST listings serve the documents of the index as they are: building them back into `Entity` models
+(with validation, sets of UUID objects and datetimes) only to serialize them again is wasted work. Read
+models are slotted dataclasses that keep ids and timestamps as the strings found in the index, and go
+straight back to JSON-ready dicts. Repositories return them from `search(read_models=True)`, and
+`ListEntity(read_models=True)` pages them in a `ReadModelListOutput`.
+
+Benchmark against the domain entities: `python -m src.benchmarks.read_models`
+"""
+import json
+from dataclasses import dataclass
+from typing import Self
+
+from src.application.listing import ListOutputMeta
+
+
+@dataclass(slots=True, frozen=True)
+class CategoryReadModel:
+    id: str
+    name: str
+    description: str
+    created_at: str
+    updated_at: str
+    is_active: bool
+
+    @classmethod
+    def from_source(cls, source: dict) -> Self:
+        return cls(
+            id=source["id"],
+            name=source["name"],
+            description=source.get("description") or "",
+            created_at=source["created_at"],
+            updated_at=source["updated_at"],
+            is_active=source["is_active"],
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "description": self.description,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            "is_active": self.is_active,
+        }
+
+
+@dataclass(slots=True, frozen=True)
+class CastMemberReadModel:
+    id: str
+    name: str
+    type: str
+    created_at: str
+    updated_at: str
+    is_active: bool
+
+    @classmethod
+    def from_source(cls, source: dict) -> Self:
+        return cls(
+            id=source["id"],
+            name=source["name"],
+            type=source["type"],
+            created_at=source["created_at"],
+            updated_at=source["updated_at"],
+            is_active=source["is_active"],
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "type": self.type,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            "is_active": self.is_active,
+        }
+
+
+@dataclass(slots=True, frozen=True)
+class GenreReadModel:
+    id: str
+    name: str
+    categories: tuple[str, ...]
+    created_at: str
+    updated_at: str
+    is_active: bool
+
+    @classmethod
+    def from_source(cls, source: dict) -> Self:
+        return cls(
+            id=source["id"],
+            name=source["name"],
+            categories=tuple(source.get("categories", ())),
+            created_at=source["created_at"],
+            updated_at=source["updated_at"],
+            is_active=source["is_active"],
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "categories": list(self.categories),
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            "is_active": self.is_active,
+        }
+
+
+@dataclass(slots=True, frozen=True)
+class VideoReadModel:
+    id: str
+    title: str
+    launch_year: int
+    rating: str
+    categories: tuple[str, ...]
+    genres: tuple[str, ...]
+    cast_members: tuple[str, ...]
+    banner_url: str
+    created_at: str
+    updated_at: str
+    is_active: bool
+
+    @classmethod
+    def from_source(cls, source: dict) -> Self:
+        return cls(
+            id=source["id"],
+            title=source["title"],
+            launch_year=source["launch_year"],
+            rating=source["rating"],
+            categories=tuple(source["categories"]),
+            genres=tuple(source["genres"]),
+            cast_members=tuple(source["cast_members"]),
+            banner_url=source["banner_url"],
+            created_at=source["created_at"],
+            updated_at=source["updated_at"],
+            is_active=source["is_active"],
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "title": self.title,
+            "launch_year": self.launch_year,
+            "rating": self.rating,
+            "categories": list(self.categories),
+            "genres": list(self.genres),
+            "cast_members": list(self.cast_members),
+            "banner_url": self.banner_url,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            "is_active": self.is_active,
+        }
+
+
+type ReadModel = CategoryReadModel | CastMemberReadModel | GenreReadModel | VideoReadModel
+
+
+@dataclass(slots=True)
+class ReadModelListOutput:
+    """Page of read models, serialized to the same JSON as a `ListOutput` of the entities."""
+    data: list[ReadModel]
+    meta: ListOutputMeta
+
+    def model_dump_json(self) -> str:
+        return json.dumps(
+            {"data": [model.to_dict() for model in self.data], "meta": self.meta.model_dump(mode="json")},
+            separators=(",", ":"),
+        )
\ No newline at end of file
@@ -1,4 +1,5 @@
 import logging
+import time
 from datetime import datetime
 from uuid import UUID
 
@@ -7,6 +8,7 @@ from pydantic import BaseModel
 from src.domain.video import Rating, Video
 from src.domain.video_repository import VideoRepository
 from src.infra.codeflix_client.codeflix_client import CodeflixClient
+from src.infra.codeflix_client.dtos import VideoResponse
 
 logger = logging.getLogger(__name__)
 
@@ -27,21 +29,41 @@ class SaveVideo:
         self._codeflix_client = codeflix_client
 
     def execute(self, input: SaveVideoInput) -> None:
-        logger.info(f"Saving video with id: {input.id}")
+        self._repository.save(self._build_video(input, self._codeflix_client.get_video(id=input.id, updated_at=input.updated_at)))
+        logger.debug("Video %s saved", input.id)
 
-        http_data = self._codeflix_client.get_video(id=input.id)
+    def execute_many(self, inputs: list[SaveVideoInput]) -> int:
+        """Returns how many videos were skipped because a newer version was already saved."""
+        started = time.monotonic()
+        # Enrich the whole batch at once rather than one sequential request per video
+        http_data = self._codeflix_client.get_videos(
+            ids=[input.id for input in inputs],
+            versions={input.id: input.updated_at for input in inputs},
+        )
+        skipped = self._repository.save_many([self._build_video(input, http_data[input.id]) for input in inputs])
+        logger.info(
+            "Saved batch of %d videos in %.0fms (%d stale skipped)",
+            len(inputs), (time.monotonic() - started) * 1000, skipped,
+        )
+        return skipped
+
+    def start_backfill(self) -> None:
+        self._repository.begin_bulk_load()
+
+    def finish_backfill(self) -> None:
+        self._repository.end_bulk_load()
+
+    @staticmethod
+    def _build_video(input: SaveVideoInput, http_data: VideoResponse) -> Video:
         categories = {UUID(category["id"]) for category in http_data.categories}
         cast_members = {UUID(cast_member["id"]) for cast_member in http_data.cast_members}
         genres = {UUID(genre["id"]) for genre in http_data.genres}
         banner_url = http_data.banner["raw_location"]
 
-        video = Video(
+        return Video(
             **input.model_dump(mode="python"),
             categories=categories,
             cast_members=cast_members,
             genres=genres,
             banner_url=banner_url,
-        )
-
-        self._repository.save(video)
-        logger.info(f"Video with id {input.id} saved")
\ No newline at end of file
+        )
\ No newline at end of file
@@ -0,0 +1,56 @@
+"""
+Timings of the stages of a request (auth, use case, Elasticsearch, validation...), reported by the API as a
+Server-Timing header and as histograms.
+
+Stages are only measured while a request collects them (`collect`): elsewhere, and when the API does not
+collect at all, `timed` costs a context variable lookup.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+
+class Timings:
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        # End of the last measured stage: what follows it is the rendering of the response
+        self.last_end = self.started
+        self.stages: dict[str, float] = {}
+
+    def add(self, stage: str, seconds: float) -> None:
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+
+_current: ContextVar[Timings | None] = ContextVar("timings", default=None)
+
+
+@contextmanager
+def collect() -> Iterator[Timings]:
+    """Collect the stages timed in this context (and the threads it runs sync code in)."""
+    timings = Timings()
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def timed(stage: str) -> Iterator[None]:
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.last_end = time.perf_counter()
+        timings.add(stage, timings.last_end - started)
+
+
+def record(stage: str, seconds: float) -> None:
+    """Add a duration measured elsewhere, e.g. the `took` reported by Elasticsearch."""
+    if (timings := _current.get()) is not None:
+        timings.add(stage, seconds)
\ No newline at end of file
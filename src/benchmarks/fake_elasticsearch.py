@@ -0,0 +1,117 @@
+"""
+In-process stand-in for Elasticsearch, to benchmark the repositories and the API without a cluster.
+
+The responses have the shape of the Elasticsearch 8 responses the repositories get (envelope, `_shards`,
+hit metadata, `sort` values, `found` flags), over the synthetic catalog of a fixed seed. Each distinct
+response is encoded to JSON once, and decoded again on every call, as the client does with the bytes it
+receives: the cost left in the benchmarks is the one of the application, not of the fake.
+
+Queries are not evaluated: a search returns the page of documents at its `from` (or right after its
+`search_after` id), with the `_source` fields it asked for. Only `terms` filters (the categories of the
+genres) are applied.
+"""
+import json
+
+from src.benchmarks import synthetic_catalog
+
+CATEGORIES_INDEX = "catalog-db.codeflix.categories"
+CAST_MEMBERS_INDEX = "catalog-db.codeflix.cast_members"
+GENRES_INDEX = "catalog-db.codeflix.genres"
+GENRE_CATEGORIES_INDEX = "catalog-db.codeflix.genre_categories"
+VIDEOS_INDEX = "catalog-db.codeflix.videos"
+
+
+def catalog_documents(videos: int = 500, seed: int = 42) -> dict[str, list[dict]]:
+    """Documents of every index, from the synthetic catalog of `videos` videos."""
+    documents: dict[str, list[dict]] = {
+        index: []
+        for index in [CATEGORIES_INDEX, CAST_MEMBERS_INDEX, GENRES_INDEX, GENRE_CATEGORIES_INDEX, VIDEOS_INDEX]
+    }
+    for index, document in synthetic_catalog.documents(
+        synthetic_catalog.SyntheticCatalog(synthetic_catalog.CatalogSize.for_videos(videos), seed)
+    ):
+        documents[index].append(document)
+    return documents
+
+
+class FakeElasticsearch:
+    def __init__(self, documents: dict[str, list[dict]] | None = None, took: int = 3) -> None:
+        self._documents = documents if documents is not None else catalog_documents()
+        self._positions = {
+            index: {document["id"]: position for position, document in enumerate(documents)}
+            for index, documents in self._documents.items()
+        }
+        self.took = took
+        self._responses: dict[tuple, bytes] = {}
+
+    def search(self, index: str, body: dict) -> dict:
+        size = body.get("size", 10)
+        if body.get("search_after"):
+            start = self._positions.get(index, {}).get(body["search_after"][-1], -1) + 1
+        else:
+            start = body.get("from", 0)
+        source = tuple(body["_source"]) if "_source" in body else None
+        sort = tuple(next(iter(clause)).removesuffix(".keyword") for clause in body.get("sort", []))
+        terms = tuple(
+            (field.removesuffix(".keyword"), tuple(values))
+            for field, values in body.get("query", {}).get("terms", {}).items()
+        )
+        key = ("search", index, start, size, source, sort, terms)
+        if key not in self._responses:
+            self._responses[key] = json.dumps(
+                self._search_response(index, start, size, source, sort, dict(terms))
+            ).encode()
+        return json.loads(self._responses[key])
+
+    def mget(self, index: str, ids: list[str]) -> dict:
+        key = ("mget", index, tuple(ids))
+        if key not in self._responses:
+            self._responses[key] = json.dumps(self._mget_response(index, ids)).encode()
+        return json.loads(self._responses[key])
+
+    def _search_response(
+        self, index: str, start: int, size: int, source: tuple | None, sort: tuple, terms: dict[str, tuple]
+    ) -> dict:
+        documents = self._documents.get(index, [])
+        for field, values in terms.items():
+            wanted = set(values)
+            documents = [document for document in documents if document[field] in wanted]
+        hits = []
+        for document in documents[start:start + size]:
+            hit = {
+                "_index": index,
+                "_id": document["id"],
+                "_score": None if sort else 1.0,
+                "_source": document if source is None else {field: document[field] for field in source if field in document},
+            }
+            if sort:
+                hit["sort"] = [document.get(field) for field in sort]
+            hits.append(hit)
+        return {
+            "took": self.took,
+            "timed_out": False,
+            "_shards": {"total": 1, "successful": 1, "skipped": 0, "failed": 0},
+            "hits": {
+                "total": {"value": len(documents), "relation": "eq"},
+                "max_score": None if sort else 1.0,
+                "hits": hits,
+            },
+        }
+
+    def _mget_response(self, index: str, ids: list[str]) -> dict:
+        positions = self._positions.get(index, {})
+        docs = []
+        for id in ids:
+            if id in positions:
+                docs.append({
+                    "_index": index,
+                    "_id": id,
+                    "_version": 1,
+                    "_seq_no": positions[id],
+                    "_primary_term": 1,
+                    "found": True,
+                    "_source": self._documents[index][positions[id]],
+                })
+            else:
+                docs.append({"_index": index, "_id": id, "found": False})
+        return {"docs": docs}
\ No newline at end of file
@@ -0,0 +1,124 @@
+"""
+Memory and CPU cost of a listing page built with the domain entities vs. the read models, from the
+documents returned by Elasticsearch to the JSON response body.
+
+    python -m src.benchmarks.read_models [page size]
+"""
+import json
+import sys
+import timeit
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Callable
+from uuid import uuid4
+
+from src.application.listing import ListOutput, ListOutputMeta
+from src.application.read_models import (
+    CastMemberReadModel,
+    CategoryReadModel,
+    GenreReadModel,
+    ReadModelListOutput,
+    VideoReadModel,
+)
+from src.domain.cast_member import CastMember
+from src.domain.category import Category
+from src.domain.genre import Genre
+from src.domain.video import Video
+
+
+def video_source() -> dict:
+    now = datetime.now(timezone.utc).isoformat()
+    return {
+        "id": str(uuid4()),
+        "title": "The Godfather",
+        "launch_year": 1972,
+        "rating": "AGE_18",
+        "categories": [str(uuid4()) for _ in range(3)],
+        "genres": [str(uuid4()) for _ in range(2)],
+        "cast_members": [str(uuid4()) for _ in range(10)],
+        "banner_url": "https://banner.com/the-godfather",
+        "created_at": now,
+        "updated_at": now,
+        "is_active": True,
+    }
+
+
+def genre_source() -> dict:
+    now = datetime.now(timezone.utc).isoformat()
+    return {
+        "id": str(uuid4()),
+        "name": "Drama",
+        "categories": [str(uuid4()) for _ in range(3)],
+        "created_at": now,
+        "updated_at": now,
+        "is_active": True,
+    }
+
+
+def category_source() -> dict:
+    now = datetime.now(timezone.utc).isoformat()
+    return {
+        "id": str(uuid4()),
+        "name": "Filme",
+        "description": "Categoria de filmes",
+        "created_at": now,
+        "updated_at": now,
+        "is_active": True,
+    }
+
+
+def cast_member_source() -> dict:
+    now = datetime.now(timezone.utc).isoformat()
+    return {
+        "id": str(uuid4()),
+        "name": "Marlon Brando",
+        "type": "ACTOR",
+        "created_at": now,
+        "updated_at": now,
+        "is_active": True,
+    }
+
+
+def entity_page(entity: type, sources: list[dict]) -> bytes:
+    entities = [entity(**source) for source in sources]
+    return ListOutput[entity](data=entities, meta=ListOutputMeta()).model_dump_json().encode()
+
+
+def read_model_page(read_model: type, sources: list[dict]) -> bytes:
+    models = [read_model.from_source(source) for source in sources]
+    return ReadModelListOutput(data=models, meta=ListOutputMeta()).model_dump_json().encode()
+
+
+def retained_bytes(build: Callable[[], list]) -> int:
+    tracemalloc.start()
+    objects = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return size
+
+
+def run(page_size: int = 100, repeat: int = 200) -> list[tuple[str, str, float, int]]:
+    results = []
+    for name, entity, read_model, make_source in [
+        ("Video", Video, VideoReadModel, video_source),
+        ("Genre", Genre, GenreReadModel, genre_source),
+        ("Category", Category, CategoryReadModel, category_source),
+        ("CastMember", CastMember, CastMemberReadModel, cast_member_source),
+    ]:
+        sources = [make_source() for _ in range(page_size)]
+        assert json.loads(entity_page(entity, sources))["data"][0]["id"] == sources[0]["id"]
+        for kind, page, build in [
+            ("entity", lambda: entity_page(entity, sources), lambda: [entity(**source) for source in sources]),
+            ("read model", lambda: read_model_page(read_model, sources), lambda: [read_model.from_source(source) for source in sources]),
+        ]:
+            seconds = min(timeit.repeat(page, number=repeat, repeat=3)) / repeat
+            results.append((name, kind, seconds, retained_bytes(build)))
+    return results
+
+
+if __name__ == "__main__":
+    page_size = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    print(f"{'model':<12}{'representation':<16}{'page to JSON (ms)':>20}{'page in memory (KiB)':>24}")
+    for name, kind, seconds, size in run(page_size):
+        print(f"{name:<12}{kind:<16}{seconds * 1000:>20.3f}{size / 1024:>24.1f}")
\ No newline at end of file
@@ -0,0 +1,199 @@
+"""
+Microbenchmarks of the hot paths of the catalog, from the Debezium message parser to the HTTP routes,
+served by an in-process Elasticsearch (`FakeElasticsearch`) instead of a cluster.
+
+    python -m src.benchmarks.suite run [-o results.json] [-k filter]
+    python -m src.benchmarks.suite compare baseline.json results.json [--threshold 0.1]
+
+`run` writes the time per call of every benchmark to a JSON file: keep one as the baseline of a branch,
+and `compare` a later run against it, on the same machine. `compare` exits with 1 when the best time of a
+benchmark got slower than the baseline by more than the threshold.
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import timeit
+from datetime import datetime, timezone
+from typing import Callable
+
+from fastapi.testclient import TestClient
+
+from src.application.list_category import ListCategory, ListCategoryInput
+from src.application.list_video import ListVideo, ListVideoInput
+from src.benchmarks.fake_elasticsearch import FakeElasticsearch, catalog_documents
+from src.benchmarks.synthetic_catalog import debezium_envelope
+from src.infra.api.http.auth import authenticate
+from src.infra.api.http.dependencies import (
+    get_cast_member_repository,
+    get_category_repository,
+    get_genre_repository,
+    get_video_repository,
+)
+from src.infra.api.http.main import app
+from src.infra.elasticsearch.elasticsearch_cast_member_repository import ElasticsearchCastMemberRepository
+from src.infra.elasticsearch.elasticsearch_category_repository import ElasticsearchCategoryRepository
+from src.infra.elasticsearch.elasticsearch_genre_repository import ElasticsearchGenreRepository
+from src.infra.elasticsearch.elasticsearch_video_repository import ElasticsearchVideoRepository
+from src.infra.kafka.parser import parse_debezium_message
+
+PAGE_SIZE = 50
+DEFAULT_RESULTS_PATH = "benchmark-results.json"
+DEFAULT_THRESHOLD = 0.10
+
+VIDEOS_QUERY = """
+query Videos($per_page: Int!) {
+  videos(per_page: $per_page, sort: TITLE) {
+    data { id title launch_year rating categories genres cast_members banner_url }
+    meta { page per_page next_cursor }
+  }
+}
+"""
+
+
+def debezium_message(table: str, row: dict) -> bytes:
+    return json.dumps(debezium_envelope(table, row)).encode()
+
+
+def benchmarks() -> dict[str, Callable[[], object]]:
+    documents = catalog_documents()
+    es = FakeElasticsearch(documents)
+    category = documents["catalog-db.codeflix.categories"][0]
+    video = documents["catalog-db.codeflix.videos"][0]
+    category_message = debezium_message("categories", category)
+    video_message = debezium_message("videos", video)
+
+    categories = ElasticsearchCategoryRepository(client=es)
+    cast_members = ElasticsearchCastMemberRepository(client=es)
+    genres = ElasticsearchGenreRepository(client=es)
+    videos = ElasticsearchVideoRepository(client=es)
+
+    # The REST routes and the GraphQL resolvers (see `schema_pydantic.resolve_repository`) use the overrides
+    app.dependency_overrides.update({
+        get_category_repository: lambda: categories,
+        get_cast_member_repository: lambda: cast_members,
+        get_genre_repository: lambda: genres,
+        get_video_repository: lambda: videos,
+        authenticate: lambda: None,
+    })
+    http = TestClient(app)
+    # Without compression: repeated identical pages would be served from the compressed-body cache
+    identity = {"Accept-Encoding": "identity"}
+
+    return {
+        "parser/parse_debezium_message[category]": lambda: parse_debezium_message(category_message),
+        "parser/parse_debezium_message[video]": lambda: parse_debezium_message(video_message),
+        "repository/search[categories]": lambda: categories.search(per_page=PAGE_SIZE, sort="name"),
+        "repository/search[cast_members]": lambda: cast_members.search(per_page=PAGE_SIZE, sort="name"),
+        "repository/search[genres]": lambda: genres.search(per_page=PAGE_SIZE, sort="name"),
+        "repository/search[videos]": lambda: videos.search(per_page=PAGE_SIZE, sort="title"),
+        "repository/search[videos,fields]": lambda: videos.search(
+            per_page=PAGE_SIZE, sort="title", fields=frozenset({"id", "title", "banner_url"})
+        ),
+        "use_case/list_categories": lambda: ListCategory(repository=categories).execute(
+            ListCategoryInput(per_page=PAGE_SIZE)
+        ),
+        "use_case/list_videos": lambda: ListVideo(repository=videos).execute(ListVideoInput(per_page=PAGE_SIZE)),
+        "graphql/videos": lambda: http.post(
+            "/graphql", json={"query": VIDEOS_QUERY, "variables": {"per_page": PAGE_SIZE}}, headers=identity
+        ),
+        "http/GET /categories/": lambda: http.get("/categories/", params={"per_page": PAGE_SIZE}, headers=identity),
+        "http/GET /videos/": lambda: http.get("/videos/", params={"per_page": PAGE_SIZE}, headers=identity),
+        "http/GET /videos/?fields": lambda: http.get(
+            "/videos/", params={"per_page": PAGE_SIZE, "fields": "id,title,banner_url"}, headers=identity
+        ),
+    }
+
+
+def check(name: str, result: object) -> None:
+    """Benchmarks of failing calls measure nothing useful."""
+    if result is None and name.startswith("parser/"):
+        raise AssertionError(f"{name}: the message was not parsed")
+    if getattr(result, "status_code", 200) != 200:
+        raise AssertionError(f"{name}: HTTP {result.status_code} {result.text}")
+    if name.startswith("graphql/") and result.json().get("errors"):
+        raise AssertionError(f"{name}: {result.json()['errors']}")
+
+
+def measure(function: Callable[[], object], rounds: int = 5) -> dict:
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()  # Calls per round, so a round lasts at least 0.2s
+    times = [total / number for total in timer.repeat(repeat=rounds, number=number)]
+    return {
+        "min": min(times),
+        "median": statistics.median(times),
+        "stdev": statistics.stdev(times) if len(times) > 1 else 0.0,
+        "rounds": rounds,
+        "number": number,
+    }
+
+
+def run(filter: str | None = None, rounds: int = 5) -> dict:
+    results = {}
+    try:
+        for name, function in benchmarks().items():
+            if filter and filter not in name:
+                continue
+            check(name, function())
+            results[name] = measure(function, rounds)
+            print(f"{name:<45}{results[name]['min'] * 1e6:>12.1f} us", file=sys.stderr)
+    finally:
+        app.dependency_overrides.clear()
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "benchmarks": results,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float = DEFAULT_THRESHOLD) -> list[tuple[str, float, float, str]]:
+    """(name, baseline, current, status) of the benchmarks of both runs, on their best time per call."""
+    rows = []
+    for name, result in current["benchmarks"].items():
+        if name not in baseline["benchmarks"]:
+            rows.append((name, float("nan"), result["min"], "new"))
+            continue
+        before = baseline["benchmarks"][name]["min"]
+        change = result["min"] / before - 1
+        status = "regression" if change > threshold else "faster" if change < -threshold else "ok"
+        rows.append((name, before, result["min"], status))
+    return rows
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m src.benchmarks.suite")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_command = commands.add_parser("run", help="Run the benchmarks and write their results")
+    run_command.add_argument("-o", "--output", default=DEFAULT_RESULTS_PATH)
+    run_command.add_argument("-k", "--filter", help="Only the benchmarks whose name contains this")
+    run_command.add_argument("--rounds", type=int, default=5)
+    compare_command = commands.add_parser("compare", help="Compare results with a baseline")
+    compare_command.add_argument("baseline")
+    compare_command.add_argument("current")
+    compare_command.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        results = run(args.filter, args.rounds)
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+        print(f"Results written to {args.output}", file=sys.stderr)
+        return 0
+
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    with open(args.current) as file:
+        current = json.load(file)
+    rows = compare(baseline, current, args.threshold)
+    print(f"{'benchmark':<45}{'baseline (us)':>15}{'current (us)':>15}{'change':>10}  status")
+    for name, before, after, status in rows:
+        change = f"{after / before - 1:+.1%}" if status != "new" else ""
+        print(f"{name:<45}{before * 1e6:>15.1f}{after * 1e6:>15.1f}{change:>10}  {status}")
+    return 1 if any(status == "regression" for *_, status in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,386 @@
+"""
+Synthetic catalog for load tests: categories, cast members, genres and videos with their relations, as
+Elasticsearch bulk NDJSON (to seed the indexes the API reads) or as Debezium change events (to replay into
+the consumer).
+
+    python -m src.benchmarks.synthetic_catalog --videos 1000000 --format bulk -o catalog.ndjson.gz
+    python -m src.benchmarks.synthetic_catalog --videos 100000 --format debezium -o events.ndjson
+    python -m src.benchmarks.synthetic_catalog --videos 100000 --format debezium --bootstrap-servers localhost:9092
+
+Everything is streamed: records are generated one at a time and written out right away, and related
+entities are referenced by position, their ids derived from it, so memory stays flat whatever the size.
+The same seed and sizes always give the same catalog.
+
+Cardinalities and text follow a real catalog rather than uniform noise:
+- a few categories and genres, many cast members (half as many as videos by default)
+- 1-3 categories and genres per video, a log-normal cast size (median 8, up to 60)
+- popularity is skewed: related entities are picked with a 1/rank^s law (`POPULARITY_EXPONENTS`)
+- titles of 1-6 words and descriptions of 5-40 words, words drawn with the same skew
+- launch years weighted towards recent ones
+
+Debezium events are keyed like the connector keys them. The relation tables are keyed by `video_id`, the
+partitioning the CDC state store needs (see `cdc_state_store`). A video is followed by its relations and
+banner, so every video is complete when its last event is consumed.
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import math
+import random
+import sys
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import IO, Iterator, Protocol
+from uuid import UUID
+
+INDEX_PREFIX = "catalog-db.codeflix"
+VIDEO_RELATIONS = {
+    "video_categories": ("category_id", "categories"),
+    "video_genres": ("genre_id", "genres"),
+    "video_cast_members": ("cast_member_id", "cast_members"),
+}
+# Skew of the popularity of the related entities: a few categories are on most videos, while even the most
+# prolific actors are in a small share of them
+POPULARITY_EXPONENTS = {"categories": 1.0, "genres": 1.0, "cast_members": 0.5}
+
+_WORDS = (
+    "the of love night last city dark man world life day home lost war time black house girl secret king "
+    "road blood story return dead heart fire water family summer shadow stranger river island promise "
+    "journey dream silent broken golden winter ghost empire storm mountain wild hidden forgotten edge "
+    "legend sky iron glass paper moon star ocean desert forest garden letter stone kingdom rebel echo "
+    "memory truth justice escape danger midnight morning revenge fortune journey crown machine signal "
+    "harbor valley frontier carnival circus orchestra detective doctor soldier teacher pilot sister brother"
+).split()
+_CATEGORY_NAMES = (
+    "Movies Series Documentaries Kids Anime Stand-up Shorts Reality Classics Independent International "
+    "Originals Sports Music Nature History Science Education Family Festival Awarded Trending New Releases"
+).split()
+_GENRE_NAMES = (
+    "Action Adventure Animation Biography Comedy Crime Drama Fantasy Horror Musical Mystery Noir Romance "
+    "Science-Fiction Sport Thriller War Western Documentary Family Superhero Satire Period Political"
+).split()
+_FIRST_NAMES = (
+    "Ana Bruno Carla Diego Elena Fabio Gisele Hugo Iris Joao Karen Lucas Marta Nuno Olga Pedro Rita Sergio "
+    "Tania Ulisses Vera Wagner Yara Zeca Alice Bernardo Clara Davi Eva Felipe Helena Igor Julia Leonardo"
+).split()
+_LAST_NAMES = (
+    "Almeida Barros Costa Dias Esteves Freitas Gomes Lima Moreira Nunes Pereira Souza Ramos Teixeira Vieira "
+    "Cardoso Rocha Martins Araujo Ribeiro Carvalho Fernandes Lopes Monteiro Mendes Castro Pinto Batista"
+).split()
+_RATINGS = ["ER", "L", "AGE_10", "AGE_12", "AGE_14", "AGE_16", "AGE_18"]
+_RATING_WEIGHTS = [4, 18, 12, 16, 20, 18, 12]
+_TITLE_WORDS = [1, 2, 3, 4, 5, 6]
+_TITLE_WORD_WEIGHTS = [15, 30, 25, 15, 10, 5]
+
+_EPOCH = datetime(2022, 1, 1, tzinfo=timezone.utc)
+_SPAN_SECONDS = 3 * 365 * 86_400
+
+
+@dataclass(frozen=True)
+class CatalogSize:
+    categories: int
+    genres: int
+    cast_members: int
+    videos: int
+
+    @classmethod
+    def for_videos(cls, videos: int) -> "CatalogSize":
+        return cls(
+            categories=max(videos // 1_000, 20),
+            genres=max(videos // 2_000, 15),
+            cast_members=max(videos // 2, 60),
+            videos=videos,
+        )
+
+
+def entity_id(seed: int, kind: str, position: int) -> str:
+    """Id of the entity at `position`, derived from it: relations need no lookup table."""
+    digest = hashlib.blake2b(f"{seed}:{kind}:{position}".encode(), digest_size=16).digest()
+    return str(UUID(bytes=digest, version=4))
+
+
+def skewed_position(rng: random.Random, count: int, exponent: float = 1.0) -> int:
+    """
+    Position in [0, count) with a probability close to 1/(position + 1)^exponent: the first ones are picked
+    most of the time, and less so as the exponent goes down to 0 (uniform).
+    """
+    if exponent == 1.0:
+        position = int(count ** rng.random()) - 1
+    else:
+        power = 1 - exponent
+        position = int((((count + 1) ** power - 1) * rng.random() + 1) ** (1 / power)) - 1
+    return min(position, count - 1)
+
+
+def _words(rng: random.Random, count: int) -> str:
+    return " ".join(_WORDS[skewed_position(rng, len(_WORDS))] for _ in range(count))
+
+
+def _timestamps(rng: random.Random) -> dict:
+    created_at = _EPOCH + timedelta(seconds=rng.randrange(_SPAN_SECONDS))
+    # Most rows are never updated, some are a lot later
+    updated_at = created_at if rng.random() < 0.6 else created_at + timedelta(seconds=int(rng.expovariate(1 / 2_592_000)))
+    return {
+        "created_at": created_at.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "updated_at": updated_at.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "is_active": rng.random() < 0.97,
+    }
+
+
+class SyntheticCatalog:
+    """Rows of the catalog tables, generated lazily. Each table has its own random stream."""
+
+    def __init__(self, size: CatalogSize, seed: int = 42) -> None:
+        self.size = size
+        self.seed = seed
+
+    def _random(self, table: str) -> random.Random:
+        return random.Random(f"{self.seed}:{table}")
+
+    def id(self, kind: str, position: int) -> str:
+        return entity_id(self.seed, kind, position)
+
+    def _related(self, rng: random.Random, kind: str, count: int, wanted: int) -> list[str]:
+        positions: dict[int, None] = {}
+        for _ in range(wanted * 4):  # Bounded: skewed picks repeat, small tables may not have `wanted`
+            positions[skewed_position(rng, count, POPULARITY_EXPONENTS[kind])] = None
+            if len(positions) == wanted:
+                break
+        return [self.id(kind, position) for position in positions]
+
+    def categories(self) -> Iterator[dict]:
+        rng = self._random("categories")
+        for position in range(self.size.categories):
+            name = _CATEGORY_NAMES[position % len(_CATEGORY_NAMES)]
+            yield {
+                "id": self.id("categories", position),
+                "name": name if position < len(_CATEGORY_NAMES) else f"{name} {position // len(_CATEGORY_NAMES) + 1}",
+                "description": _words(rng, rng.randint(5, 40)).capitalize(),
+                **_timestamps(rng),
+            }
+
+    def cast_members(self) -> Iterator[dict]:
+        rng = self._random("cast_members")
+        for position in range(self.size.cast_members):
+            yield {
+                "id": self.id("cast_members", position),
+                "name": f"{rng.choice(_FIRST_NAMES)} {rng.choice(_LAST_NAMES)}",
+                "type": "DIRECTOR" if rng.random() < 0.15 else "ACTOR",
+                **_timestamps(rng),
+            }
+
+    def genres(self) -> Iterator[dict]:
+        rng = self._random("genres")
+        for position in range(self.size.genres):
+            name = _GENRE_NAMES[position % len(_GENRE_NAMES)]
+            yield {
+                "id": self.id("genres", position),
+                "name": name if position < len(_GENRE_NAMES) else f"{name} {position // len(_GENRE_NAMES) + 1}",
+                **_timestamps(rng),
+            }
+
+    def genre_categories(self) -> Iterator[dict]:
+        rng = self._random("genre_categories")
+        for position in range(self.size.genres):
+            genre_id = self.id("genres", position)
+            for category_id in self._related(rng, "categories", self.size.categories, rng.randint(1, 4)):
+                yield {"id": str(UUID(int=rng.getrandbits(128), version=4)), "genre_id": genre_id, "category_id": category_id}
+
+    def videos(self) -> Iterator[tuple[dict, dict[str, list[dict]]]]:
+        """Rows of the `videos` table, each with the rows of its relation tables (and `video_banners`)."""
+        rng = self._random("videos")
+        counts = {"categories": self.size.categories, "genres": self.size.genres, "cast_members": self.size.cast_members}
+        for position in range(self.size.videos):
+            video_id = self.id("videos", position)
+            wanted = {
+                "categories": rng.choices([1, 2, 3], [50, 35, 15])[0],
+                "genres": rng.choices([1, 2, 3], [55, 35, 10])[0],
+                "cast_members": max(1, min(60, round(rng.lognormvariate(math.log(8), 0.6)))),
+            }
+            row = {
+                "id": video_id,
+                "title": _words(rng, rng.choices(_TITLE_WORDS, _TITLE_WORD_WEIGHTS)[0]).title(),
+                "launch_year": max(1920, 2024 - int(rng.expovariate(1 / 12))),
+                "rating": rng.choices(_RATINGS, _RATING_WEIGHTS)[0],
+                **_timestamps(rng),
+            }
+            relations = {
+                table: [
+                    {"id": str(UUID(int=rng.getrandbits(128), version=4)), "video_id": video_id, column: related_id}
+                    for related_id in self._related(rng, kind, counts[kind], wanted[kind])
+                ]
+                for table, (column, kind) in VIDEO_RELATIONS.items()
+            }
+            relations["video_banners"] = [{
+                "id": str(UUID(int=rng.getrandbits(128), version=4)),
+                "video_id": video_id,
+                "name": f"{video_id}.jpg",
+                "raw_location": f"https://cdn.codeflix.com/banners/{video_id}.jpg",
+            }]
+            yield row, relations
+
+
+def documents(catalog: SyntheticCatalog) -> Iterator[tuple[str, dict]]:
+    """(index, document) of every entity, as the consumer indexes them (`model_dump(mode="json")`)."""
+    for table, rows in [
+        ("categories", catalog.categories()),
+        ("cast_members", catalog.cast_members()),
+        ("genres", catalog.genres()),
+        ("genre_categories", catalog.genre_categories()),
+    ]:
+        for row in rows:
+            yield f"{INDEX_PREFIX}.{table}", row
+    for row, relations in catalog.videos():
+        yield f"{INDEX_PREFIX}.videos", {
+            **row,
+            **{kind: [relation[column] for relation in relations[table]] for table, (column, kind) in VIDEO_RELATIONS.items()},
+            "banner_url": relations["video_banners"][0]["raw_location"],
+        }
+
+
+def debezium_envelope(table: str, row: dict, op: str = "c", ts_ms: int = 1734122780000, pos: int = 154_879) -> dict:
+    """Change event of `row` in `table`, with the envelope and source block of the MySQL connector."""
+    return {
+        "schema": {"type": "struct", "optional": False, "name": f"{INDEX_PREFIX}.{table}.Envelope"},
+        "payload": {
+            "before": None,
+            "after": row,
+            "source": {
+                "version": "2.7.0.Final",
+                "connector": "mysql",
+                "name": "catalog-db",
+                "ts_ms": ts_ms,
+                "snapshot": "false",
+                "db": "codeflix",
+                "table": table,
+                "server_id": 1,
+                "file": "mysql-bin.000003",
+                "pos": pos,
+                "row": 0,
+            },
+            "op": op,
+            "ts_ms": ts_ms + 123,
+        },
+    }
+
+
+def change_events(catalog: SyntheticCatalog) -> Iterator[tuple[str, dict, dict]]:
+    """(topic, key, value) of the creation of every row, in an order the consumer can apply."""
+
+    def event(table: str, row: dict, key_column: str = "id") -> tuple[str, dict, dict]:
+        nonlocal sequence
+        sequence += 1
+        key = {"payload": {key_column: row[key_column]}}
+        return f"{INDEX_PREFIX}.{table}", key, debezium_envelope(table, row, ts_ms=1734122780000 + sequence, pos=sequence)
+
+    sequence = 0
+    for table, rows in [
+        ("categories", catalog.categories()),
+        ("cast_members", catalog.cast_members()),
+        ("genres", catalog.genres()),
+    ]:
+        for row in rows:
+            yield event(table, row)
+    for row in catalog.genre_categories():
+        yield event("genre_categories", row, "genre_id")
+    for row, relations in catalog.videos():
+        yield event("videos", row)
+        for table, relation_rows in relations.items():
+            for relation_row in relation_rows:
+                yield event(table, relation_row, "video_id")
+
+
+class Producer(Protocol):
+    """The subset of confluent_kafka.Producer used, also implemented by `InMemoryProducer`."""
+
+    def produce(self, topic: str, value: bytes | None = None, key: bytes | None = None, **kwargs) -> None: ...
+
+    def poll(self, timeout: float = 0) -> int: ...
+
+    def flush(self, timeout: float | None = None) -> int: ...
+
+
+def write_bulk(catalog: SyntheticCatalog, output: IO[str]) -> int:
+    """Elasticsearch `_bulk` NDJSON: an `index` action line, then the document. Returns the documents written."""
+    written = 0
+    for index, document in documents(catalog):
+        output.write(json.dumps({"index": {"_index": index, "_id": document["id"]}}))
+        output.write("\n")
+        output.write(json.dumps(document))
+        output.write("\n")
+        written += 1
+    return written
+
+
+def write_events(catalog: SyntheticCatalog, output: IO[str]) -> int:
+    """One `{"topic", "key", "value"}` JSON object per line, to replay in order."""
+    written = 0
+    for topic, key, value in change_events(catalog):
+        output.write(json.dumps({"topic": topic, "key": key, "value": value}))
+        output.write("\n")
+        written += 1
+    return written
+
+
+def produce_events(catalog: SyntheticCatalog, producer: Producer) -> int:
+    produced = 0
+    for topic, key, value in change_events(catalog):
+        producer.produce(topic, value=json.dumps(value).encode(), key=json.dumps(key).encode())
+        produced += 1
+        if produced % 10_000 == 0:
+            producer.poll(0)  # Serves the delivery callbacks, so the local queue drains
+    producer.flush()
+    return produced
+
+
+def open_output(path: str) -> IO[str]:
+    if path == "-":
+        return sys.stdout
+    if path.endswith(".gz"):
+        return gzip.open(path, "wt", compresslevel=1)
+    return open(path, "w", buffering=1 << 20)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m src.benchmarks.synthetic_catalog")
+    parser.add_argument("--videos", type=int, default=10_000)
+    parser.add_argument("--categories", type=int, help="Default: videos / 1000, at least 20")
+    parser.add_argument("--genres", type=int, help="Default: videos / 2000, at least 15")
+    parser.add_argument("--cast-members", type=int, help="Default: videos / 2, at least 60")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--format", choices=["bulk", "debezium"], default="bulk")
+    parser.add_argument("-o", "--output", default="-", help="File (.gz to compress) or - for stdout")
+    parser.add_argument("--bootstrap-servers", help="Produce the Debezium events to this Kafka instead of a file")
+    args = parser.parse_args(argv)
+
+    default = CatalogSize.for_videos(args.videos)
+    catalog = SyntheticCatalog(
+        CatalogSize(
+            categories=args.categories or default.categories,
+            genres=args.genres or default.genres,
+            cast_members=args.cast_members or default.cast_members,
+            videos=args.videos,
+        ),
+        seed=args.seed,
+    )
+
+    if args.bootstrap_servers:
+        from confluent_kafka import Producer as KafkaProducer
+
+        count = produce_events(catalog, KafkaProducer({"bootstrap.servers": args.bootstrap_servers, "linger.ms": 50}))
+        print(f"{count} events produced to {args.bootstrap_servers}", file=sys.stderr)
+        return 0
+
+    output = open_output(args.output)
+    try:
+        count = (write_bulk if args.format == "bulk" else write_events)(catalog, output)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    print(f"{count} {'documents' if args.format == 'bulk' else 'events'} written to {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
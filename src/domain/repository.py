@@ -1,9 +1,15 @@
 from abc import ABC, abstractmethod
+from uuid import UUID
 
 from src.application.listing import SortDirection, DEFAULT_PAGINATION_SIZE
+from src.application.read_models import ReadModel
 from src.domain.entity import Entity
 
 
+class StaleEntityError(Exception):
+    """Raised when a write carries an older version than the one already stored."""
+
+
 class Repository[T: Entity](ABC):
     @abstractmethod
     def search(
@@ -13,5 +19,20 @@ class Repository[T: Entity](ABC):
         search: str | None = None,
         sort: str | None = None,
         direction: SortDirection = SortDirection.ASC,
-    ) -> list[T]:
+        search_after: list | None = None,
+        fields: frozenset[str] | None = None,
+        read_models: bool = False,
+    ) -> list[T] | list[ReadModel]:
+        """
+        :param search_after: Sort values (sort field, then id) of the entity the results start after.
+            Takes precedence over `page`
+        :param fields: Fetch only these fields, as models of the fieldset (see `fieldsets.sparse_model`)
+        :param read_models: Return the read models of the documents instead of entities (see `read_models`).
+            Ignored along with `fields`
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_by_ids(self, ids: list[UUID]) -> list[T]:
+        """Entities with these ids, in the same order. Ids that are not found are left out."""
         raise NotImplementedError
\ No newline at end of file
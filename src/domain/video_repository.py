@@ -7,4 +7,20 @@ from src.domain.video import Video
 class VideoRepository(Repository[Video], ABC):
     @abstractmethod
     def save(self, video: Video) -> None:
+        """Raises StaleEntityError if a newer version of the video is already stored."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def save_many(self, videos: list[Video]) -> int:
+        """Returns how many videos were skipped because a newer version is already stored."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def begin_bulk_load(self) -> None:
+        """Prepare the storage for a large backfill (e.g. an initial CDC snapshot)."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def end_bulk_load(self) -> None:
+        """Restore the regular settings once the backfill is over and make the data visible."""
         raise NotImplementedError
\ No newline at end of file
@@ -1,4 +1,5 @@
 import strawberry
+from typing import Callable
 from uuid import UUID
 from strawberry.fastapi import GraphQLRouter
 from strawberry.schema.config import StrawberryConfig
@@ -23,6 +24,7 @@ from src.application.list_video import (
     ListVideo,
     ListVideoInput,
 )
+from src.application.get_entities import GetEntities, GetEntitiesInput
 from src.application.listing import DEFAULT_PAGINATION_SIZE, SortDirection, ListOutputMeta
 from src.domain.cast_member import CastMember
 from src.domain.category import Category
@@ -32,10 +34,24 @@ from src.infra.api.http.dependencies import (
     get_category_repository, 
     get_cast_member_repository, 
     get_genre_repository,
-    get_video_repository
+    get_video_repository,
+    get_cached_category_repository,
+    get_cached_cast_member_repository,
+    get_cached_genre_repository,
+    get_cached_video_repository,
 )
 
 
+def resolve_repository[R](info: strawberry.Info, provider: Callable[[], R]) -> R:
+    """
+    Repository of the `provider` dependency. Resolvers run outside of FastAPI's dependency injection, so
+    `app.dependency_overrides` (tests, benchmarks) is looked up here, as for the REST routes.
+    """
+    request = (info.context or {}).get("request")
+    overrides = request.app.dependency_overrides if request is not None else {}
+    return overrides.get(provider, provider)()
+
+
 @strawberry.experimental.pydantic.type(model=Category)
 class CategoryGraphQL:
     id: strawberry.auto
@@ -81,13 +97,15 @@ class Result[T]:
 
 
 def get_categories(
+    info: strawberry.Info,
     sort: CategorySortableFields = CategorySortableFields.NAME,
     search: str | None = None,
     page: int = 1,
     per_page: int = DEFAULT_PAGINATION_SIZE,
     direction: SortDirection = SortDirection.ASC,
+    cursor: str | None = None,
 ) -> Result[CategoryGraphQL]:
-    _repository = get_category_repository()
+    _repository = resolve_repository(info, get_category_repository)
     use_case = ListCategory(repository=_repository)
     output = use_case.execute(
         ListCategoryInput(
@@ -96,6 +114,7 @@ def get_categories(
             per_page=per_page,
             sort=sort,
             direction=direction,
+            cursor=cursor,
         )
     )
 
@@ -106,13 +125,15 @@ def get_categories(
 
 
 def get_cast_members(
+    info: strawberry.Info,
     sort: CastMemberSortableFields = CastMemberSortableFields.NAME,
     search: str | None = None,
     page: int = 1,
     per_page: int = DEFAULT_PAGINATION_SIZE,
     direction: SortDirection = SortDirection.ASC,
+    cursor: str | None = None,
 ) -> Result[CastMemberGraphQL]:
-    repository = get_cast_member_repository()
+    repository = resolve_repository(info, get_cast_member_repository)
     use_case = ListCastMember(repository=repository)
     output = use_case.execute(
         ListCastMemberInput(
@@ -121,6 +142,7 @@ def get_cast_members(
             per_page=per_page,
             sort=sort,
             direction=direction,
+            cursor=cursor,
         )
     )
 
@@ -131,13 +153,15 @@ def get_cast_members(
 
 
 def get_genres(
+    info: strawberry.Info,
     sort: GenreSortableFields = GenreSortableFields.NAME,
     search: str | None = None,
     page: int = 1,
     per_page: int = DEFAULT_PAGINATION_SIZE,
     direction: SortDirection = SortDirection.ASC,
+    cursor: str | None = None,
 ) -> Result[GenreGraphQL]:
-    repository = get_genre_repository()
+    repository = resolve_repository(info, get_genre_repository)
     use_case = ListGenre(repository=repository)
     output = use_case.execute(
         ListGenreInput(
@@ -146,6 +170,7 @@ def get_genres(
             per_page=per_page,
             sort=sort,
             direction=direction,
+            cursor=cursor,
         )
     )
 
@@ -156,13 +181,15 @@ def get_genres(
 
 
 def get_videos(
+    info: strawberry.Info,
     sort: VideoSortableFields = VideoSortableFields.TITLE,
     search: str | None = None,
     page: int = 1,
     per_page: int = DEFAULT_PAGINATION_SIZE,
     direction: SortDirection = SortDirection.ASC,
+    cursor: str | None = None,
 ) -> Result[VideoGraphQL]:
-    repository = get_video_repository()
+    repository = resolve_repository(info, get_video_repository)
     use_case = ListVideo(repository=repository)
     output = use_case.execute(
         ListVideoInput(
@@ -171,6 +198,7 @@ def get_videos(
             per_page=per_page,
             sort=sort,
             direction=direction,
+            cursor=cursor,
         )
     )
 
@@ -180,12 +208,41 @@ def get_videos(
     )
 
 
+def get_categories_by_ids(info: strawberry.Info, ids: list[UUID]) -> list[CategoryGraphQL]:
+    repository = get_cached_category_repository(resolve_repository(info, get_category_repository))
+    output = GetEntities(repository=repository).execute(GetEntitiesInput(ids=ids))
+    return [CategoryGraphQL.from_pydantic(category) for category in output.data]
+
+
+def get_cast_members_by_ids(info: strawberry.Info, ids: list[UUID]) -> list[CastMemberGraphQL]:
+    repository = get_cached_cast_member_repository(resolve_repository(info, get_cast_member_repository))
+    output = GetEntities(repository=repository).execute(GetEntitiesInput(ids=ids))
+    return [CastMemberGraphQL.from_pydantic(cast_member) for cast_member in output.data]
+
+
+def get_genres_by_ids(info: strawberry.Info, ids: list[UUID]) -> list[GenreGraphQL]:
+    repository = get_cached_genre_repository(resolve_repository(info, get_genre_repository))
+    output = GetEntities(repository=repository).execute(GetEntitiesInput(ids=ids))
+    return [GenreGraphQL.from_pydantic(genre) for genre in output.data]
+
+
+def get_videos_by_ids(info: strawberry.Info, ids: list[UUID]) -> list[VideoGraphQL]:
+    repository = get_cached_video_repository(resolve_repository(info, get_video_repository))
+    output = GetEntities(repository=repository).execute(GetEntitiesInput(ids=ids))
+    return [VideoGraphQL.from_pydantic(video) for video in output.data]
+
+
 @strawberry.type
 class Query:
     categories: Result[CategoryGraphQL] = strawberry.field(resolver=get_categories)
     cast_members: Result[CastMemberGraphQL] = strawberry.field(resolver=get_cast_members)
     genres: Result[GenreGraphQL] = strawberry.field(resolver=get_genres)
     videos: Result[VideoGraphQL] = strawberry.field(resolver=get_videos)
+    # Lookups of the entities referenced by others (e.g. the categories of a video)
+    categories_by_ids: list[CategoryGraphQL] = strawberry.field(resolver=get_categories_by_ids)
+    cast_members_by_ids: list[CastMemberGraphQL] = strawberry.field(resolver=get_cast_members_by_ids)
+    genres_by_ids: list[GenreGraphQL] = strawberry.field(resolver=get_genres_by_ids)
+    videos_by_ids: list[VideoGraphQL] = strawberry.field(resolver=get_videos_by_ids)
 
 
 schema = strawberry.Schema(query=Query, config=StrawberryConfig(auto_camel_case=False))
@@ -0,0 +1,174 @@
+"""
+Admission control of the API: each route gets an adaptive limit on its requests in flight, and requests
+above it are rejected right away (503 with Retry-After) instead of queueing in the threadpool while
+Elasticsearch is slow.
+
+The limit follows the latency of the route (AIMD, like TCP congestion control): it grows by one for every
+`limit` requests served close to the baseline latency, and is cut by 10% each time a request takes more than
+`tolerance` times that baseline or fails with a 5xx. The baseline is a low percentile of the recent successful
+(2xx) latencies of the handler: fast 4xx responses and lucky outliers must not set a bar the real searches
+can never meet. Lookups by id (`?ids=` and `batch_get`) are served from a cache, so they get a limit of their
+own and are admitted like the priority routes.
+"""
+import os
+import threading
+import time
+from typing import Callable
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.infra.metrics import API_CONCURRENCY_LIMIT, API_IN_FLIGHT, API_SHED_REQUESTS
+
+API_INITIAL_LIMIT = int(os.getenv("API_INITIAL_LIMIT", "20"))
+API_MAX_LIMIT = int(os.getenv("API_MAX_LIMIT", "200"))
+API_RETRY_AFTER = int(os.getenv("API_RETRY_AFTER", "1"))
+# Cheap routes (no Elasticsearch call, or served from a cache): admitted up to the max limit
+API_PRIORITY_ROUTES = os.getenv("API_PRIORITY_ROUTES", "/healthcheck,/metrics").split(",")
+# Unknown paths share a single limit (and metric label) past this many routes
+MAX_ROUTES = 32
+OTHER_ROUTE = "other"
+# Handlers served from the entity cache (see dependencies.get_cached_*_repository)
+CACHED_HANDLERS = ("/batch_get", "?ids")
+
+
+class AdaptiveConcurrencyLimit:
+    def __init__(
+        self,
+        initial_limit: int = API_INITIAL_LIMIT,
+        min_limit: int = 2,
+        max_limit: int = API_MAX_LIMIT,
+        tolerance: float = 2.0,
+        backoff: float = 0.9,
+        baseline_samples: int = 500,
+        baseline_percentile: float = 0.1,
+    ) -> None:
+        """
+        :param tolerance: Latency, as a multiple of the baseline, above which the route is considered overloaded
+        :param baseline_samples: The baseline is taken from the last window of this many successful requests,
+            so it follows lasting changes (bigger index, slower hardware)
+        :param baseline_percentile: Percentile of the window taken as the baseline
+        """
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.tolerance = tolerance
+        self.backoff = backoff
+        self.baseline_samples = baseline_samples
+        self.baseline_percentile = baseline_percentile
+        self.in_flight = 0
+        self.baseline: float | None = None
+        self._window: list[float] = []
+        self._lock = threading.Lock()
+
+    def try_acquire(self, priority: bool = False) -> bool:
+        with self._lock:
+            if self.in_flight >= (self.max_limit if priority else int(self.limit)):
+                return False
+            self.in_flight += 1
+            return True
+
+    def release(self, latency: float, failed: bool = False, sampled: bool = True) -> None:
+        """
+        :param failed: The request failed on the server side (5xx): the limit shrinks
+        :param sampled: The latency is the one of a served request (2xx); client errors only free their slot
+        """
+        with self._lock:
+            self.in_flight -= 1
+            if failed:
+                self._decrease()
+                return
+            if not sampled:
+                return
+
+            self._window.append(latency)
+            if self.baseline is None:
+                self.baseline = latency
+            if len(self._window) >= self.baseline_samples:
+                self._window.sort()
+                self.baseline = self._window[int(len(self._window) * self.baseline_percentile)]
+                self._window = []
+
+            if latency > self.tolerance * self.baseline:
+                self._decrease()
+            else:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+    def _decrease(self) -> None:
+        self.limit = max(self.min_limit, self.limit * self.backoff)
+
+
+class AdmissionControlMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        limit_factory: Callable[[], AdaptiveConcurrencyLimit] = AdaptiveConcurrencyLimit,
+        priority_routes: list[str] = API_PRIORITY_ROUTES,
+        retry_after: int = API_RETRY_AFTER,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        self.app = app
+        self.limit_factory = limit_factory
+        self.priority_routes = tuple(priority_routes)
+        self.retry_after = retry_after
+        self.limits: dict[str, AdaptiveConcurrencyLimit] = {}
+        self._clock = clock
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        route = self.route(scope["path"], scope.get("query_string", b""))
+        limit = self.limits.get(route)
+        if limit is None:
+            if len(self.limits) >= MAX_ROUTES:
+                route = OTHER_ROUTE
+            limit = self.limits.setdefault(route, self.limit_factory())
+        priority = route.startswith(self.priority_routes) or route.endswith(CACHED_HANDLERS)
+        if not limit.try_acquire(priority=priority):
+            API_SHED_REQUESTS.labels(route).inc()
+            await self._reject(send)
+            return
+
+        API_IN_FLIGHT.labels(route).inc()
+        status = 500
+        started = self._clock()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            limit.release(self._clock() - started, failed=status >= 500, sampled=200 <= status < 300)
+            API_IN_FLIGHT.labels(route).dec()
+            API_CONCURRENCY_LIMIT.labels(route).set(limit.limit)
+
+    @staticmethod
+    def route(path: str, query_string: bytes = b"") -> str:
+        """
+        Resource of the path (/videos/?page=2 -> /videos): routes share the limit of their index, except the
+        cached lookups by id (/videos/?ids=1,2 -> /videos?ids, /videos/batch_get -> /videos/batch_get).
+        """
+        resource = "/" + path.strip("/").split("/", 1)[0]
+        if path.rstrip("/").endswith("/batch_get"):
+            return resource + "/batch_get"
+        if any(parameter.startswith(b"ids=") for parameter in query_string.split(b"&")):
+            return resource + "?ids"
+        return resource
+
+    async def _reject(self, send: Send) -> None:
+        body = b'{"detail":"Service overloaded, retry later."}'
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(self.retry_after).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
\ No newline at end of file
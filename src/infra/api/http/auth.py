@@ -1,17 +1,105 @@
+import hashlib
 import os
-from typing import Annotated
+import threading
+import time
+from collections import OrderedDict
+from typing import Annotated, Callable
 
 import jwt
+from cryptography.hazmat.primitives.asymmetric.rsa import RSAPublicKey
+from cryptography.hazmat.primitives.serialization import load_pem_public_key
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
+from src.application.timing import timed
+
+KEYCLOAK_PUBLIC_KEY = os.getenv("KEYCLOAK_PUBLIC_KEY", "")
+# e.g. http://keycloak:8080/realms/codeflix/protocol/openid-connect/certs. Takes precedence over the static key
+KEYCLOAK_JWKS_URL = os.getenv("KEYCLOAK_JWKS_URL")
+AUTH_CACHE_SIZE = int(os.getenv("AUTH_CACHE_SIZE", "10000"))
+
+ALGORITHMS = ["RS256"]
+AUDIENCE = "account"
+
 security = HTTPBearer()
-public_key = f"-----BEGIN PUBLIC KEY-----\n{os.getenv('KEYCLOAK_PUBLIC_KEY', '')}\n-----END PUBLIC KEY-----\n"
+
+
+def load_public_key(key: str) -> RSAPublicKey | None:
+    """Parse the base64 body of the Keycloak realm public key once, instead of on every decode."""
+    if not key:
+        return None
+    return load_pem_public_key(f"-----BEGIN PUBLIC KEY-----\n{key}\n-----END PUBLIC KEY-----\n".encode())
+
+
+class TokenVerifier:
+    """
+    Verifies RS256 bearer tokens, remembering the tokens already verified until they expire.
+
+    The same token is presented on every request of a session: its signature is checked once, then the
+    claims are served from a bounded LRU cache keyed by the SHA-256 of the token, until the token's `exp`.
+    """
+
+    def __init__(
+        self,
+        public_key: RSAPublicKey | None = None,
+        jwks_client: jwt.PyJWKClient | None = None,
+        max_entries: int = AUTH_CACHE_SIZE,
+        max_ttl: float = 300.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        :param public_key: Realm public key, used when there is no `jwks_client`
+        :param jwks_client: Fetches the realm signing keys, cached and fetched again when a token is signed
+            with an unknown key id (key rotation)
+        :param max_ttl: How long a token without `exp` stays cached
+        """
+        self._public_key = public_key
+        self._jwks_client = jwks_client
+        self.max_entries = max_entries
+        self.max_ttl = max_ttl
+        self._clock = clock
+        self._verified: OrderedDict[bytes, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def verify(self, token: str) -> dict:
+        """Claims of the token. Raises `jwt.PyJWTError` when it is invalid or expired."""
+        key = hashlib.sha256(token.encode()).digest()
+        now = self._clock()
+        with self._lock:
+            cached = self._verified.get(key)
+            if cached is not None:
+                expires_at, claims = cached
+                if now < expires_at:
+                    self._verified.move_to_end(key)
+                    return claims
+                del self._verified[key]
+
+        claims = jwt.decode(jwt=token, key=self._signing_key(token), algorithms=ALGORITHMS, audience=AUDIENCE)
+        expires_at = claims.get("exp", now + self.max_ttl)
+        with self._lock:
+            self._verified[key] = (expires_at, claims)
+            if len(self._verified) > self.max_entries:
+                self._verified.popitem(last=False)
+        return claims
+
+    def _signing_key(self, token: str) -> RSAPublicKey:
+        if self._jwks_client is not None:
+            return self._jwks_client.get_signing_key_from_jwt(token).key
+        if self._public_key is None:
+            raise jwt.InvalidKeyError("No public key configured (KEYCLOAK_PUBLIC_KEY or KEYCLOAK_JWKS_URL)")
+        return self._public_key
+
+
+verifier = TokenVerifier(
+    public_key=load_public_key(KEYCLOAK_PUBLIC_KEY),
+    jwks_client=jwt.PyJWKClient(KEYCLOAK_JWKS_URL, cache_keys=True, lifespan=300, timeout=5) if KEYCLOAK_JWKS_URL else None,
+)
 
 
 def authenticate(credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)]) -> None:
     try:
-        jwt.decode(jwt=credentials.credentials, key=public_key, algorithms=["RS256"], audience="account")
+        with timed("auth"):
+            verifier.verify(credentials.credentials)
     except jwt.PyJWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -1,11 +1,18 @@
 from typing import Any
 
-from fastapi import Depends, Query, APIRouter
+from fastapi import Depends, Query, APIRouter, Response
 
+from src.application.get_entities import GetEntities, GetEntitiesInput, GetEntitiesOutput
 from src.application.list_cast_member import CastMemberSortableFields, ListCastMember, ListCastMemberInput
 from src.application.listing import ListOutput
 from src.domain.cast_member import CastMember
-from src.infra.api.http.dependencies import common_parameters, get_cast_member_repository
+from src.domain.repository import Repository
+from src.infra.api.http.dependencies import (
+    common_parameters,
+    get_cast_member_repository,
+    get_cached_cast_member_repository,
+    ids_parameter,
+)
 from src.infra.elasticsearch.elasticsearch_cast_member_repository import ElasticsearchCastMemberRepository
 
 router = APIRouter()
@@ -16,13 +23,29 @@ def list_cast_members(
     repository: ElasticsearchCastMemberRepository = Depends(get_cast_member_repository),
     sort: CastMemberSortableFields = Query(CastMemberSortableFields.NAME, description="Field to sort by"),
     common: dict[str, Any] = Depends(common_parameters),
-) -> ListOutput[CastMember]:
-    return ListCastMember(repository=repository).execute(
+    ids: GetEntitiesInput | None = Depends(ids_parameter),
+) -> ListOutput[CastMember] | Response:
+    if ids is not None:
+        output = GetEntities(repository=get_cached_cast_member_repository(repository)).execute(ids)
+        return Response(output.model_dump_json(), media_type="application/json")
+    output = ListCastMember(repository=repository, read_models=True).execute(
         ListCastMemberInput(
             search=common["search"],
             page=common["page"],
             per_page=common["per_page"],
             sort=sort,
             direction=common["direction"],
+            cursor=common["cursor"],
+            fields=common["fields"],
         )
-    )
\ No newline at end of file
+    )
+    # Serialized as it is: read models and models of a fieldset are not the entities of the response_model
+    return Response(output.model_dump_json(), media_type="application/json")
+
+
+@router.post("/batch_get", response_model=GetEntitiesOutput[CastMember])
+def batch_get_cast_members(
+    input: GetEntitiesInput,
+    repository: Repository[CastMember] = Depends(get_cached_cast_member_repository),
+) -> GetEntitiesOutput[CastMember]:
+    return GetEntities(repository=repository).execute(input)
\ No newline at end of file
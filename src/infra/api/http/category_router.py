@@ -1,12 +1,19 @@
 from typing import Any
 
-from fastapi import Depends, Query, APIRouter
+from fastapi import Depends, Query, APIRouter, Response
 
+from src.application.get_entities import GetEntities, GetEntitiesInput, GetEntitiesOutput
 from src.application.list_category import CategorySortableFields, ListCategory, ListCategoryInput
 from src.application.listing import ListOutput
 from src.domain.category import Category
+from src.domain.repository import Repository
 from src.infra.api.http.auth import authenticate
-from src.infra.api.http.dependencies import get_category_repository, common_parameters
+from src.infra.api.http.dependencies import (
+    get_category_repository,
+    common_parameters,
+    get_cached_category_repository,
+    ids_parameter,
+)
 from src.infra.elasticsearch.elasticsearch_category_repository import ElasticsearchCategoryRepository
 
 router = APIRouter()
@@ -17,14 +24,31 @@ def list_categories(
     repository: ElasticsearchCategoryRepository = Depends(get_category_repository),
     sort: CategorySortableFields = Query(CategorySortableFields.NAME, description="Field to sort by"),
     common: dict[str, Any] = Depends(common_parameters),
+    ids: GetEntitiesInput | None = Depends(ids_parameter),
     auth: None = Depends(authenticate),
-) -> ListOutput[Category]:
-    return ListCategory(repository=repository).execute(
+) -> ListOutput[Category] | Response:
+    if ids is not None:
+        output = GetEntities(repository=get_cached_category_repository(repository)).execute(ids)
+        return Response(output.model_dump_json(), media_type="application/json")
+    output = ListCategory(repository=repository, read_models=True).execute(
         ListCategoryInput(
             search=common["search"],
             page=common["page"],
             per_page=common["per_page"],
             sort=sort,
             direction=common["direction"],
+            cursor=common["cursor"],
+            fields=common["fields"],
         )
-    )
\ No newline at end of file
+    )
+    # Serialized as it is: read models and models of a fieldset are not the entities of the response_model
+    return Response(output.model_dump_json(), media_type="application/json")
+
+
+@router.post("/batch_get", response_model=GetEntitiesOutput[Category])
+def batch_get_categories(
+    input: GetEntitiesInput,
+    repository: Repository[Category] = Depends(get_cached_category_repository),
+    auth: None = Depends(authenticate),
+) -> GetEntitiesOutput[Category]:
+    return GetEntities(repository=repository).execute(input)
\ No newline at end of file
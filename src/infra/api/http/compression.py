@@ -0,0 +1,150 @@
+"""
+Compression of the API responses, negotiated from Accept-Encoding: zstd and brotli when their packages are
+installed (pip install zstandard brotli), gzip otherwise.
+
+Listing pages are served again and again with the same content, so compressed bodies are kept in a bounded
+LRU cache keyed by a digest of the uncompressed body and the encoding: a page is compressed once, then served
+from the cache.
+"""
+import gzip
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "5"))
+COMPRESSION_ZSTD_LEVEL = int(os.getenv("COMPRESSION_ZSTD_LEVEL", "3"))
+COMPRESSION_CACHE_SIZE = int(os.getenv("COMPRESSION_CACHE_SIZE", "1024"))
+
+COMPRESSIBLE_TYPES = ("application/json", "application/graphql-response+json", "text/")
+
+
+def accepted_encoding(accept_encoding: str, available: list[str]) -> str | None:
+    """First of the `available` encodings (by server preference) the client accepts, if any."""
+    accepted = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                continue
+        accepted[name.strip().lower()] = quality
+    for encoding in available:
+        if accepted.get(encoding, accepted.get("*", 0)) > 0:
+            return encoding
+    return None
+
+
+class CompressedBodyCache:
+    def __init__(self, max_entries: int = COMPRESSION_CACHE_SIZE) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[bytes, str], bytes] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    def get_or_compress(self, body: bytes, encoding: str, compress: Callable[[bytes], bytes]) -> bytes:
+        key = (hashlib.blake2b(body, digest_size=16).digest(), encoding)
+        with self._lock:
+            compressed = self._entries.get(key)
+            if compressed is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return compressed
+            self.misses += 1
+
+        compressed = compress(body)
+        with self._lock:
+            self._entries[key] = compressed
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return compressed
+
+
+class CompressionMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = COMPRESSION_MIN_SIZE,
+        gzip_level: int = COMPRESSION_GZIP_LEVEL,
+        brotli_quality: int = COMPRESSION_BROTLI_QUALITY,
+        zstd_level: int = COMPRESSION_ZSTD_LEVEL,
+        cache: CompressedBodyCache | None = None,
+    ) -> None:
+        """
+        :param minimum_size: Smaller bodies are sent as they are: compressing them saves less than it costs
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.cache = cache if cache is not None else CompressedBodyCache()
+        self.compressors: dict[str, Callable[[bytes], bytes]] = {}
+        if zstandard is not None:
+            self.compressors["zstd"] = zstandard.ZstdCompressor(level=zstd_level).compress
+        if brotli is not None:
+            self.compressors["br"] = lambda body: brotli.compress(body, quality=brotli_quality)
+        self.compressors["gzip"] = lambda body: gzip.compress(body, compresslevel=gzip_level, mtime=0)
+        self._encodings = list(self.compressors)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = accepted_encoding(Headers(scope=scope).get("accept-encoding", ""), self._encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Message | None = None
+        streaming = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, streaming
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body" or start is None:
+                await send(message)
+                return
+            if streaming or message.get("more_body", False):
+                # Streamed responses are passed through as they are
+                if not streaming:
+                    streaming = True
+                    await send(start)
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            headers = MutableHeaders(raw=start["headers"])
+            if self._should_compress(headers, body):
+                body = self.cache.get_or_compress(body, encoding, self.compressors[encoding])
+                headers["Content-Encoding"] = encoding
+                headers["Content-Length"] = str(len(body))
+                headers.add_vary_header("Accept-Encoding")
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_compressed)
+
+    def _should_compress(self, headers: MutableHeaders, body: bytes) -> bool:
+        return (
+            len(body) >= self.minimum_size
+            and "content-encoding" not in headers
+            and headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
+        )
\ No newline at end of file
@@ -1,16 +1,38 @@
+import json
+from functools import lru_cache
 from typing import Any
 
-from fastapi import Query
+from elasticsearch import Elasticsearch
+from fastapi import Depends, HTTPException, Query, status
+from pydantic import ValidationError
 
+from src.application.fieldsets import parse_fields
+from src.application.get_entities import MAX_IDS, GetEntitiesInput
 from src.application.listing import DEFAULT_PAGINATION_SIZE, SortDirection
+from src.domain.cast_member import CastMember
 from src.domain.cast_member_repository import CastMemberRepository
+from src.domain.category import Category
 from src.domain.category_repository import CategoryRepository
+from src.domain.entity import Entity
+from src.domain.genre import Genre
 from src.domain.genre_repository import GenreRepository
+from src.domain.repository import Repository
+from src.domain.video import Video
 from src.domain.video_repository import VideoRepository
+from src.infra.elasticsearch import ELASTICSEARCH_HOST
 from src.infra.elasticsearch.elasticsearch_cast_member_repository import ElasticsearchCastMemberRepository
 from src.infra.elasticsearch.elasticsearch_category_repository import ElasticsearchCategoryRepository
 from src.infra.elasticsearch.elasticsearch_genre_repository import ElasticsearchGenreRepository
 from src.infra.elasticsearch.elasticsearch_video_repository import ElasticsearchVideoRepository
+from src.infra.elasticsearch.entity_cache import CachedRepository, EntityCache
+
+# Entities fetched by id, shared by the requests of the process
+entity_caches: dict[type[Entity], EntityCache] = {
+    Category: EntityCache("category"),
+    CastMember: EntityCache("cast_member"),
+    Genre: EntityCache("genre"),
+    Video: EntityCache("video"),
+}
 
 
 def common_parameters(
@@ -25,26 +47,83 @@ def common_parameters(
     direction: SortDirection = Query(
         SortDirection.ASC, description="Sort direction (asc or desc)"
     ),
+    cursor: str | None = Query(
+        None, description="meta.next_cursor or meta.prev_cursor of a previous page, instead of page"
+    ),
+    fields: str | None = Query(
+        None,
+        description="Comma-separated fields to return, e.g. id,title,banner_url. "
+        "The id and the sort field are always returned",
+    ),
 ) -> dict[str, Any]:
     return {
         "search": search,
         "page": page,
         "per_page": per_page,
         "direction": direction,
+        "cursor": cursor,
+        "fields": parse_fields(fields),
     }
 
 
+def ids_parameter(
+    ids: str | None = Query(
+        None, description=f"Comma-separated ids of the entities to fetch (at most {MAX_IDS}), instead of a listing"
+    ),
+) -> GetEntitiesInput | None:
+    if ids is None:
+        return None
+    try:
+        return GetEntitiesInput(ids=[id for id in ids.split(",") if id])
+    except ValidationError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=json.loads(e.json(include_url=False)))
+
+
+@lru_cache(maxsize=1)
+def get_elasticsearch_client() -> Elasticsearch:
+    """
+    Client shared by the requests of the process: its pool keeps the connections to Elasticsearch alive,
+    instead of every request opening its own. Created on first use, so workers forked from a preloaded app
+    (see gunicorn_conf) don't share the sockets of the master.
+    """
+    return Elasticsearch(hosts=[ELASTICSEARCH_HOST])
+
+
 def get_category_repository() -> CategoryRepository:
-    return ElasticsearchCategoryRepository()
+    return ElasticsearchCategoryRepository(client=get_elasticsearch_client())
 
 
 def get_cast_member_repository() -> CastMemberRepository:
-    return ElasticsearchCastMemberRepository()
+    return ElasticsearchCastMemberRepository(client=get_elasticsearch_client())
 
 
 def get_genre_repository() -> GenreRepository:
-    return ElasticsearchGenreRepository()
+    return ElasticsearchGenreRepository(client=get_elasticsearch_client())
 
 
 def get_video_repository() -> VideoRepository:
-    return ElasticsearchVideoRepository()
\ No newline at end of file
+    return ElasticsearchVideoRepository(client=get_elasticsearch_client())
+
+
+def get_cached_category_repository(
+    repository: CategoryRepository = Depends(get_category_repository),
+) -> Repository[Category]:
+    return CachedRepository(repository, entity_caches[Category])
+
+
+def get_cached_cast_member_repository(
+    repository: CastMemberRepository = Depends(get_cast_member_repository),
+) -> Repository[CastMember]:
+    return CachedRepository(repository, entity_caches[CastMember])
+
+
+def get_cached_genre_repository(
+    repository: GenreRepository = Depends(get_genre_repository),
+) -> Repository[Genre]:
+    return CachedRepository(repository, entity_caches[Genre])
+
+
+def get_cached_video_repository(
+    repository: VideoRepository = Depends(get_video_repository),
+) -> Repository[Video]:
+    return CachedRepository(repository, entity_caches[Video])
\ No newline at end of file
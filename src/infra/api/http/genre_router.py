@@ -1,12 +1,19 @@
 from typing import Any
 
-from fastapi import Depends, Query, APIRouter
+from fastapi import Depends, Query, APIRouter, Response
 
+from src.application.get_entities import GetEntities, GetEntitiesInput, GetEntitiesOutput
 from src.application.list_genre import GenreSortableFields, ListGenre, ListGenreInput
 from src.application.listing import ListOutput
 from src.domain.genre import Genre
+from src.domain.repository import Repository
 from src.domain.genre_repository import GenreRepository
-from src.infra.api.http.dependencies import common_parameters, get_genre_repository
+from src.infra.api.http.dependencies import (
+    common_parameters,
+    get_genre_repository,
+    get_cached_genre_repository,
+    ids_parameter,
+)
 
 router = APIRouter()
 
@@ -16,13 +23,29 @@ def list_genres(
     repository: GenreRepository = Depends(get_genre_repository),
     sort: GenreSortableFields = Query(GenreSortableFields.NAME, description="Field to sort by"),
     common: dict[str, Any] = Depends(common_parameters),
-) -> ListOutput[Genre]:
-    return ListGenre(repository=repository).execute(
+    ids: GetEntitiesInput | None = Depends(ids_parameter),
+) -> ListOutput[Genre] | Response:
+    if ids is not None:
+        output = GetEntities(repository=get_cached_genre_repository(repository)).execute(ids)
+        return Response(output.model_dump_json(), media_type="application/json")
+    output = ListGenre(repository=repository, read_models=True).execute(
         ListGenreInput(
             search=common["search"],
             page=common["page"],
             per_page=common["per_page"],
             sort=sort,
             direction=common["direction"],
+            cursor=common["cursor"],
+            fields=common["fields"],
         )
-    )
\ No newline at end of file
+    )
+    # Serialized as it is: read models and models of a fieldset are not the entities of the response_model
+    return Response(output.model_dump_json(), media_type="application/json")
+
+
+@router.post("/batch_get", response_model=GetEntitiesOutput[Genre])
+def batch_get_genres(
+    input: GetEntitiesInput,
+    repository: Repository[Genre] = Depends(get_cached_genre_repository),
+) -> GetEntitiesOutput[Genre]:
+    return GetEntities(repository=repository).execute(input)
\ No newline at end of file
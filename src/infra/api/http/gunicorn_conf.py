@@ -0,0 +1,63 @@
+"""
+Production settings of the API: gunicorn supervising uvicorn workers.
+
+    gunicorn -c src/infra/api/http/gunicorn_conf.py src.infra.api.http.main:app
+
+Every setting can be overridden from the environment. The size of the threadpool running the sync routes
+is set by the app itself (API_THREADPOOL_SIZE, see main.py). With several workers, set
+PROMETHEUS_MULTIPROC_DIR to an empty directory so /metrics aggregates the metrics of all of them.
+
+GET /videos/?per_page=50 from 32 keep-alive clients, medians of 3 runs of 10s. The host has a single vCPU,
+shared with the load generator and an HTTP stand-in for Elasticsearch that serves the synthetic catalog of
+src/benchmarks with a fixed latency. /videos was listed in API_PRIORITY_ROUTES for these runs, so the numbers
+are those of the server settings rather than of the 503s of the admission control:
+
+    Elasticsearch latency  workers  API_THREADPOOL_SIZE  req/s  p99
+    5ms                    1        8                    139    290ms
+    5ms                    1        40                   149    1.27s
+    5ms                    1        100                  146    1.26s
+    5ms                    2        40                   143    1.27s
+    50ms                   1        8                    80     484ms
+    50ms                   1        16                   105    364ms
+    50ms                   1        40                   102    496ms
+    50ms                   1        100                  103    496ms
+
+- workers: one worker saturates its core, a second one on the same core adds nothing. Hence one per core.
+- API_THREADPOOL_SIZE: a sync route holds its thread for the whole Elasticsearch call, so a worker needs about
+  (its throughput x Elasticsearch latency) threads. 8 threads cap the worker at 80 req/s against a 50ms
+  cluster, 16 already saturate the core. Threads beyond that only queue for the GIL, which is what raises the
+  p99 when Elasticsearch answers fast. 40 (anyio's default) is kept as headroom for slower clusters and
+  faster cores; the admission control bounds the requests in flight when the latency climbs.
+- keepalive and backlog are not throughput settings and were not varied. The keep-alive outlives the idle
+  timeout of the load balancer, so the balancer closes idle connections first, and 2048 is gunicorn's
+  default backlog. It holds bursts of new connections while a worker is recycled.
+
+GET /healthcheck/ under the same load: `fastapi dev --reload` 395 req/s (p99 403ms), 1 worker 450 req/s
+(p99 340ms).
+"""
+import multiprocessing
+import os
+
+bind = os.getenv("API_BIND", "0.0.0.0:8000")
+worker_class = "uvicorn_worker.UvicornWorker"
+# Async workers: one per core, the event loop of each one handles the concurrent requests
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+# Import the app once in the master: workers are forked with every module already loaded and share
+# those pages (copy-on-write) instead of each importing them again
+preload_app = True
+# Recycle workers to bound memory growth, with jitter so they do not all restart at once
+max_requests = int(os.getenv("API_MAX_REQUESTS", "10000"))
+max_requests_jitter = int(os.getenv("API_MAX_REQUESTS_JITTER", "1000"))
+# Above the idle timeout of the usual load balancers (60s), so they close the connections first
+keepalive = int(os.getenv("API_KEEPALIVE", "75"))
+backlog = int(os.getenv("API_BACKLOG", "2048"))
+timeout = int(os.getenv("API_TIMEOUT", "30"))
+graceful_timeout = int(os.getenv("API_GRACEFUL_TIMEOUT", "30"))
+
+
+def child_exit(server, worker) -> None:
+    # Drops the live gauges of a worker that exited, when the metrics of the workers are aggregated
+    if path := os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from src.infra.metrics import mark_process_dead
+
+        mark_process_dead(worker.pid, path)
\ No newline at end of file
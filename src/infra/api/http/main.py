@@ -1,19 +1,71 @@
-from fastapi import FastAPI
+import os
+from contextlib import asynccontextmanager
 
+import anyio.to_thread
+from confluent_kafka import Consumer as KafkaConsumer
+from fastapi import FastAPI, Query, Request, status
+from fastapi.responses import JSONResponse
+from prometheus_client import make_asgi_app
+
+from src.application.cursor import InvalidCursorError
+from src.application.fieldsets import InvalidFieldsError
+from src.infra import metrics
 from src.infra.api.graphql.schema_pydantic import graphql_app as graphql_router
+from src.infra.api.http.admission import AdmissionControlMiddleware
+from src.infra.api.http.compression import CompressionMiddleware
+from src.infra.api.http.dependencies import entity_caches
 from src.infra.api.http.cast_member_router import router as cast_member_router
 from src.infra.api.http.category_router import router as category_router
 from src.infra.api.http.genre_router import router as genre_router
+from src.infra.api.http.server_timing import SERVER_TIMING, ServerTimingMiddleware
 from src.infra.api.http.video_router import router as video_router
+from src.infra.elasticsearch.query_log import query_log
+from src.infra.kafka.cache_invalidator import ENTITY_CACHE_INVALIDATION, CacheInvalidator, invalidator_config
+
+# Sync routes and dependencies (every Elasticsearch call) run in anyio's threadpool: its size caps the
+# requests served at once by a worker. anyio defaults to 40.
+API_THREADPOOL_SIZE = int(os.getenv("API_THREADPOOL_SIZE", "40"))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    anyio.to_thread.current_default_thread_limiter().total_tokens = API_THREADPOOL_SIZE
+    invalidator = None
+    if ENTITY_CACHE_INVALIDATION:
+        # Started in each worker: threads do not survive the fork of a preloaded app
+        invalidator = CacheInvalidator(KafkaConsumer(invalidator_config()), entity_caches)
+        invalidator.start()
+    yield
+    if invalidator is not None:
+        invalidator.stop()
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(CompressionMiddleware)
+if SERVER_TIMING:
+    app.add_middleware(ServerTimingMiddleware)
+# Outermost: shed requests before any work is done on them
+app.add_middleware(AdmissionControlMiddleware)
 app.include_router(category_router, prefix="/categories")
 app.include_router(cast_member_router, prefix="/cast_members")
 app.include_router(genre_router, prefix="/genres")
 app.include_router(video_router, prefix="/videos")
 app.include_router(graphql_router, prefix="/graphql")
+app.mount("/metrics", make_asgi_app(registry=metrics.registry()))
+
+
+@app.exception_handler(InvalidCursorError)
+@app.exception_handler(InvalidFieldsError)
+def invalid_listing_input(request: Request, exc: ValueError) -> JSONResponse:
+    return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content={"detail": str(exc)})
 
 
 @app.get("/healthcheck/")
 def healthcheck():
-    return {"status": "ok"}
\ No newline at end of file
+    return {"status": "ok"}
+
+
+@app.get("/query_stats/")
+def query_stats(limit: int = Query(10, ge=1, le=100)):
+    """Search shapes that cost the most Elasticsearch time in this worker (see `api_es_query_seconds`)."""
+    return {"shapes": query_log.top(limit)}
\ No newline at end of file
@@ -0,0 +1,44 @@
+import os
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.application.timing import collect
+from src.infra.metrics import API_STAGE_LATENCY
+
+# Off by default: the header tells clients how the API spends its time
+SERVER_TIMING = os.getenv("SERVER_TIMING", "false").lower() == "true"
+
+
+class ServerTimingMiddleware:
+    """
+    Collects the stages timed while serving each request and reports them in a Server-Timing header (in ms,
+    as browsers show it) and in the `api_stage_seconds` histograms. `render` is the time from the end of the
+    last stage to the response: serialization and compression.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with collect() as timings:
+            async def send_with_timings(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    now = time.perf_counter()
+                    if timings.stages:
+                        timings.add("render", now - timings.last_end)
+                    timings.add("total", now - timings.started)
+                    MutableHeaders(scope=message).append(
+                        "Server-Timing",
+                        ", ".join(f"{stage};dur={seconds * 1000:.2f}" for stage, seconds in timings.stages.items()),
+                    )
+                    for stage, seconds in timings.stages.items():
+                        API_STAGE_LATENCY.labels(stage).observe(seconds)
+                await send(message)
+
+            await self.app(scope, receive, send_with_timings)
\ No newline at end of file
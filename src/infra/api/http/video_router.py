@@ -1,12 +1,19 @@
 from typing import Any
 
-from fastapi import Depends, Query, APIRouter
+from fastapi import Depends, Query, APIRouter, Response
 
+from src.application.get_entities import GetEntities, GetEntitiesInput, GetEntitiesOutput
 from src.application.list_video import VideoSortableFields, ListVideo, ListVideoInput
 from src.application.listing import ListOutput
 from src.domain.video import Video
+from src.domain.repository import Repository
 from src.domain.video_repository import VideoRepository
-from src.infra.api.http.dependencies import common_parameters, get_video_repository
+from src.infra.api.http.dependencies import (
+    common_parameters,
+    get_video_repository,
+    get_cached_video_repository,
+    ids_parameter,
+)
 
 router = APIRouter()
 
@@ -16,10 +23,24 @@ def list_videos(
     repository: VideoRepository = Depends(get_video_repository),
     sort: VideoSortableFields = Query(VideoSortableFields.TITLE, description="Field to sort by"),
     common: dict[str, Any] = Depends(common_parameters),
-) -> ListOutput[Video]:
-    return ListVideo(repository=repository).execute(
+    ids: GetEntitiesInput | None = Depends(ids_parameter),
+) -> ListOutput[Video] | Response:
+    if ids is not None:
+        output = GetEntities(repository=get_cached_video_repository(repository)).execute(ids)
+        return Response(output.model_dump_json(), media_type="application/json")
+    output = ListVideo(repository=repository, read_models=True).execute(
         ListVideoInput(
             **common,
             sort=sort,
         )
-    )
\ No newline at end of file
+    )
+    # Serialized as it is: read models and models of a fieldset are not the entities of the response_model
+    return Response(output.model_dump_json(), media_type="application/json")
+
+
+@router.post("/batch_get", response_model=GetEntitiesOutput[Video])
+def batch_get_videos(
+    input: GetEntitiesInput,
+    repository: Repository[Video] = Depends(get_cached_video_repository),
+) -> GetEntitiesOutput[Video]:
+    return GetEntities(repository=repository).execute(input)
\ No newline at end of file
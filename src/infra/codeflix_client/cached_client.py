@@ -0,0 +1,121 @@
+import logging
+import os
+import sqlite3
+import threading
+from collections import Counter, OrderedDict
+from datetime import datetime
+from uuid import UUID
+
+from src.infra.codeflix_client.codeflix_client import CodeflixClient
+from src.infra.codeflix_client.dtos import VideoResponse
+from src.infra.metrics import CACHE_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+# SQLite file of the on-disk tier, shared by the consumer processes and kept across restarts
+CODEFLIX_CACHE_PATH = os.getenv("CODEFLIX_CACHE_PATH")
+CODEFLIX_CACHE_SIZE = int(os.getenv("CODEFLIX_CACHE_SIZE", "10000"))
+
+
+class CachedCodeflixClient(CodeflixClient):
+    """
+    Serves the video details already fetched for the same (id, updated_at), so replays, rebalances and
+    repeated snapshots of unchanged videos never call the API again.
+
+    Lookups go through a bounded in-memory LRU, then the optional SQLite tier. Only the latest known version
+    of each video is kept. Calls without `updated_at` cannot tell whether the video changed: they bypass
+    the cache.
+    """
+
+    def __init__(
+        self,
+        client: CodeflixClient,
+        max_entries: int = CODEFLIX_CACHE_SIZE,
+        path: str | None = CODEFLIX_CACHE_PATH,
+    ) -> None:
+        self._client = client
+        self.max_entries = max_entries
+        self._memory: OrderedDict[UUID, tuple[datetime, VideoResponse]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats: Counter[str] = Counter()
+        self._db: sqlite3.Connection | None = None
+        if path:
+            self._db = sqlite3.connect(path, timeout=5.0, check_same_thread=False, isolation_level=None)
+            # Readers do not block the writer: several consumer processes can share the file
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS videos (id TEXT PRIMARY KEY, updated_at TEXT NOT NULL, body BLOB NOT NULL)"
+            )
+
+    def get_video(self, id: UUID, updated_at: datetime | None = None) -> VideoResponse:
+        if updated_at is None:
+            return self._client.get_video(id=id)
+
+        if (video := self._lookup(id, updated_at)) is None:
+            video = self._client.get_video(id=id, updated_at=updated_at)
+            self._store(id, updated_at, video)
+        return video
+
+    def get_videos(self, ids: list[UUID], versions: dict[UUID, datetime] | None = None) -> dict[UUID, VideoResponse]:
+        versions = versions or {}
+        videos = {}
+        for id in ids:
+            if id in versions and (video := self._lookup(id, versions[id])) is not None:
+                videos[id] = video
+
+        if missing := [id for id in dict.fromkeys(ids) if id not in videos]:
+            fetched = self._client.get_videos(ids=missing, versions={id: versions[id] for id in missing if id in versions})
+            for id, video in fetched.items():
+                if id in versions:
+                    self._store(id, versions[id], video)
+            videos.update(fetched)
+        return videos
+
+    @property
+    def hit_rate(self) -> float:
+        # Every lookup goes through the memory tier first
+        lookups = self.stats["memory_hit"] + self.stats["memory_miss"]
+        return (self.stats["memory_hit"] + self.stats["disk_hit"]) / lookups if lookups else 0.0
+
+    def _lookup(self, id: UUID, updated_at: datetime) -> VideoResponse | None:
+        with self._lock:
+            entry = self._memory.get(id)
+            if entry is not None and entry[0] == updated_at:
+                self._memory.move_to_end(id)
+                self._record("memory", "hit")
+                return entry[1]
+            self._record("memory", "miss")
+
+            if self._db is None:
+                return None
+
+            row = self._db.execute(
+                "SELECT body FROM videos WHERE id = ? AND updated_at = ?", (str(id), updated_at.isoformat())
+            ).fetchone()
+            if row is None:
+                self._record("disk", "miss")
+                return None
+
+            self._record("disk", "hit")
+            video = VideoResponse.model_validate_json(row[0])
+            self._remember(id, updated_at, video)
+            return video
+
+    def _store(self, id: UUID, updated_at: datetime, video: VideoResponse) -> None:
+        with self._lock:
+            self._remember(id, updated_at, video)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO videos (id, updated_at, body) VALUES (?, ?, ?)",
+                    (str(id), updated_at.isoformat(), video.model_dump_json()),
+                )
+
+    def _remember(self, id: UUID, updated_at: datetime, video: VideoResponse) -> None:
+        self._memory[id] = (updated_at, video)
+        self._memory.move_to_end(id)
+        if len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _record(self, tier: str, result: str) -> None:
+        CACHE_REQUESTS.labels(tier, result).inc()
+        self.stats[f"{tier}_{result}"] += 1
\ No newline at end of file
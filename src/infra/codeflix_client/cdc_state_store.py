@@ -0,0 +1,139 @@
+"""
+Local state store of the video relations, joined from the CDC streams of the catalog tables instead of
+fetched from the admin API. Like `genre_categories`, each relation is a table with its own id:
+
+    video_categories   (id, video_id, category_id)
+    video_genres       (id, video_id, genre_id)
+    video_cast_members (id, video_id, cast_member_id)
+    video_banners      (id, video_id, name, raw_location)
+
+The store is an embedded SQLite file (VIDEO_STATE_STORE_PATH), shared by the consumer processes of a host.
+Running consumers on several hosts requires the relation topics to be keyed and partitioned by video_id,
+so every row of a video reaches the same store.
+"""
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from uuid import UUID
+
+from src.infra.codeflix_client.codeflix_client import CodeflixClient
+from src.infra.codeflix_client.dtos import VideoResponse
+from src.infra.kafka.operation import Operation
+from src.infra.kafka.parser import ParsedEvent
+
+VIDEO_STATE_STORE_PATH = os.getenv("VIDEO_STATE_STORE_PATH")
+
+VIDEOS_TABLE = "videos"
+BANNERS_TABLE = "video_banners"
+# Relation table -> column of the related entity id
+RELATION_TABLES = {
+    "video_categories": "category_id",
+    "video_genres": "genre_id",
+    "video_cast_members": "cast_member_id",
+}
+VIDEO_RELATION_TABLES = [*RELATION_TABLES, BANNERS_TABLE]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS videos (id TEXT PRIMARY KEY, row TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS relations (id TEXT PRIMARY KEY, video_id TEXT NOT NULL, kind TEXT NOT NULL, target_id TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS relations_video_id ON relations (video_id);
+CREATE TABLE IF NOT EXISTS banners (id TEXT PRIMARY KEY, video_id TEXT NOT NULL, name TEXT NOT NULL, raw_location TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS banners_video_id ON banners (video_id);
+"""
+
+
+class IncompleteVideoError(LookupError):
+    pass
+
+
+class CdcVideoStateStore(CodeflixClient):
+    def __init__(self, path: str = ":memory:") -> None:
+        self._db = sqlite3.connect(path, timeout=5.0, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def apply(self, event: ParsedEvent) -> None:
+        """Keep the row of a `videos` or relation table event."""
+        table, row = event.source.get("table"), event.payload
+        deleted = event.operation == Operation.DELETE
+        with self._lock:
+            if table == VIDEOS_TABLE:
+                if deleted:
+                    self._db.execute("DELETE FROM videos WHERE id = ?", (row["id"],))
+                else:
+                    self._db.execute("INSERT OR REPLACE INTO videos (id, row) VALUES (?, ?)", (row["id"], json.dumps(row)))
+            elif table in RELATION_TABLES:
+                if deleted:
+                    self._db.execute("DELETE FROM relations WHERE id = ?", (row["id"],))
+                else:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO relations (id, video_id, kind, target_id) VALUES (?, ?, ?, ?)",
+                        (row["id"], row["video_id"], table, row[RELATION_TABLES[table]]),
+                    )
+            elif table == BANNERS_TABLE:
+                if deleted:
+                    self._db.execute("DELETE FROM banners WHERE id = ?", (row["id"],))
+                else:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO banners (id, video_id, name, raw_location) VALUES (?, ?, ?, ?)",
+                        (row["id"], row["video_id"], row["name"], row["raw_location"]),
+                    )
+
+    def video_row(self, id: UUID | str) -> dict | None:
+        """Latest `videos` row of the video, as received from the CDC stream."""
+        with self._lock:
+            result = self._db.execute("SELECT row FROM videos WHERE id = ?", (str(id),)).fetchone()
+        return json.loads(result[0]) if result else None
+
+    def is_complete(self, id: UUID | str) -> bool:
+        """Whether the video and its banner were received: a Video cannot be built without them."""
+        with self._lock:
+            return self._db.execute(
+                "SELECT 1 FROM videos JOIN banners ON banners.video_id = videos.id WHERE videos.id = ? LIMIT 1",
+                (str(id),),
+            ).fetchone() is not None
+
+    def get_video(self, id: UUID, updated_at: datetime | None = None) -> VideoResponse:
+        videos = self.get_videos(ids=[id])
+        return videos[id]
+
+    def get_videos(self, ids: list[UUID], versions: dict[UUID, datetime] | None = None) -> dict[UUID, VideoResponse]:
+        keys = [str(id) for id in dict.fromkeys(ids)]
+        placeholders = ",".join("?" * len(keys))
+        with self._lock:
+            rows = self._db.execute(f"SELECT id, row FROM videos WHERE id IN ({placeholders})", keys).fetchall()
+            relations = self._db.execute(
+                f"SELECT video_id, kind, target_id FROM relations WHERE video_id IN ({placeholders})", keys
+            ).fetchall()
+            banners = self._db.execute(
+                f"SELECT video_id, name, raw_location FROM banners WHERE video_id IN ({placeholders})", keys
+            ).fetchall()
+
+        related: dict[str, dict[str, list[dict]]] = {key: {table: [] for table in RELATION_TABLES} for key in keys}
+        for video_id, kind, target_id in relations:
+            related[video_id][kind].append({"id": target_id})
+        banner_by_video = {video_id: {"name": name, "raw_location": raw_location} for video_id, name, raw_location in banners}
+
+        videos = {}
+        for key, row in rows:
+            if key not in banner_by_video:
+                continue
+            row = json.loads(row)
+            videos[UUID(key)] = VideoResponse(
+                id=key,
+                title=row["title"],
+                launch_year=row["launch_year"],
+                rating=row["rating"],
+                is_active=row["is_active"],
+                categories=related[key]["video_categories"],
+                genres=related[key]["video_genres"],
+                cast_members=related[key]["video_cast_members"],
+                banner=banner_by_video[key],
+            )
+
+        if missing := [id for id in ids if id not in videos]:
+            raise IncompleteVideoError(f"Video or banner rows not received yet: {missing}")
+        return videos
\ No newline at end of file
@@ -1,10 +1,21 @@
 from abc import abstractmethod, ABC
+from datetime import datetime
 from uuid import UUID
 
 from src.infra.codeflix_client.dtos import VideoResponse
 
 
 class CodeflixClient(ABC):
+    """
+    `updated_at` (or `versions`, by id) is the version of the video the caller knows about from its event.
+    Implementations may use it to serve unchanged videos without calling the API again.
+    """
+
+    @abstractmethod
+    def get_video(self, id: UUID, updated_at: datetime | None = None) -> VideoResponse:
+        raise NotImplementedError
+
     @abstractmethod
-    def get_video(self, id: UUID) -> VideoResponse:
+    def get_videos(self, ids: list[UUID], versions: dict[UUID, datetime] | None = None) -> dict[UUID, VideoResponse]:
+        """Fetch several videos at once, keyed by id. Raises if any of them could not be fetched."""
         raise NotImplementedError
\ No newline at end of file
@@ -1,44 +1,124 @@
+import logging
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable
 from uuid import UUID
 
+import httpx
+from pydantic import TypeAdapter
+
 from src.infra.codeflix_client.codeflix_client import CodeflixClient
 from src.infra.codeflix_client.dtos import VideoResponse
+from src.infra.metrics import STAGE_LATENCY
+
+logger = logging.getLogger(__name__)
+
+CODEFLIX_API_URL = os.getenv("CODEFLIX_API_URL", "http://localhost:8001")
+# Requires the h2 package (pip install httpx[http2])
+CODEFLIX_API_HTTP2 = os.getenv("CODEFLIX_API_HTTP2", "false").lower() == "true"
+# Whether the upstream serves several videos per request (GET /api/videos?ids=...)
+CODEFLIX_API_BATCH = os.getenv("CODEFLIX_API_BATCH", "false").lower() == "true"
+
+# The upstream is restarting, overloaded or throttling: the same request may succeed a bit later
+RETRYABLE_STATUS_CODES = {429, 502, 503, 504}
+# Ids per batch request, so the query string stays well under the usual URL length limits
+BATCH_MAX_IDS = 100
+
+_VIDEO_LIST = TypeAdapter(list[VideoResponse])
 
 
 class HttpClient(CodeflixClient):
-    def get_video(self, id: UUID) -> VideoResponse:
-        return VideoResponse(**{
-            "id": id,
-            "title": "The Godfather",
-            "launch_year": 1972,
-            "rating": "AGE_18",
-            "is_active": True,
-            "categories": [
-                {
-                    "id": "142f2b4b-1b7b-4f3b-8eab-3f2f2b4b1b7b",
-                    "name": "Action",
-                    "description": "Action movies",
-                }
-            ],
-            "cast_members": [
-                {
-                    "id": "242f2b4b-1b7b-4f3b-8eab-3f2f2b4b1b7b",
-                    "name": "Marlon Brando",
-                    "type": "ACTOR",
-                },
-                {
-                    "id": "342f2b4b-1b7b-4f3b-8eab-3f2f2b4b1b7b",
-                    "name": "Al Pacino",
-                    "type": "DIRECTOR",
-                },
-            ],
-            "genres": [
-                {
-                    "id": "442f2b4b-1b7b-4f3b-8eab-3f2f2b4b1b7b",
-                    "name": "Drama",
-                }
-            ],
-            "banner": {
-                "name": "The Godfather",
-                "raw_location": "https://banner.com/the-godfather",
-            },
-        })
\ No newline at end of file
+    def __init__(
+        self,
+        base_url: str | None = None,
+        client: httpx.Client | None = None,
+        max_retries: int = 3,
+        backoff: float = 0.1,
+        max_backoff: float = 2.0,
+        sleep: Callable[[float], None] = time.sleep,
+        batch_endpoint: bool = CODEFLIX_API_BATCH,
+        max_concurrency: int = 16,
+    ) -> None:
+        """
+        :param base_url: Codeflix admin catalog API, CODEFLIX_API_URL by default
+        :param client: HTTP client, shared by every call so connections are kept alive and reused
+        :param max_retries: Retries of a request that failed with a connection error, a timeout or a 429/5xx
+        :param backoff: Base of the exponential backoff between retries, with full jitter
+        :param batch_endpoint: Fetch batches with the upstream batch endpoint instead of one request per video
+        :param max_concurrency: Max requests in flight when a batch is fanned out
+        """
+        self._client = client or httpx.Client(
+            base_url=base_url or CODEFLIX_API_URL,
+            timeout=httpx.Timeout(5.0, connect=1.0),
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30.0),
+            http2=CODEFLIX_API_HTTP2,
+        )
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._sleep = sleep
+        self.batch_endpoint = batch_endpoint
+        self.max_concurrency = max_concurrency
+        self._executor: ThreadPoolExecutor | None = None
+
+    @STAGE_LATENCY.labels("enrichment").time()
+    def get_video(self, id: UUID, updated_at: datetime | None = None) -> VideoResponse:
+        response = self._get(f"/api/videos/{id}")
+        # Straight from the raw bytes to the model, without building an intermediate dict
+        return VideoResponse.model_validate_json(response.content)
+
+    @STAGE_LATENCY.labels("enrichment_batch").time()
+    def get_videos(self, ids: list[UUID], versions: dict[UUID, datetime] | None = None) -> dict[UUID, VideoResponse]:
+        ids = list(dict.fromkeys(ids))
+        if self.batch_endpoint:
+            videos = [
+                video
+                for start in range(0, len(ids), BATCH_MAX_IDS)
+                for video in self._get_batch(ids[start:start + BATCH_MAX_IDS])
+            ]
+        else:
+            # The whole batch costs about one round trip instead of one per video
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.max_concurrency, thread_name_prefix="codeflix-client")
+            videos = list(self._executor.map(self.get_video, ids))
+
+        by_id = {video.id: video for video in videos}
+        if missing := [id for id in ids if id not in by_id]:
+            raise LookupError(f"Videos not returned by the Codeflix API: {missing}")
+        return by_id
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+        self._client.close()
+
+    def _get_batch(self, ids: list[UUID]) -> list[VideoResponse]:
+        response = self._get("/api/videos", params={"ids": ",".join(str(id) for id in ids)})
+        return _VIDEO_LIST.validate_json(response.content)
+
+    def _get(self, url: str, params: dict | None = None) -> httpx.Response:
+        for attempt in range(self.max_retries + 1):
+            last_attempt = attempt == self.max_retries
+            try:
+                response = self._client.get(url, params=params)
+            except httpx.TransportError as e:
+                if last_attempt:
+                    raise
+                delay = self._delay(attempt)
+                logger.warning("GET %s failed (%r), retrying in %.2fs", url, e, delay)
+            else:
+                if last_attempt or response.status_code not in RETRYABLE_STATUS_CODES:
+                    response.raise_for_status()
+                    return response
+                delay = self._delay(attempt, response.headers.get("Retry-After"))
+                logger.warning("GET %s returned %d, retrying in %.2fs", url, response.status_code, delay)
+            self._sleep(delay)
+
+    def _delay(self, attempt: int, retry_after: str | None = None) -> float:
+        if retry_after is not None and retry_after.isdigit():
+            return min(float(retry_after), self.max_backoff)
+        # Full jitter: clients that failed together do not retry together
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
\ No newline at end of file
@@ -0,0 +1,190 @@
+import logging
+import statistics
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, TimeoutError, wait
+from datetime import datetime
+from typing import Callable, TypeVar
+from uuid import UUID
+
+from src.infra.codeflix_client.codeflix_client import CodeflixClient
+from src.infra.codeflix_client.dtos import VideoResponse
+from src.infra.metrics import CIRCUIT_OPEN, HEDGED_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+class CircuitBreaker:
+    """
+    Stops calling a dependency that is failing or too slow, so callers fail fast instead of piling up.
+
+    Outcomes are kept over a sliding time window. Once at least `minimum_calls` were made, the circuit opens
+    when the failure rate or the rate of calls slower than `slow_call_duration` goes above its threshold.
+    After `open_duration` a single trial call is let through (half-open): it closes the circuit if it
+    succeeds in time, otherwise the circuit opens again.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_rate: float = 0.5,
+        slow_call_rate: float = 0.5,
+        slow_call_duration: float = 2.0,
+        minimum_calls: int = 10,
+        window: float = 30.0,
+        open_duration: float = 15.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_rate = failure_rate
+        self.slow_call_rate = slow_call_rate
+        self.slow_call_duration = slow_call_duration
+        self.minimum_calls = minimum_calls
+        self.window = window
+        self.open_duration = open_duration
+        self._clock = clock
+
+        self._calls: deque[tuple[float, bool, bool]] = deque()  # (timestamp, failed, slow)
+        self._failures = 0
+        self._slow = 0
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    def call(self, function: Callable[..., T], *args, **kwargs) -> T:
+        self._before_call()
+        started = self._clock()
+        try:
+            result = function(*args, **kwargs)
+        except Exception:
+            self._record(self._clock() - started, failed=True)
+            raise
+        self._record(self._clock() - started, failed=False)
+        return result
+
+    def _before_call(self) -> None:
+        with self._lock:
+            if self._state == self.CLOSED:
+                return
+            if self._state == self.OPEN and self._clock() - self._opened_at >= self.open_duration:
+                self._state = self.HALF_OPEN  # This caller makes the trial call
+                return
+            if self._state == self.HALF_OPEN:
+                raise CircuitOpenError("Circuit half-open, waiting for the trial call")
+            raise CircuitOpenError(f"Circuit open, retry in {self._opened_at + self.open_duration - self._clock():.0f}s")
+
+    def _record(self, latency: float, failed: bool) -> None:
+        slow = latency > self.slow_call_duration
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                if failed or slow:
+                    self._open()
+                else:
+                    self._close()
+                return
+
+            now = self._clock()
+            self._calls.append((now, failed, slow))
+            self._failures += failed
+            self._slow += slow
+            while self._calls and self._calls[0][0] < now - self.window:
+                _, old_failed, old_slow = self._calls.popleft()
+                self._failures -= old_failed
+                self._slow -= old_slow
+
+            calls = len(self._calls)
+            if self._state == self.CLOSED and calls >= self.minimum_calls and (
+                self._failures / calls > self.failure_rate or self._slow / calls > self.slow_call_rate
+            ):
+                self._open()
+
+    def _open(self) -> None:
+        logger.warning("Circuit opened for %.0fs", self.open_duration)
+        self._state = self.OPEN
+        self._opened_at = self._clock()
+        CIRCUIT_OPEN.set(1)
+
+    def _close(self) -> None:
+        logger.info("Circuit closed")
+        self._state = self.CLOSED
+        self._calls.clear()
+        self._failures = self._slow = 0
+        CIRCUIT_OPEN.set(0)
+
+
+class ResilientCodeflixClient(CodeflixClient):
+    """
+    Protects the ingestion from a slow or failing Codeflix API:
+    - a circuit breaker fails fast (CircuitOpenError) while the API is unhealthy, so the consumer sends the
+      events to the retry topics instead of waiting on every one of them
+    - a single video request that takes longer than the p95 of the recent ones is sent a second time
+      (hedged), and the first answer wins. Batches are not hedged.
+    """
+
+    def __init__(
+        self,
+        client: CodeflixClient,
+        breaker: CircuitBreaker | None = None,
+        hedge_quantile_samples: int = 200,
+        min_hedge_delay: float = 0.05,
+        max_workers: int = 32,
+    ) -> None:
+        """
+        :param hedge_quantile_samples: Latest latencies the p95 budget is computed from. Requests are not
+            hedged until a tenth of them were collected
+        :param min_hedge_delay: Lower bound of the budget, so fast APIs do not get every request twice
+        """
+        self._client = client
+        self.breaker = breaker or CircuitBreaker()
+        self._latencies: deque[float] = deque(maxlen=hedge_quantile_samples)
+        self.min_hedge_delay = min_hedge_delay
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="codeflix-hedge")
+
+    def get_video(self, id: UUID, updated_at: datetime | None = None) -> VideoResponse:
+        return self.breaker.call(self._hedged, self._client.get_video, id=id, updated_at=updated_at)
+
+    def get_videos(self, ids: list[UUID], versions: dict[UUID, datetime] | None = None) -> dict[UUID, VideoResponse]:
+        return self.breaker.call(self._client.get_videos, ids=ids, versions=versions)
+
+    @property
+    def hedge_delay(self) -> float | None:
+        """p95 of the recent latencies, None while there are too few of them."""
+        if len(self._latencies) < max(self._latencies.maxlen // 10, 2):
+            return None
+        return max(statistics.quantiles(self._latencies, n=20)[-1], self.min_hedge_delay)
+
+    def _hedged(self, function: Callable[..., T], **kwargs) -> T:
+        delay = self.hedge_delay
+        first = self._executor.submit(self._timed, function, **kwargs)
+        try:
+            return first.result(timeout=delay)
+        except TimeoutError:
+            pass
+
+        HEDGED_REQUESTS.inc()
+        second = self._executor.submit(self._timed, function, **kwargs)
+        pending = {first, second}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+        return second.result()  # Both failed
+
+    def _timed(self, function: Callable[..., T], **kwargs) -> T:
+        started = time.monotonic()
+        result = function(**kwargs)
+        self._latencies.append(time.monotonic() - started)
+        return result
\ No newline at end of file
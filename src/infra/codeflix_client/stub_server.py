@@ -0,0 +1,177 @@
+"""
+Local stand-in for the Codeflix admin catalog API, for tests and benchmarks of the enrichment client.
+It serves every video id with the same details, one at a time (/api/videos/<id>) or in batches
+(/api/videos?ids=<id>,<id>), optionally after a latency or failing the first requests.
+
+>>> from uuid import uuid4
+>>> from src.infra.codeflix_client.http_client import HttpClient
+>>> with StubCodeflixServer() as server:
+...     HttpClient(base_url=server.url).get_video(id=uuid4()).title
+'The Godfather'
+
+    python src/infra/codeflix_client/stub_server.py 8001
+"""
+import json
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+from uuid import UUID
+
+VIDEO_PATH = re.compile(r"^/api/videos/(?P<id>[0-9a-fA-F-]{36})/?$")
+VIDEOS_PATH = "/api/videos"
+BATCH_MAX_IDS = 100
+
+
+def video_payload(id: UUID | str) -> dict:
+    return {
+        "id": str(id),
+        "title": "The Godfather",
+        "launch_year": 1972,
+        "rating": "AGE_18",
+        "is_active": True,
+        "categories": [
+            {
+                "id": "142f2b4b-1b7b-4f3b-8eab-3f2f2b4b1b7b",
+                "name": "Action",
+                "description": "Action movies",
+            }
+        ],
+        "cast_members": [
+            {
+                "id": "242f2b4b-1b7b-4f3b-8eab-3f2f2b4b1b7b",
+                "name": "Marlon Brando",
+                "type": "ACTOR",
+            },
+            {
+                "id": "342f2b4b-1b7b-4f3b-8eab-3f2f2b4b1b7b",
+                "name": "Al Pacino",
+                "type": "DIRECTOR",
+            },
+        ],
+        "genres": [
+            {
+                "id": "442f2b4b-1b7b-4f3b-8eab-3f2f2b4b1b7b",
+                "name": "Drama",
+            }
+        ],
+        "banner": {
+            "name": "The Godfather",
+            "raw_location": "https://banner.com/the-godfather",
+        },
+    }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive
+    server: "_Server"
+
+    def do_GET(self) -> None:
+        self.server.record_request()
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        url = urlsplit(self.path)
+        if self.server.should_fail():
+            self._send(503, {"detail": "Service unavailable"})
+        elif match := VIDEO_PATH.match(url.path):
+            self._send(200, video_payload(match["id"]))
+        elif url.path == VIDEOS_PATH:
+            ids = [id for value in parse_qs(url.query).get("ids", []) for id in value.split(",") if id]
+            if len(ids) > BATCH_MAX_IDS:
+                self._send(400, {"detail": f"At most {BATCH_MAX_IDS} ids per request"})
+            else:
+                self._send(200, [video_payload(id) for id in ids])
+        else:
+            self._send(404, {"detail": "Not found"})
+
+    def _send(self, status: int, body: dict | list) -> None:
+        content = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], latency: float, failures: int) -> None:
+        super().__init__(address, _Handler)
+        self.latency = latency
+        self._failures = failures
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.connections = 0
+
+    def process_request(self, request, client_address) -> None:
+        with self._lock:
+            self.connections += 1
+        super().process_request(request, client_address)
+
+    def record_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def should_fail(self) -> bool:
+        with self._lock:
+            if self._failures <= 0:
+                return False
+            self._failures -= 1
+            return True
+
+
+class StubCodeflixServer:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0, failures: int = 0) -> None:
+        """
+        :param port: 0 picks a free port
+        :param latency: Seconds to wait before answering each request
+        :param failures: How many of the first requests fail with a 503
+        """
+        self._server = _Server((host, port), latency, failures)
+        # Short poll interval: stop() waits for the serving loop to notice the shutdown
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def requests(self) -> int:
+        return self._server.requests
+
+    @property
+    def connections(self) -> int:
+        """TCP connections accepted so far: stays low when clients reuse them."""
+        return self._server.connections
+
+    def start(self) -> "StubCodeflixServer":
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        self._server.serve_forever()
+
+    def stop(self) -> None:
+        if self._thread.is_alive():
+            self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StubCodeflixServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+if __name__ == "__main__":
+    server = StubCodeflixServer(host="0.0.0.0", port=int(sys.argv[1]) if len(sys.argv) > 1 else 8001)
+    print(f"Serving the Codeflix stub on {server.url}")
+    server.serve_forever()
\ No newline at end of file
@@ -1,4 +1,31 @@
 import os
+import time
+
+from elasticsearch import Elasticsearch
+
+from src.application.timing import record, timed
+from src.infra.elasticsearch.query_log import QueryShape, query_log
 
 ELASTICSEARCH_HOST = os.getenv("ELASTICSEARCH_HOST", "http://localhost:9200")
-ELASTICSEARCH_HOST_TEST = os.getenv("ELASTICSEARCH_TEST_HOST", "http://localhost:9201")
\ No newline at end of file
+ELASTICSEARCH_HOST_TEST = os.getenv("ELASTICSEARCH_TEST_HOST", "http://localhost:9201")
+
+
+def timed_search(client: Elasticsearch, index: str, body: dict, shape: QueryShape | None = None):
+    """
+    Search timed as the `es` stage, with the time Elasticsearch itself reports (`took`) as `es_took`.
+    Searches given their `shape` go to the slow-query log.
+    """
+    started = time.perf_counter()
+    with timed("es"):
+        response = client.search(index=index, body=body)
+    took = response["took"] if "took" in response else None
+    if took is not None:
+        record("es_took", took / 1000)
+    if shape is not None:
+        query_log.observe(shape, time.perf_counter() - started, client, index, body, took)
+    return response
+
+
+def timed_mget(client: Elasticsearch, index: str, ids: list[str]):
+    with timed("es"):
+        return client.mget(index=index, ids=ids)
\ No newline at end of file
@@ -1,15 +1,20 @@
 import logging
 import os
+from uuid import UUID
 
 from elasticsearch import Elasticsearch
 from pydantic import ValidationError
 
 from src.application.list_category import CategorySortableFields
+from src.application.fieldsets import sparse_model
 from src.application.listing import DEFAULT_PAGINATION_SIZE, SortDirection
+from src.application.read_models import CategoryReadModel
+from src.application.timing import timed
 from src.domain.category import Category
 from src.domain.category_repository import (
     CategoryRepository,
 )
+from src.infra.elasticsearch import QueryShape, timed_mget, timed_search
 
 ELASTICSEARCH_HOST = os.getenv("ELASTICSEARCH_HOST", "http://localhost:9200")
 ELASTICSEARCH_HOST_TEST = os.getenv("ELASTICSEARCH_TEST_HOST", "http://localhost:9201")
@@ -33,11 +38,18 @@ class ElasticsearchCategoryRepository(CategoryRepository):
         search: str | None = None,
         sort: CategorySortableFields | None = None,
         direction: SortDirection = SortDirection.ASC,
-    ) -> list[Category]:
+        search_after: list | None = None,
+        fields: frozenset[str] | None = None,
+        read_models: bool = False,
+    ) -> list[Category] | list[CategoryReadModel]:
         query = {
-            "from": (page - 1) * per_page,
             "size": per_page,
-            "sort": [{f"{sort}.keyword": {"order": direction}}] if sort else [],
+            # The id breaks ties, so every entity has a distinct position for `search_after`
+            "sort": (
+                [{f"{sort}.keyword": {"order": direction}}, {"id.keyword": {"order": direction}}]
+                if sort
+                else []
+            ),
             "query": {
                 "bool": {
                     "must": (
@@ -48,19 +60,44 @@ class ElasticsearchCategoryRepository(CategoryRepository):
                 }
             },
         }
+        if search_after:
+            query["search_after"] = search_after
+        else:
+            query["from"] = (page - 1) * per_page
+        if fields:
+            query["_source"] = sorted(fields)
 
-        hits = self._client.search(
-            index=self.INDEX,
-            body=query,
-        )["hits"]["hits"]
+        shape = QueryShape.of("categories", sort, direction, search, page, cursor=bool(search_after))
+        hits = timed_search(self._client, index=self.INDEX, body=query, shape=shape)["hits"]["hits"]
 
-        parsed_entities = []
-        for hit in hits:
-            try:
-                parsed_entity = Category(**hit["_source"])
-            except ValidationError:
-                self._logger.error(f"Malformed category: {hit}")
-            else:
-                parsed_entities.append(parsed_entity)
+        with timed("validate"):
+            model = sparse_model(Category, fields) if fields else Category
+            as_read_models = read_models and not fields
+            parsed_entities = []
+            for hit in hits:
+                try:
+                    source = hit["_source"]
+                    parsed_entity = CategoryReadModel.from_source(source) if as_read_models else model(**source)
+                except (KeyError, ValidationError):
+                    self._logger.error(f"Malformed category: {hit}")
+                else:
+                    parsed_entities.append(parsed_entity)
 
-        return parsed_entities
\ No newline at end of file
+        return parsed_entities
+
+    def get_by_ids(self, ids: list[UUID]) -> list[Category]:
+        if not ids:
+            return []
+        # One round trip for every id, straight from the document ids (no search)
+        docs = timed_mget(self._client, index=self.INDEX, ids=[str(id) for id in dict.fromkeys(ids)])["docs"]
+
+        with timed("validate"):
+            by_id = {}
+            for doc in docs:
+                if not doc.get("found"):
+                    continue
+                try:
+                    by_id[doc["_id"]] = Category(**doc["_source"])
+                except ValidationError:
+                    self._logger.error(f"Malformed category: {doc}")
+        return [by_id[str(id)] for id in ids if str(id) in by_id]
\ No newline at end of file
@@ -1,16 +1,21 @@
 import logging
 import os
+from uuid import UUID
 
 from elasticsearch import Elasticsearch
 from pydantic import ValidationError
 from collections import defaultdict
 
 from src.application.list_genre import GenreSortableFields
+from src.application.fieldsets import sparse_model
 from src.application.listing import DEFAULT_PAGINATION_SIZE, SortDirection
+from src.application.read_models import GenreReadModel
+from src.application.timing import timed
 from src.domain.genre import Genre
 from src.domain.genre_repository import (
     GenreRepository,
 )
+from src.infra.elasticsearch import QueryShape, timed_mget, timed_search
 
 ELASTICSEARCH_HOST = os.getenv("ELASTICSEARCH_HOST", "http://localhost:9200")
 ELASTICSEARCH_HOST_TEST = os.getenv("ELASTICSEARCH_TEST_HOST", "http://localhost:9201")
@@ -35,11 +40,18 @@ class ElasticsearchGenreRepository(GenreRepository):
         search: str | None = None,
         sort: GenreSortableFields | None = None,
         direction: SortDirection = SortDirection.ASC,
-    ) -> list[Genre]:
+        search_after: list | None = None,
+        fields: frozenset[str] | None = None,
+        read_models: bool = False,
+    ) -> list[Genre] | list[GenreReadModel]:
         query = {
-            "from": (page - 1) * per_page,
             "size": per_page,
-            "sort": [{f"{sort}.keyword": {"order": direction}}] if sort else [],
+            # The id breaks ties, so every entity has a distinct position for `search_after`
+            "sort": (
+                [{f"{sort}.keyword": {"order": direction}}, {"id.keyword": {"order": direction}}]
+                if sort
+                else []
+            ),
             "query": {
                 "bool": {
                     "must": (
@@ -50,32 +62,61 @@ class ElasticsearchGenreRepository(GenreRepository):
                 }
             },
         }
+        if search_after:
+            query["search_after"] = search_after
+        else:
+            query["from"] = (page - 1) * per_page
+        if fields:
+            # Categories are not in the genre documents, they are joined from their own index
+            query["_source"] = sorted(fields - {"categories"})
 
-        hits = self._client.search(
-            index=self.INDEX,
-            body=query,
-        )["hits"]["hits"]
+        shape = QueryShape.of("genres", sort, direction, search, page, cursor=bool(search_after))
+        hits = timed_search(self._client, index=self.INDEX, body=query, shape=shape)["hits"]["hits"]
 
-        parsed_entities = []
+        with_categories = not fields or "categories" in fields
         genre_ids = [hit["_source"]["id"] for hit in hits]
-        categories_for_genres = self.fetch_categories_for_genres(genre_ids)
-        for hit in hits:
-            try:
-                parsed_entity = Genre(
-                    **{
-                        **hit["_source"],
-                        "categories": set(categories_for_genres.get(hit["_source"]["id"], [])),
-                    }
-                )
-            except ValidationError:
-                self._logger.error(f"Malformed genre: {hit}")
-            else:
-                parsed_entities.append(parsed_entity)
+        categories_for_genres = self.fetch_categories_for_genres(genre_ids) if with_categories else {}
+
+        with timed("validate"):
+            model = sparse_model(Genre, fields) if fields else Genre
+            as_read_models = read_models and not fields
+            parsed_entities = []
+            for hit in hits:
+                try:
+                    source = hit["_source"]
+                    if with_categories:
+                        source = {**source, "categories": categories_for_genres.get(source["id"], [])}
+                    parsed_entity = GenreReadModel.from_source(source) if as_read_models else model(**source)
+                except (KeyError, ValidationError):
+                    self._logger.error(f"Malformed genre: {hit}")
+                else:
+                    parsed_entities.append(parsed_entity)
 
         return parsed_entities
+
+    def get_by_ids(self, ids: list[UUID]) -> list[Genre]:
+        if not ids:
+            return []
+        # One round trip for every id, straight from the document ids (no search)
+        docs = timed_mget(self._client, index=self.INDEX, ids=[str(id) for id in dict.fromkeys(ids)])["docs"]
+        found = [doc for doc in docs if doc.get("found")]
+        categories_for_genres = self.fetch_categories_for_genres([doc["_id"] for doc in found])
+
+        with timed("validate"):
+            by_id = {}
+            for doc in found:
+                try:
+                    by_id[doc["_id"]] = Genre(
+                        **{**doc["_source"], "categories": set(categories_for_genres.get(doc["_id"], []))}
+                    )
+                except ValidationError:
+                    self._logger.error(f"Malformed genre: {doc}")
+        return [by_id[str(id)] for id in ids if str(id) in by_id]
     
     def fetch_categories_for_genres(self, genre_ids: list[str]) -> dict[str, list[str]]:
         query = {
+            # Every link of the genres, not the first 10 hits
+            "size": 10_000,
             "query": {
                 "terms": {
                     "genre_id.keyword": genre_ids,
@@ -83,7 +124,7 @@ class ElasticsearchGenreRepository(GenreRepository):
             },
         }
 
-        hits = self._client.search(index=self._GENRE_CATEGORIES_INDEX, body=query)["hits"]["hits"]
+        hits = timed_search(self._client, index=self._GENRE_CATEGORIES_INDEX, body=query)["hits"]["hits"]
         categories_by_genre = defaultdict(list)
         for hit in hits:
             categories_by_genre[hit["_source"]["genre_id"]].append(hit["_source"]["category_id"])
@@ -1,25 +1,63 @@
 import logging
+import os
+from uuid import UUID
 
-from elasticsearch import Elasticsearch, NotFoundError
+from elasticsearch import ConflictError, Elasticsearch, NotFoundError, helpers
+from elasticsearch.helpers import BulkIndexError
 from pydantic import ValidationError
 
 from src.application.list_video import VideoSortableFields
+from src.application.fieldsets import sparse_model
 from src.application.listing import DEFAULT_PAGINATION_SIZE, SortDirection
+from src.application.read_models import VideoReadModel
+from src.application.timing import timed
+from src.domain.repository import StaleEntityError
 from src.domain.video import Video
 from src.domain.video_repository import VideoRepository
-from src.infra.elasticsearch import ELASTICSEARCH_HOST
+from src.infra.elasticsearch import ELASTICSEARCH_HOST, QueryShape, timed_mget, timed_search
+from src.infra.metrics import BATCH_SIZE, STAGE_LATENCY
+
+# Settings of the videos index outside bulk loads. Unset resets the Elasticsearch default (1s refresh, 1 replica)
+VIDEO_INDEX_REFRESH_INTERVAL = os.getenv("VIDEO_INDEX_REFRESH_INTERVAL")
+VIDEO_INDEX_REPLICAS = os.getenv("VIDEO_INDEX_REPLICAS")
 
 
 class ElasticsearchVideoRepository(VideoRepository):
     INDEX = "catalog-db.codeflix.videos"
+    # Elasticsearch recommends bulk requests of a few MB: big enough to amortize the
+    # request overhead, small enough to not put the cluster under memory pressure.
+    BULK_CHUNK_SIZE = 5_000
+    BULK_MAX_CHUNK_BYTES = 10 * 1024 * 1024
+    # Chunks rejected with 429 (cluster overloaded) are retried with exponential backoff
+    BULK_MAX_RETRIES = 3
+    # Documents are versioned by `updated_at` so Elasticsearch itself rejects out-of-order writes
+    # (replays, rebalances, parallel lanes). "external_gte" keeps replays of the same event idempotent.
+    VERSION_TYPE = "external_gte"
+    # While backfilling, skip periodic refreshes and replica writes. They are restored to the configured
+    # values afterwards, never to values read from the index: a restarted process or another worker may
+    # be in the middle of its own bulk load, and would hand back the bulk-load settings themselves.
+    _BULK_LOAD_SETTINGS = {
+        "index.refresh_interval": "-1",
+        "index.number_of_replicas": 0,
+    }
 
     def __init__(
         self,
         client: Elasticsearch | None = None,
         logger: logging.Logger | None = None,
+        refresh_interval: str | None = VIDEO_INDEX_REFRESH_INTERVAL,
+        replicas: str | None = VIDEO_INDEX_REPLICAS,
     ) -> None:
+        """
+        :param refresh_interval: Refresh interval restored after a bulk load, None for the Elasticsearch default
+        :param replicas: Number of replicas restored after a bulk load, None for the Elasticsearch default
+        """
         self._client = client or Elasticsearch(hosts=[ELASTICSEARCH_HOST])
         self._logger = logger or logging.getLogger(__name__)
+        self._regular_settings = {
+            "index.refresh_interval": refresh_interval,
+            "index.number_of_replicas": replicas,
+        }
 
     def search(
         self,
@@ -28,11 +66,18 @@ class ElasticsearchVideoRepository(VideoRepository):
         search: str | None = None,
         sort: VideoSortableFields | None = None,
         direction: SortDirection = SortDirection.ASC,
-    ) -> list[Video]:
+        search_after: list | None = None,
+        fields: frozenset[str] | None = None,
+        read_models: bool = False,
+    ) -> list[Video] | list[VideoReadModel]:
         query = {
-            "from": (page - 1) * per_page,
             "size": per_page,
-            "sort": [{f"{sort}.keyword": {"order": direction}}] if sort else [],
+            # The id breaks ties, so every entity has a distinct position for `search_after`
+            "sort": (
+                [{f"{sort}.keyword": {"order": direction}}, {"id.keyword": {"order": direction}}]
+                if sort
+                else []
+            ),
             "query": {
                 "bool": {
                     "must": (
@@ -43,30 +88,124 @@ class ElasticsearchVideoRepository(VideoRepository):
                 }
             },
         }
+        if search_after:
+            query["search_after"] = search_after
+        else:
+            query["from"] = (page - 1) * per_page
+        if fields:
+            query["_source"] = sorted(fields)
 
+        shape = QueryShape.of("videos", sort, direction, search, page, cursor=bool(search_after))
         try:
-            hits = self._client.search(
-                index=self.INDEX,
-                body=query,
-            )["hits"]["hits"]
+            hits = timed_search(self._client, index=self.INDEX, body=query, shape=shape)["hits"]["hits"]
         except NotFoundError:
             self._logger.error(f"Index {self.INDEX} not found")
             return []
 
-        parsed_entities = []
-        for hit in hits:
-            try:
-                parsed_entity = Video(**hit["_source"])
-            except ValidationError:
-                self._logger.error(f"Malformed entity: {hit}")
-            else:
-                parsed_entities.append(parsed_entity)
+        with timed("validate"):
+            model = sparse_model(Video, fields) if fields else Video
+            as_read_models = read_models and not fields
+            parsed_entities = []
+            for hit in hits:
+                try:
+                    source = hit["_source"]
+                    parsed_entity = VideoReadModel.from_source(source) if as_read_models else model(**source)
+                except (KeyError, ValidationError):
+                    self._logger.error(f"Malformed entity: {hit}")
+                else:
+                    parsed_entities.append(parsed_entity)
 
         return parsed_entities
 
+    def get_by_ids(self, ids: list[UUID]) -> list[Video]:
+        if not ids:
+            return []
+        # One round trip for every id, straight from the document ids (no search)
+        try:
+            docs = timed_mget(self._client, index=self.INDEX, ids=[str(id) for id in dict.fromkeys(ids)])["docs"]
+        except NotFoundError:
+            self._logger.error(f"Index {self.INDEX} not found")
+            return []
+
+        with timed("validate"):
+            by_id = {}
+            for doc in docs:
+                if not doc.get("found"):
+                    continue
+                try:
+                    by_id[doc["_id"]] = Video(**doc["_source"])
+                except ValidationError:
+                    self._logger.error(f"Malformed entity: {doc}")
+        return [by_id[str(id)] for id in ids if str(id) in by_id]
+
     def save(self, video: Video) -> None:
-        self._client.index(
-            index=self.INDEX,
-            id=str(video.id),
-            body=video.model_dump(mode="json"),
-        )
\ No newline at end of file
+        try:
+            with STAGE_LATENCY.labels("es_write").time():
+                self._client.index(
+                    index=self.INDEX,
+                    id=str(video.id),
+                    body=video.model_dump(mode="json"),
+                    version=self._version(video),
+                    version_type=self.VERSION_TYPE,
+                )
+        except ConflictError:
+            raise StaleEntityError(f"A newer version of video {video.id} is already indexed")
+
+    def save_many(self, videos: list[Video]) -> int:
+        if not videos:
+            return 0
+
+        BATCH_SIZE.observe(len(videos))
+        with STAGE_LATENCY.labels("es_write").time():
+            return self._bulk_index(videos)
+
+    def _bulk_index(self, videos: list[Video]) -> int:
+        skipped = 0
+        errors = []
+        for ok, item in helpers.streaming_bulk(
+            self._client,
+            (
+                {
+                    "_index": self.INDEX,
+                    "_id": str(video.id),
+                    "_source": video.model_dump(mode="json"),
+                    "version": self._version(video),
+                    "version_type": self.VERSION_TYPE,
+                }
+                for video in videos
+            ),
+            chunk_size=self.BULK_CHUNK_SIZE,
+            max_chunk_bytes=self.BULK_MAX_CHUNK_BYTES,
+            max_retries=self.BULK_MAX_RETRIES,
+            raise_on_error=False,
+        ):
+            if ok:
+                continue
+            if item["index"]["status"] == 409:
+                skipped += 1
+            else:
+                errors.append(item)
+
+        if errors:
+            raise BulkIndexError(f"{len(errors)} document(s) failed to index.", errors)
+
+        return skipped
+
+    @staticmethod
+    def _version(video: Video) -> int:
+        # Debezium source positions are not used: every snapshot row shares the same one
+        return int(video.updated_at.timestamp() * 1_000_000)
+
+    def begin_bulk_load(self) -> None:
+        if self._client.indices.exists(index=self.INDEX):
+            self._client.indices.put_settings(index=self.INDEX, settings=self._BULK_LOAD_SETTINGS)
+        else:
+            self._client.indices.create(index=self.INDEX, settings=self._BULK_LOAD_SETTINGS)
+
+        self._logger.info(f"Bulk load started on index {self.INDEX}")
+
+    def end_bulk_load(self) -> None:
+        self._client.indices.put_settings(index=self.INDEX, settings=self._regular_settings)
+        self._client.indices.refresh(index=self.INDEX)
+
+        self._logger.info(f"Bulk load finished on index {self.INDEX}")
\ No newline at end of file
@@ -0,0 +1,163 @@
+"""
+Read-through cache of the entities fetched by id, in front of the repositories.
+
+Entries are dropped when a CDC event says the entity changed (see `kafka.cache_invalidator`), and expire
+after a TTL anyway, in case an event is missed.
+
+The event is read before its change reaches Elasticsearch, so a lookup right after it may load the previous
+version again. Invalidations carry the `updated_at` of the change: loaded entities older than it are neither
+cached nor served. Changes without a version (relation rows, deletes) keep the entity out of the cache for
+ENTITY_CACHE_INVALIDATION_HOLD seconds instead, the time for them to be indexed.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable
+from uuid import UUID
+
+from src.application.listing import DEFAULT_PAGINATION_SIZE, SortDirection
+from src.application.read_models import ReadModel
+from src.domain.entity import Entity
+from src.domain.repository import Repository
+from src.infra.metrics import ENTITY_CACHE_REQUESTS
+
+ENTITY_CACHE_SIZE = int(os.getenv("ENTITY_CACHE_SIZE", "10000"))
+ENTITY_CACHE_TTL = float(os.getenv("ENTITY_CACHE_TTL", "300"))
+ENTITY_CACHE_INVALIDATION_HOLD = float(os.getenv("ENTITY_CACHE_INVALIDATION_HOLD", "5"))
+
+
+@dataclass(slots=True)
+class Invalidation:
+    # Invalidations counted so far: loads that started before this one are not stored
+    sequence: int
+    # Version of the change: loaded entities older than it are stale
+    updated_at: datetime | None
+    # Loaded entities are not stored before then (changes without a version)
+    hold_until: float
+
+
+def as_utc(value: datetime) -> datetime:
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+
+class EntityCache[T: Entity]:
+    def __init__(
+        self,
+        name: str,
+        max_entries: int = ENTITY_CACHE_SIZE,
+        ttl: float = ENTITY_CACHE_TTL,
+        hold: float = ENTITY_CACHE_INVALIDATION_HOLD,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hold = hold
+        self._clock = clock
+        self._entries: OrderedDict[UUID, tuple[float, T]] = OrderedDict()
+        # Last invalidation of each id
+        self._invalidated: OrderedDict[UUID, Invalidation] = OrderedDict()
+        self._invalidations = 0
+        self._lock = threading.Lock()
+
+    def get_many(self, ids: list[UUID], load: Callable[[list[UUID]], list[T]]) -> list[T]:
+        """Entities with these ids, in the same order: the cached ones, then the others in a single `load`."""
+        now = self._clock()
+        found: dict[UUID, T] = {}
+        with self._lock:
+            for id in dict.fromkeys(ids):
+                entry = self._entries.get(id)
+                if entry is not None and entry[0] > now:
+                    self._entries.move_to_end(id)
+                    found[id] = entry[1]
+            loaded_after = self._invalidations
+        missing = [id for id in dict.fromkeys(ids) if id not in found]
+        ENTITY_CACHE_REQUESTS.labels(self.name, "hit").inc(len(found))
+
+        if missing:
+            ENTITY_CACHE_REQUESTS.labels(self.name, "miss").inc(len(missing))
+            fresh = self._store(load(missing), loaded_after, now)
+            found.update((entity.id, entity) for entity in fresh)
+
+        return [found[id] for id in ids if id in found]
+
+    def invalidate(self, id: UUID, updated_at: datetime | None = None) -> None:
+        """
+        :param updated_at: Version of the change, None when unknown: the entity is then not cached again
+            for `hold` seconds
+        """
+        now = self._clock()
+        with self._lock:
+            self._entries.pop(id, None)
+            self._invalidations += 1
+            previous = self._invalidated.pop(id, None)
+            version = previous.updated_at if previous is not None else None
+            if updated_at is not None:
+                version = max(version, as_utc(updated_at)) if version is not None else as_utc(updated_at)
+            hold_until = previous.hold_until if previous is not None else 0.0
+            if updated_at is None:
+                hold_until = now + self.hold
+            self._invalidated[id] = Invalidation(self._invalidations, version, hold_until)
+            if len(self._invalidated) > self.max_entries:
+                self._invalidated.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _store(self, entities: list[T], loaded_after: int, now: float) -> list[T]:
+        """Caches the entities that are known to be current, and returns those that are not stale."""
+        fresh = []
+        with self._lock:
+            for entity in entities:
+                invalidation = self._invalidated.get(entity.id)
+                if invalidation is not None:
+                    if invalidation.updated_at is not None and as_utc(entity.updated_at) < invalidation.updated_at:
+                        # Elasticsearch has not indexed the change yet
+                        ENTITY_CACHE_REQUESTS.labels(self.name, "stale").inc()
+                        continue
+                    if invalidation.sequence > loaded_after or now < invalidation.hold_until:
+                        # Changed while it was being loaded, or by a change without a version: maybe stale
+                        fresh.append(entity)
+                        continue
+                fresh.append(entity)
+                self._entries[entity.id] = (now + self.ttl, entity)
+                self._entries.move_to_end(entity.id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return fresh
+
+
+class CachedRepository[T: Entity](Repository[T]):
+    """Serves `get_by_ids` through the cache of its entity. Searches go straight to the repository."""
+
+    def __init__(self, repository: Repository[T], cache: EntityCache[T]) -> None:
+        self._repository = repository
+        self.cache = cache
+
+    def search(
+        self,
+        page: int = 1,
+        per_page: int = DEFAULT_PAGINATION_SIZE,
+        search: str | None = None,
+        sort: str | None = None,
+        direction: SortDirection = SortDirection.ASC,
+        search_after: list | None = None,
+        fields: frozenset[str] | None = None,
+        read_models: bool = False,
+    ) -> list[T] | list[ReadModel]:
+        return self._repository.search(
+            page=page,
+            per_page=per_page,
+            search=search,
+            sort=sort,
+            direction=direction,
+            search_after=search_after,
+            fields=fields,
+            read_models=read_models,
+        )
+
+    def get_by_ids(self, ids: list[UUID]) -> list[T]:
+        return self.cache.get_many(ids, self._repository.get_by_ids)
\ No newline at end of file
@@ -0,0 +1,217 @@
+"""
+Slow-query log of the listing searches.
+
+Every search is reduced to its shape (`QueryShape`: entity, sort, free-text search, page depth), which
+stays the same whatever the search terms and page numbers are, and its latency is recorded per shape:
+in the `api_es_query_seconds` histograms, and in the totals of this process (`QueryLog.top`), served by
+the API at /query_stats/.
+
+A search slower than SLOW_QUERY_THRESHOLD seconds is logged with its query. A sample of them
+(SLOW_QUERY_PROFILE_RATE, at most once per SLOW_QUERY_PROFILE_INTERVAL seconds and shape) is run again
+in the background with the Elasticsearch profile API, and the profile is logged as well.
+
+Across the workers of the API: topk(10, sum by (entity, sort, search, page) (rate(api_es_query_seconds_sum[5m])))
+"""
+import json
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable
+
+from elasticsearch import Elasticsearch
+
+from src.infra.metrics import ES_QUERY_LATENCY, SLOW_QUERIES
+from src.infra.structured_logging import truncate
+
+SLOW_QUERY_THRESHOLD = float(os.getenv("SLOW_QUERY_THRESHOLD", "0.5"))
+SLOW_QUERY_PROFILE_RATE = float(os.getenv("SLOW_QUERY_PROFILE_RATE", "0.1"))
+SLOW_QUERY_PROFILE_INTERVAL = float(os.getenv("SLOW_QUERY_PROFILE_INTERVAL", "60"))
+# Profiles are large: a tree of timings per shard and per query clause
+SLOW_QUERY_PROFILE_MAX_LENGTH = int(os.getenv("SLOW_QUERY_PROFILE_MAX_LENGTH", "8192"))
+
+# Free-text searches of more words than this are told apart: every word is one more clause to match
+LONG_SEARCH_WORDS = 3
+
+logger = logging.getLogger(__name__)
+
+
+def page_bucket(page: int, cursor: bool = False) -> str:
+    """Depth of the page: the cost of `from` grows with it, the cost of `search_after` does not."""
+    if cursor:
+        return "cursor"
+    if page <= 1:
+        return "1"
+    if page <= 10:
+        return "2-10"
+    if page <= 100:
+        return "11-100"
+    return "101+"
+
+
+def search_bucket(search: str | None) -> str:
+    if not search:
+        return "none"
+    return "long" if len(search.split()) > LONG_SEARCH_WORDS else "short"
+
+
+@dataclass(frozen=True, slots=True)
+class QueryShape:
+    entity: str
+    sort: str
+    search: str
+    page: str
+
+    @classmethod
+    def of(
+        cls,
+        entity: str,
+        sort: str | None,
+        direction: str,
+        search: str | None,
+        page: int,
+        cursor: bool = False,
+    ) -> "QueryShape":
+        return cls(
+            entity=entity,
+            sort=f"{sort}:{direction}" if sort else "none",
+            search=search_bucket(search),
+            page=page_bucket(page, cursor),
+        )
+
+    def __str__(self) -> str:
+        return f"{self.entity} sort={self.sort} search={self.search} page={self.page}"
+
+
+@dataclass(slots=True)
+class ShapeStats:
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    slow: int = 0
+
+
+class QueryLog:
+    def __init__(
+        self,
+        threshold: float = SLOW_QUERY_THRESHOLD,
+        profile_rate: float = SLOW_QUERY_PROFILE_RATE,
+        profile_interval: float = SLOW_QUERY_PROFILE_INTERVAL,
+        profile_max_length: int = SLOW_QUERY_PROFILE_MAX_LENGTH,
+        executor: ThreadPoolExecutor | None = None,
+        rng: Callable[[], float] = random.random,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        :param threshold: Latency (seconds) over which a search is logged
+        :param profile_rate: Fraction of the slow searches run again with the profile API
+        :param profile_interval: Min seconds between two profiles of the same shape
+        :param executor: Runs the profiled searches, off the request
+        """
+        self.threshold = threshold
+        self.profile_rate = profile_rate
+        self.profile_interval = profile_interval
+        self.profile_max_length = profile_max_length
+        self._executor = executor
+        self._random = rng
+        self._clock = clock
+        self._stats: dict[QueryShape, ShapeStats] = {}
+        self._last_profiled: dict[QueryShape, float] = {}
+        self._lock = threading.Lock()
+
+    def observe(
+        self,
+        shape: QueryShape,
+        seconds: float,
+        client: Elasticsearch,
+        index: str,
+        body: dict,
+        took: int | None = None,
+    ) -> None:
+        slow = seconds > self.threshold
+        with self._lock:
+            stats = self._stats.setdefault(shape, ShapeStats())
+            stats.count += 1
+            stats.total += seconds
+            stats.max = max(stats.max, seconds)
+            stats.slow += slow
+        ES_QUERY_LATENCY.labels(shape.entity, shape.sort, shape.search, shape.page).observe(seconds)
+        if not slow:
+            return
+
+        SLOW_QUERIES.labels(shape.entity, shape.sort, shape.search, shape.page).inc()
+        # In the message too: the text log format and unconfigured loggers leave out the `extra` fields
+        query = truncate(json.dumps(body))
+        logger.warning(
+            "Slow query %s: %.0fms (took %sms): %s",
+            shape,
+            seconds * 1000,
+            took,
+            query,
+            extra={
+                "shape": str(shape),
+                "duration_ms": round(seconds * 1000),
+                "took_ms": took,
+                "query": query,
+            },
+        )
+        if self._should_profile(shape):
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(1, thread_name_prefix="slow-query-profile")
+            self._executor.submit(self._profile, shape, client, index, body)
+
+    def top(self, n: int = 10) -> list[dict]:
+        """The `n` shapes that cost the most search time in total, with their latencies in ms."""
+        with self._lock:
+            ranked = sorted(self._stats.items(), key=lambda item: item[1].total, reverse=True)[:n]
+            return [
+                {
+                    "entity": shape.entity,
+                    "sort": shape.sort,
+                    "search": shape.search,
+                    "page": shape.page,
+                    "count": stats.count,
+                    "slow": stats.slow,
+                    "total_ms": round(stats.total * 1000, 2),
+                    "mean_ms": round(stats.total / stats.count * 1000, 2),
+                    "max_ms": round(stats.max * 1000, 2),
+                }
+                for shape, stats in ranked
+            ]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    def _should_profile(self, shape: QueryShape) -> bool:
+        if self._random() >= self.profile_rate:
+            return False
+        now = self._clock()
+        with self._lock:
+            last = self._last_profiled.get(shape)
+            if last is not None and now - last < self.profile_interval:
+                return False
+            self._last_profiled[shape] = now
+        return True
+
+    def _profile(self, shape: QueryShape, client: Elasticsearch, index: str, body: dict) -> None:
+        try:
+            response = client.search(index=index, body={**body, "profile": True})
+        except Exception:
+            logger.exception("Could not profile the slow query %s", shape)
+            return
+        took = response["took"] if "took" in response else None
+        profile = truncate(json.dumps(response["profile"]), self.profile_max_length)
+        logger.warning(
+            "Profile of the slow query %s (took %sms): %s",
+            shape,
+            took,
+            profile,
+            extra={"shape": str(shape), "took_ms": took, "profile": profile},
+        )
+
+
+query_log = QueryLog()
\ No newline at end of file
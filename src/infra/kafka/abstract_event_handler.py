@@ -7,6 +7,14 @@ from src.infra.kafka.operation import Operation
 logger = logging.getLogger(__name__)
 
 
+class BufferedEventsError(Exception):
+    """Buffered events that could not be persisted, each with its error. The other events were persisted."""
+
+    def __init__(self, failures: list[tuple[ParsedEvent, Exception]]) -> None:
+        super().__init__(f"{len(failures)} buffered event(s) failed: {failures[0][1]!r}")
+        self.failures = failures
+
+
 class AbstractEventHandler(ABC):
     @abstractmethod
     def handle_created(self, event: ParsedEvent) -> None:
@@ -20,6 +28,36 @@ class AbstractEventHandler(ABC):
     def handle_deleted(self, event: ParsedEvent) -> None:
         pass
 
+    def handle_snapshot(self, event: ParsedEvent) -> None:
+        """
+        Debezium emits every existing row as a "r" (read) event during the initial snapshot.
+        By default, a snapshot row is handled exactly like a newly created one.
+        """
+        self.handle_created(event)
+
+    @property
+    def pending_count(self) -> int:
+        """How many buffered events were not persisted yet."""
+        return 0
+
+    @property
+    def has_pending(self) -> bool:
+        return self.pending_count > 0
+
+    def on_idle(self) -> None:
+        """
+        Called when the consumer polled nothing: whatever the handler waits for more events to finish
+        (e.g. a snapshot whose `last` row went to another partition or worker) will not come soon.
+        """
+
+    def flush(self) -> int:
+        """
+        Persist any buffered events. Handlers that do not buffer have nothing to do.
+        Returns how many events were skipped as stale since the previous flush. Raises BufferedEventsError
+        with the events that failed individually, which are no longer buffered.
+        """
+        return 0
+
     def __call__(self, event: ParsedEvent) -> None:
         if event.operation == Operation.CREATE:
             self.handle_created(event)
@@ -27,5 +65,7 @@ class AbstractEventHandler(ABC):
             self.handle_updated(event)
         elif event.operation == Operation.DELETE:
             self.handle_deleted(event)
+        elif event.operation == Operation.READ:
+            self.handle_snapshot(event)
         else:
             logger.info(f"Unknown operation: {event.operation}")
\ No newline at end of file
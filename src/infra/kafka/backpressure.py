@@ -0,0 +1,110 @@
+import time
+from collections import deque
+from typing import Callable
+
+from elasticsearch.helpers import BulkIndexError
+
+
+def is_rejection(error: Exception) -> bool:
+    """True when Elasticsearch refused the request because it is overloaded (HTTP 429)."""
+    if getattr(error, "status_code", None) == 429:
+        return True
+    if isinstance(error, BulkIndexError):
+        return any(item.get(op, {}).get("status") == 429 for item in error.errors for op in item)
+    return False
+
+
+class BackpressureController:
+    """
+    Decides when the consumer should stop fetching new messages because what is downstream
+    (Elasticsearch, enrichment) or its own work queue is saturated.
+
+    Latency and rejections are averaged over a sliding time window. Pausing happens above the high-water
+    marks and resuming only below the low-water marks, so the consumer does not flap. While paused no new
+    samples arrive: old ones expire from the window and the consumer eventually resumes to probe again.
+    """
+
+    def __init__(
+        self,
+        latency_high: float = 2.0,
+        latency_low: float = 0.5,
+        rejection_rate_high: float = 0.05,
+        rejection_rate_low: float = 0.01,
+        queue_high: int = 5_000,
+        queue_low: int = 1_000,
+        window: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.latency_high = latency_high
+        self.latency_low = latency_low
+        self.rejection_rate_high = rejection_rate_high
+        self.rejection_rate_low = rejection_rate_low
+        self.queue_high = queue_high
+        self.queue_low = queue_low
+        self.window = window
+        self._clock = clock
+
+        self._samples: deque[tuple[float, float, bool]] = deque()  # (timestamp, latency, rejected)
+        self._latency_sum = 0.0
+        self._rejections = 0
+        self.queue_depth = 0
+
+        self.paused = False
+        self.pause_count = 0
+        self._paused_since: float | None = None
+        self._paused_total = 0.0
+
+    def record(self, latency: float, rejected: bool = False) -> None:
+        self._samples.append((self._clock(), latency, rejected))
+        self._latency_sum += latency
+        self._rejections += rejected
+
+    def record_queue_depth(self, depth: int) -> None:
+        self.queue_depth = depth
+
+    @property
+    def latency(self) -> float:
+        self._expire()
+        return self._latency_sum / len(self._samples) if self._samples else 0.0
+
+    @property
+    def rejection_rate(self) -> float:
+        self._expire()
+        return self._rejections / len(self._samples) if self._samples else 0.0
+
+    @property
+    def paused_seconds(self) -> float:
+        """Total time spent paused, including the ongoing pause."""
+        ongoing = self._clock() - self._paused_since if self._paused_since is not None else 0.0
+        return self._paused_total + ongoing
+
+    def should_pause(self) -> bool:
+        """Evaluate the water marks and return whether the consumer must be paused."""
+        latency, rejection_rate = self.latency, self.rejection_rate
+        if not self.paused and (
+            latency > self.latency_high
+            or rejection_rate > self.rejection_rate_high
+            or self.queue_depth > self.queue_high
+        ):
+            self.paused = True
+            self.pause_count += 1
+            self._paused_since = self._clock()
+        elif self.paused and (
+            latency < self.latency_low
+            and rejection_rate < self.rejection_rate_low
+            and self.queue_depth < self.queue_low
+        ):
+            self.paused = False
+            self._paused_total += self._clock() - self._paused_since
+            self._paused_since = None
+
+        return self.paused
+
+    def _expire(self) -> None:
+        threshold = self._clock() - self.window
+        while self._samples and self._samples[0][0] < threshold:
+            _, latency, rejected = self._samples.popleft()
+            self._latency_sum -= latency
+            self._rejections -= rejected
+        if not self._samples:
+            self._latency_sum = 0.0  # Do not let float drift accumulate
\ No newline at end of file
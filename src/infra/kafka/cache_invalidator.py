@@ -0,0 +1,120 @@
+"""
+Drops the entities cached by an API process as their CDC events go by.
+
+Every API process reads all the partitions of the catalog topics from their end, assigned to it without
+joining a consumer group, and never commits: it only needs the changes made while it is running.
+"""
+import logging
+import os
+import threading
+from datetime import datetime
+from typing import Callable, Type
+from uuid import UUID
+
+from confluent_kafka import OFFSET_END, Consumer as KafkaConsumer, TopicPartition
+from pydantic import TypeAdapter, ValidationError
+
+from src.domain.entity import Entity
+from src.infra.codeflix_client.cdc_state_store import VIDEO_RELATION_TABLES
+from src.infra.elasticsearch.entity_cache import EntityCache
+from src.infra.kafka.operation import Operation
+from src.infra.kafka.parser import ParsedEvent, parse_debezium_message
+from src.infra.metrics import ENTITY_CACHE_INVALIDATIONS
+
+logger = logging.getLogger(__name__)
+
+ENTITY_CACHE_INVALIDATION = os.getenv("ENTITY_CACHE_INVALIDATION", "false").lower() == "true"
+
+# Rows of relation tables change the entity they point to
+RELATION_ID_COLUMNS = {
+    "genre_categories": "genre_id",
+    **{table: "video_id" for table in VIDEO_RELATION_TABLES},
+}
+topics = [
+    f"catalog-db.codeflix.{table}"
+    for table in ["categories", "cast_members", "genres", "videos", *RELATION_ID_COLUMNS]
+]
+# Parses `updated_at` the way the entities do (ISO 8601 strings, epoch timestamps)
+_timestamp = TypeAdapter(datetime)
+
+
+def invalidator_config() -> dict:
+    return {
+        "bootstrap.servers": os.getenv("BOOTSTRAP_SERVERS", "kafka:19092"),
+        # Required by the client, but never joined nor committed to: the partitions are assigned
+        "group.id": "api-cache",
+        "auto.offset.reset": "latest",
+        "enable.auto.commit": False,
+    }
+
+
+class CacheInvalidator:
+    def __init__(
+        self,
+        client: KafkaConsumer,
+        caches: dict[Type[Entity], EntityCache],
+        parser: Callable[[bytes], ParsedEvent | None] = parse_debezium_message,
+    ) -> None:
+        self._client = client
+        self._caches = caches
+        self._parser = parser
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def poll(self, timeout: float = 1.0) -> bool:
+        """Apply the next event, if one arrives within `timeout`. Returns whether one did."""
+        message = self._client.poll(timeout=timeout)
+        if message is None:
+            return False
+        if message.error() or message.value() is None:
+            return True
+
+        event = self._parser(message.value())
+        if event is None or (cache := self._caches.get(event.entity)) is None:
+            return True
+        id_column = RELATION_ID_COLUMNS.get(event.source.get("table"), "id")
+        if (id := event.payload.get(id_column)) is not None:
+            cache.invalidate(UUID(id), updated_at=self._version(event, id_column))
+            ENTITY_CACHE_INVALIDATIONS.labels(cache.name).inc()
+        return True
+
+    @staticmethod
+    def _version(event: ParsedEvent, id_column: str) -> datetime | None:
+        """`updated_at` of the entity after the change. Unknown for its relation rows, and once it is deleted."""
+        if id_column != "id" or event.operation == Operation.DELETE or "updated_at" not in event.payload:
+            return None
+        try:
+            return _timestamp.validate_python(event.payload["updated_at"])
+        except ValidationError:
+            return None
+
+    def assign(self) -> None:
+        """Read every partition of the topics, from their end."""
+        metadata = self._client.list_topics(timeout=10)
+        if missing := [topic for topic in topics if topic not in metadata.topics]:
+            # Only picked up by the next process: assigned partitions do not follow new topics
+            logger.warning("Topics not found, their changes will not invalidate the cache: %s", missing)
+        self._client.assign([
+            TopicPartition(topic, partition, OFFSET_END)
+            for topic in topics
+            if topic in metadata.topics
+            for partition in metadata.topics[topic].partitions
+        ])
+
+    def start(self) -> None:
+        self.assign()
+        self._thread = threading.Thread(target=self._run, name="cache-invalidator", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._client.close()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                self.poll()
+            except Exception:
+                logger.exception("Failed to apply a cache invalidation")
\ No newline at end of file
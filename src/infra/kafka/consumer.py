@@ -1,16 +1,35 @@
 import logging
 import os
+import signal
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError
 from typing import Callable, Type
 
-from confluent_kafka import KafkaException, Consumer as KafkaConsumer
+from confluent_kafka import KafkaException, Consumer as KafkaConsumer, Message, Producer as KafkaProducer, TopicPartition
 
 from src.domain.entity import Entity
+from src.domain.repository import StaleEntityError
 from src.domain.video import Video
-from src.infra.kafka.abstract_event_handler import AbstractEventHandler
+from src.infra.codeflix_client.cdc_state_store import VIDEO_RELATION_TABLES, VIDEO_STATE_STORE_PATH
+from src.infra.kafka.abstract_event_handler import AbstractEventHandler, BufferedEventsError
+from src.infra.kafka.backpressure import BackpressureController, is_rejection
 from src.infra.kafka.parser import ParsedEvent, parse_debezium_message
+from src.infra.kafka.retry import RetryPublisher
 from src.infra.kafka.video_event_handler import VideoEventHandler
+from src.infra.metrics import (
+    ERRORS,
+    MESSAGES,
+    PARTITION_LAG,
+    PAUSED,
+    PAUSED_SECONDS,
+    QUEUE_DEPTH,
+    STAGE_LATENCY,
+    start_metrics_server,
+)
+from src.infra.structured_logging import LOG_SUMMARY_INTERVAL, SAMPLED, configure_logging, truncate
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("consumer")
 
 # Configuration for the Kafka consumer
@@ -19,10 +38,23 @@ config = {
     "group.id": "consumer-cluster",
     "auto.offset.reset": "earliest",
     "enable.auto.commit": False,
+    # Rebalances only move the partitions that change owner instead of stopping the whole group
+    "partition.assignment.strategy": "cooperative-sticky",
+    # Refreshes the low watermarks cached by librdkafka, read for the lag metric (the high ones come with fetches)
+    "statistics.interval.ms": int(os.getenv("KAFKA_STATISTICS_INTERVAL_MS", "5000")),
+}
+if os.getenv("KAFKA_GROUP_INSTANCE_ID"):
+    # Static membership: a restarted instance gets its partitions back without a rebalance
+    config["group.instance.id"] = os.environ["KAFKA_GROUP_INSTANCE_ID"]
+producer_config = {
+    "bootstrap.servers": config["bootstrap.servers"],
 }
 topics = [
     "catalog-db.codeflix.videos",
 ]
+if VIDEO_STATE_STORE_PATH:
+    # Relations of the videos are joined from their CDC streams instead of fetched from the admin API
+    topics += [f"catalog-db.codeflix.{table}" for table in VIDEO_RELATION_TABLES]
 
 # Similar to a "router" -> calls proper handler
 entity_to_handler: dict[Type[Entity], Type[AbstractEventHandler]] = {
@@ -39,20 +71,49 @@ class Consumer:
         client: KafkaConsumer,
         parser: Callable[[bytes], ParsedEvent | None],
         router: dict[Type[Entity], Type[AbstractEventHandler]] | None = None,
+        retry: RetryPublisher | None = None,
+        backpressure: BackpressureController | None = None,
+        drain_timeout: float = 20.0,
     ) -> None:
         """
         :param client: Kafka consumer client
         :param parser: Function to parse the message data to a ParsedEvent
         :param router:  Dictionary to route the event to the proper handler
+        :param retry: Publisher to the retry/dead-letter topics. Without it, failures block the partition
+        :param backpressure: Pauses the assigned partitions while Elasticsearch/enrichment is saturated
+        :param drain_timeout: Max seconds to persist buffered events on rebalance/shutdown before giving up
         """
         self.client = client
         self.parser = parser
         self.router = router or entity_to_handler
+        self.retry = retry
+        self.backpressure = backpressure
+        # Partitions paused until the retried message at their head is due (monotonic deadline)
+        self._delayed: dict[tuple[str, int], float] = {}
+        # Handlers are long-lived so they can buffer events (e.g. snapshot backfill)
+        self._handlers: dict[Type[Entity], AbstractEventHandler] = {}
+        # Last processed message per (topic, partition) whose offset was not committed yet
+        self._uncommitted: dict[tuple[str, int], Message] = {}
+        self.stats: Counter[str] = Counter()
+        self.drain_timeout = drain_timeout
+        self._drain: Future | None = None
+        self._running = False
+        # Topic each entity was last consumed from, to label counts that only show up on flush
+        self._entity_topics: dict[Type[Entity], str] = {}
+        self._next_metrics_report = 0.0
+        self._summary_started = time.monotonic()
+        self._summary_stats: Counter[str] = Counter()
+
+    def subscribe(self, topics: list[str]) -> None:
+        self.client.subscribe(topics, on_assign=self.on_assign, on_revoke=self.on_revoke, on_lost=self.on_lost)
 
     def start(self):
         logger.info("Starting consumer...")
+        self._running = True
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, self._handle_sigterm)
         try:
-            while True:
+            while self._running:
                 self.consume()
         except KeyboardInterrupt:
             logger.info("Stopping consumer...")
@@ -61,10 +122,59 @@ class Consumer:
         finally:
             self.stop()
 
+    def _handle_sigterm(self, signum, frame) -> None:
+        # Sent by the container runtime on deploys: finish the current message, then drain and leave
+        logger.info("SIGTERM received, stopping consumer...")
+        self._running = False
+
+    def on_assign(self, client: KafkaConsumer, partitions: list[TopicPartition]) -> None:
+        logger.info(f"Partitions assigned: {[(tp.topic, tp.partition) for tp in partitions]}")
+        if self.backpressure is not None and self.backpressure.paused and partitions:
+            # The pause state is not kept across rebalances
+            client.pause(partitions)
+
+    def on_revoke(self, client: KafkaConsumer, partitions: list[TopicPartition]) -> None:
+        """Persist in-flight work and commit the final offsets before the partitions change owner."""
+        logger.info(f"Partitions revoked: {[(tp.topic, tp.partition) for tp in partitions]}")
+        revoked = {(tp.topic, tp.partition) for tp in partitions}
+        if self._drain_handlers(timeout=self.drain_timeout):
+            offsets = [
+                TopicPartition(topic, partition, message.offset() + 1)
+                for (topic, partition), message in self._uncommitted.items()
+                if (topic, partition) in revoked
+            ]
+            if offsets:
+                client.commit(offsets=offsets, asynchronous=False)
+        else:
+            logger.warning("Could not drain in-flight work: the new owner will reprocess it")
+        self._forget(revoked)
+
+    def on_lost(self, client: KafkaConsumer, partitions: list[TopicPartition]) -> None:
+        # Partitions were already reassigned: committing for them is no longer possible
+        logger.warning(f"Partitions lost: {[(tp.topic, tp.partition) for tp in partitions]}")
+        self._forget({(tp.topic, tp.partition) for tp in partitions})
+
     def consume(self) -> None:
+        if self._drain is not None:
+            # A drain that timed out is still writing buffered events: never race with it
+            self._drain.result()
+            self._drain = None
+
+        self._report_metrics()
+        self._log_summary()
+        self._apply_backpressure()
+        self._resume_delayed_partitions()
         message = self.client.poll(timeout=1.0)
         if message is None:
-            logger.info("No message received")
+            logger.debug("No message received")
+            try:
+                for handler in self._handlers.values():
+                    handler.on_idle()
+                self.flush()
+            except Exception as e:
+                # Buffered events are kept (and their offsets uncommitted) until the next flush
+                logger.error(f"Failed to flush buffered events: {e!r}")
+                ERRORS.labels("flush", type(e).__name__).inc()
             return None
 
         if message.error():
@@ -76,25 +186,274 @@ class Consumer:
             logger.info("Empty message received")
             return None
 
-        logger.info(f"Received message with data: {message_data}")
-        parsed_event = self.parser(message_data)
+        if self.retry is not None and (delay := self.retry.delay_remaining(message)) > 0:
+            self._delay_partition(message, delay)
+            return None
+
+        logger.info(
+            "Received message %s[%d]@%d: %s",
+            message.topic(), message.partition(), message.offset(), truncate(message_data),
+            extra=SAMPLED,
+        )
+        with STAGE_LATENCY.labels("parse").time():
+            parsed_event = self.parser(message_data)
         if parsed_event is None:
-            logger.error(f"Failed to parse message data: {message_data}")
-            return
+            logger.error("Failed to parse message data: %s", truncate(message_data))
+            ERRORS.labels("parse", "ParseError").inc()
+            if self.retry is None:
+                return
+            # Parsing is deterministic: retrying a poison message would fail again
+            self.retry.dead_letter(message, ValueError("Failed to parse message data"))
+            self._count("dead_lettered", message.topic(), "unknown")
+        else:
+            parsed_event.message = message
+            if not self._handle(message, parsed_event):
+                return None
+
+        self._uncommitted[(message.topic(), message.partition())] = message
+        if not any(handler.has_pending for handler in self._handlers.values()):
+            self.flush()
 
+    def _handle(self, message: Message, parsed_event: ParsedEvent) -> bool:
+        """Returns False when the message must be consumed again (it was rewound)."""
         # Call the proper handler
-        handler = self.router[parsed_event.entity]()
-        handler(parsed_event)
+        handler = self._get_handler(parsed_event.entity)
+        topic, entity = message.topic(), parsed_event.entity.__name__
+        self._entity_topics[parsed_event.entity] = topic
+        started = time.monotonic()
+        pending = handler.pending_count
+        try:
+            handler(parsed_event)
+        except StaleEntityError as e:
+            # An older event than what is already indexed (replay/rebalance): nothing to do
+            logger.info("Skipping stale event: %s", e, extra=SAMPLED)
+            self._count("skipped", topic, entity)
+        except BufferedEventsError as e:
+            # The event completed a batch that failed: only the events that failed on their own are retried
+            self._retry_buffered(e)
+            if all(event is not parsed_event for event, _ in e.failures):
+                self._count("processed", topic, entity)
+        except Exception as e:
+            ERRORS.labels("handle", type(e).__name__).inc()
+            if self.backpressure is not None and is_rejection(e):
+                # Elasticsearch is overloaded: slow down and try the same message again later
+                self.backpressure.record(time.monotonic() - started, rejected=True)
+                self._count("rejected", topic, entity)
+                if handler.pending_count > pending:
+                    # The event was buffered before its batch got rejected: it is written with the batch
+                    return True
+                self._rewind(message)
+                return False
+            if self.retry is None:
+                raise
+            self.retry.retry(message, e)
+            self._count("retried", topic, entity)
+        else:
+            self._count("processed", topic, entity)
 
-        self.client.commit(message=message)
+        elapsed = time.monotonic() - started
+        STAGE_LATENCY.labels("handle").observe(elapsed)
+        if self.backpressure is not None:
+            self.backpressure.record(elapsed)
+        return True
+
+    def flush(self) -> None:
+        self._flush_handlers()
+        self._commit()
+
+    def _flush_handlers(self) -> None:
+        for entity, handler in self._handlers.items():
+            # Bulk writes are the slowest calls to Elasticsearch: feed them to the backpressure too
+            observed = self.backpressure is not None and handler.has_pending
+            started = time.monotonic()
+            try:
+                if skipped := handler.flush():
+                    self._count("skipped", self._entity_topics.get(entity, ""), entity.__name__, skipped)
+            except BufferedEventsError as e:
+                self._retry_buffered(e)
+            except Exception as e:
+                if observed:
+                    self.backpressure.record(time.monotonic() - started, rejected=is_rejection(e))
+                raise
+            if observed:
+                self.backpressure.record(time.monotonic() - started)
+
+    def _retry_buffered(self, error: BufferedEventsError) -> None:
+        if self.retry is None:
+            raise error
+        for event, e in error.failures:
+            ERRORS.labels("handle", type(e).__name__).inc()
+            self.retry.retry(event.message, e)
+            self._count("retried", event.message.topic(), event.entity.__name__)
 
     def stop(self):
         logger.info("Closing consumer...")
-        self.client.close()
+        try:
+            if self._drain_handlers(timeout=self.drain_timeout):
+                self._commit(asynchronous=False)
+            else:
+                logger.warning("Could not drain in-flight work before closing: it will be reprocessed")
+        finally:
+            self.client.close()
+
+    def _drain_handlers(self, timeout: float) -> bool:
+        """Flush every handler within `timeout` seconds. Returns False if it failed or timed out."""
+        if self._drain is not None and not self._drain.done():
+            return False
+
+        executor = ThreadPoolExecutor(max_workers=1)
+        future = executor.submit(self._flush_handlers)
+        executor.shutdown(wait=False)
+        try:
+            future.result(timeout=timeout)
+        except TimeoutError:
+            self._drain = future
+            return False
+        except Exception as e:
+            logger.error(f"Failed to flush buffered events: {e!r}")
+            return False
+        return True
+
+    def _forget(self, partitions: set[tuple[str, int]]) -> None:
+        for key in partitions:
+            self._uncommitted.pop(key, None)
+            self._delayed.pop(key, None)
+
+    def _count(self, outcome: str, topic: str, entity: str, amount: int = 1) -> None:
+        self.stats[outcome] += amount
+        MESSAGES.labels(topic, entity, outcome).inc(amount)
+
+    def _report_metrics(self, interval: float = 5.0) -> None:
+        now = time.monotonic()
+        if now < self._next_metrics_report:
+            return
+        self._next_metrics_report = now + interval
+
+        QUEUE_DEPTH.set(sum(handler.pending_count for handler in self._handlers.values()))
+        if self.backpressure is not None:
+            PAUSED.set(self.backpressure.paused)
+            PAUSED_SECONDS.set(self.backpressure.paused_seconds)
+
+        try:
+            assignment = self.client.assignment()
+            for tp in self.client.position(assignment):
+                # Cached by the client, so the poll loop never waits on a broker round trip per partition
+                low, high = self.client.get_watermark_offsets(tp, cached=True)
+                # Nothing consumed yet from the partition: the whole retained log is lag
+                consumed = tp.offset if tp.offset >= 0 else low
+                if high < 0 or consumed < 0:
+                    # Not known until the first fetch (high) or statistics (low) of the partition
+                    continue
+                PARTITION_LAG.labels(tp.topic, tp.partition).set(max(high - consumed, 0))
+        except KafkaException as e:
+            logger.warning(f"Could not compute consumer lag: {e}")
+
+    def _log_summary(self, interval: float = LOG_SUMMARY_INTERVAL) -> None:
+        """A single line with what was consumed since the previous summary, instead of one per message."""
+        elapsed = time.monotonic() - self._summary_started
+        if elapsed < interval:
+            return
+
+        counts = self.stats - self._summary_stats
+        if counts:
+            total = sum(counts.values())
+            logger.info(
+                "Consumed %d messages in %.0fs (%.1f/s): %s",
+                total, elapsed, total / elapsed, ", ".join(f"{outcome}={n}" for outcome, n in sorted(counts.items())),
+            )
+        self._summary_started += elapsed
+        self._summary_stats = self.stats.copy()
+
+    def _apply_backpressure(self) -> None:
+        if self.backpressure is None:
+            return
+
+        self.backpressure.record_queue_depth(sum(handler.pending_count for handler in self._handlers.values()))
+        was_paused = self.backpressure.paused
+        if self.backpressure.should_pause() == was_paused:
+            return
+
+        if was_paused:
+            # Partitions waiting for a retried message stay paused until it is due
+            partitions = [tp for tp in self.client.assignment() if (tp.topic, tp.partition) not in self._delayed]
+            self.client.resume(partitions)
+            logger.info(f"Backpressure released, consumer resumed ({self.backpressure.paused_seconds:.1f}s paused in total)")
+        else:
+            self.client.pause(self.client.assignment())
+            logger.warning(
+                f"Backpressure: pausing consumer (latency={self.backpressure.latency:.2f}s, "
+                f"rejection_rate={self.backpressure.rejection_rate:.0%}, queue={self.backpressure.queue_depth})"
+            )
+
+    def _rewind(self, message: Message) -> None:
+        self.client.seek(TopicPartition(message.topic(), message.partition(), message.offset()))
+
+    def _delay_partition(self, message: Message, delay: float) -> None:
+        # Rewind to the retried message and stop fetching from its partition until it is due,
+        # while the other partitions keep flowing.
+        partition = TopicPartition(message.topic(), message.partition(), message.offset())
+        self.client.pause([partition])
+        self.client.seek(partition)
+        self._delayed[(message.topic(), message.partition())] = time.monotonic() + delay
+
+    def _resume_delayed_partitions(self) -> None:
+        now = time.monotonic()
+        due = [key for key, deadline in self._delayed.items() if deadline <= now]
+        if not due:
+            return
+
+        for key in due:
+            del self._delayed[key]
+        if self.backpressure is None or not self.backpressure.paused:
+            self.client.resume([TopicPartition(topic, partition) for topic, partition in due])
+
+    def _get_handler(self, entity: Type[Entity]) -> AbstractEventHandler:
+        if entity not in self._handlers:
+            self._handlers[entity] = self.router[entity]()
+        return self._handlers[entity]
+
+    def _commit(self, asynchronous: bool = True) -> None:
+        # Offsets are only committed once no handler holds buffered events, so a crash
+        # never skips events that were polled but not persisted yet.
+        if not self._uncommitted:
+            return
+
+        with STAGE_LATENCY.labels("commit").time():
+            self._commit_offsets(asynchronous)
+        self._uncommitted.clear()
+
+    def _commit_offsets(self, asynchronous: bool) -> None:
+        if asynchronous:
+            for message in self._uncommitted.values():
+                self.client.commit(message=message)
+        else:
+            self.client.commit(
+                offsets=[
+                    TopicPartition(topic, partition, message.offset() + 1)
+                    for (topic, partition), message in self._uncommitted.items()
+                ],
+                asynchronous=False,
+            )
+
+
+def run(config: dict = config) -> None:
+    """Consume the CDC topics, and their retry topics, until the process is stopped."""
+    retry = RetryPublisher(producer=KafkaProducer(producer_config))
+    # The handlers flush every batch, so a whole batch is only pending when its flush failed
+    batch_size = VideoEventHandler.BACKFILL_BATCH_SIZE
+    consumer = Consumer(
+        client=KafkaConsumer(config),
+        parser=parse_debezium_message,
+        retry=retry,
+        backpressure=BackpressureController(queue_high=batch_size - 1, queue_low=batch_size // 2),
+    )
+    consumer.subscribe(topics=topics + [
+        retry_topic for topic in topics for retry_topic in retry.policy.retry_topics(topic)
+    ])
+    consumer.start()
 
 
 if __name__ == "__main__":
-    kafka_consumer = KafkaConsumer(config)
-    kafka_consumer.subscribe(topics=topics)
-    consumer = Consumer(client=kafka_consumer, parser=parse_debezium_message)
-    consumer.start()
\ No newline at end of file
+    configure_logging()
+    start_metrics_server()
+    run()
\ No newline at end of file
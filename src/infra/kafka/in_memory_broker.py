@@ -0,0 +1,247 @@
+"""
+In-memory stand-in for a Kafka broker, with producer and consumer clients that mimic the subset of the
+confluent_kafka API used by the consumer. Useful for tests and local experiments without a running Kafka.
+
+>>> broker = InMemoryBroker()
+>>> InMemoryProducer(broker).produce("topic", value=b"data")
+>>> consumer = InMemoryConsumer(broker)
+>>> consumer.subscribe(["topic"])
+>>> consumer.poll().value()
+b'data'
+"""
+from typing import Callable
+
+from confluent_kafka import OFFSET_BEGINNING, OFFSET_END, TopicPartition
+from confluent_kafka.admin import ClusterMetadata, PartitionMetadata, TopicMetadata
+
+
+class InMemoryMessage:
+    def __init__(
+        self,
+        topic: str,
+        partition: int,
+        offset: int,
+        value: bytes | None,
+        key: bytes | None = None,
+        headers: list[tuple[str, bytes]] | None = None,
+    ) -> None:
+        self._topic = topic
+        self._partition = partition
+        self._offset = offset
+        self._value = value
+        self._key = key
+        self._headers = headers
+
+    def topic(self) -> str:
+        return self._topic
+
+    def partition(self) -> int:
+        return self._partition
+
+    def offset(self) -> int:
+        return self._offset
+
+    def value(self) -> bytes | None:
+        return self._value
+
+    def key(self) -> bytes | None:
+        return self._key
+
+    def headers(self) -> list[tuple[str, bytes]] | None:
+        return self._headers
+
+    def error(self) -> None:
+        return None
+
+    def __repr__(self) -> str:
+        return f"InMemoryMessage(topic={self._topic!r}, partition={self._partition}, offset={self._offset})"
+
+
+class InMemoryBroker:
+    def __init__(self, partitions: int = 1) -> None:
+        self._default_partitions = partitions
+        self._logs: dict[str, list[list[InMemoryMessage]]] = {}
+        # Committed offsets (next offset to consume) of the single consumer group
+        self.committed: dict[tuple[str, int], int] = {}
+
+    def create_topic(self, topic: str, partitions: int | None = None) -> None:
+        if topic not in self._logs:
+            self._logs[topic] = [[] for _ in range(partitions or self._default_partitions)]
+
+    def topics(self) -> list[str]:
+        return list(self._logs)
+
+    def partitions(self, topic: str) -> int:
+        self.create_topic(topic)
+        return len(self._logs[topic])
+
+    def append(
+        self,
+        topic: str,
+        value: bytes | None,
+        key: bytes | None = None,
+        headers: list[tuple[str, bytes]] | dict | None = None,
+        partition: int | None = None,
+    ) -> InMemoryMessage:
+        self.create_topic(topic)
+        if partition is None:
+            partition = hash(key) % len(self._logs[topic]) if key is not None else 0
+        if isinstance(headers, dict):
+            headers = list(headers.items())
+
+        log = self._logs[topic][partition]
+        message = InMemoryMessage(topic, partition, len(log), value, key, headers)
+        log.append(message)
+        return message
+
+    def read(self, topic: str, partition: int, offset: int) -> InMemoryMessage | None:
+        log = self._logs[topic][partition]
+        return log[offset] if offset < len(log) else None
+
+    def end_offset(self, topic: str, partition: int) -> int:
+        return len(self._logs[topic][partition])
+
+    def messages(self, topic: str) -> list[InMemoryMessage]:
+        self.create_topic(topic)
+        return [message for log in self._logs[topic] for message in log]
+
+
+class InMemoryProducer:
+    def __init__(self, broker: InMemoryBroker) -> None:
+        self._broker = broker
+
+    def produce(
+        self,
+        topic: str,
+        value: bytes | None = None,
+        key: bytes | None = None,
+        partition: int | None = None,
+        headers: list[tuple[str, bytes]] | dict | None = None,
+        **kwargs,
+    ) -> None:
+        self._broker.append(topic, value=value, key=key, headers=headers, partition=partition)
+
+    def poll(self, timeout: float = 0) -> int:
+        return 0
+
+    def flush(self, timeout: float | None = None) -> int:
+        return 0
+
+
+class InMemoryConsumer:
+    def __init__(self, broker: InMemoryBroker) -> None:
+        self._broker = broker
+        self._assignment: list[tuple[str, int]] = []
+        self._positions: dict[tuple[str, int], int] = {}
+        self._paused: set[tuple[str, int]] = set()
+        self._on_revoke: Callable | None = None
+        self._next = 0
+        self.closed = False
+
+    def subscribe(
+        self,
+        topics: list[str],
+        on_assign: Callable | None = None,
+        on_revoke: Callable | None = None,
+        on_lost: Callable | None = None,
+    ) -> None:
+        # A single member in the group: every partition is assigned right away
+        self._on_revoke = on_revoke
+        self._assignment = [
+            (topic, partition)
+            for topic in topics
+            for partition in range(self._broker.partitions(topic))
+        ]
+        for key in self._assignment:
+            self._positions[key] = self._broker.committed.get(key, 0)
+        if on_assign:
+            on_assign(self, self.assignment())
+
+    def assign(self, partitions: list[TopicPartition]) -> None:
+        # Manual assignment: no group, no rebalance callbacks
+        self._assignment = [(tp.topic, tp.partition) for tp in partitions]
+        for tp in partitions:
+            key = (tp.topic, tp.partition)
+            if tp.offset == OFFSET_END:
+                self._positions[key] = self._broker.end_offset(*key)
+            elif tp.offset == OFFSET_BEGINNING:
+                self._positions[key] = 0
+            elif tp.offset >= 0:
+                self._positions[key] = tp.offset
+            else:
+                self._positions[key] = self._broker.committed.get(key, 0)
+
+    def list_topics(self, topic: str | None = None, timeout: float = -1) -> ClusterMetadata:
+        metadata = ClusterMetadata()
+        for name in [topic] if topic is not None else self._broker.topics():
+            topic_metadata = TopicMetadata()
+            topic_metadata.topic = name
+            for partition in range(self._broker.partitions(name)):
+                topic_metadata.partitions[partition] = PartitionMetadata()
+                topic_metadata.partitions[partition].id = partition
+            metadata.topics[name] = topic_metadata
+        return metadata
+
+    def revoke(self) -> None:
+        """Simulate a rebalance that takes every partition away from this consumer."""
+        revoked = self.assignment()
+        if self._on_revoke:
+            self._on_revoke(self, revoked)
+        self._assignment = []
+        self._paused.clear()
+
+    def assignment(self) -> list[TopicPartition]:
+        return [TopicPartition(topic, partition) for topic, partition in self._assignment]
+
+    def poll(self, timeout: float | None = None) -> InMemoryMessage | None:
+        # Round-robin over the assigned partitions so a busy one does not starve the others
+        for i in range(len(self._assignment)):
+            key = self._assignment[(self._next + i) % len(self._assignment)]
+            if key in self._paused:
+                continue
+
+            message = self._broker.read(*key, self._positions[key])
+            if message is not None:
+                self._positions[key] += 1
+                self._next = (self._next + i + 1) % len(self._assignment)
+                return message
+
+        return None
+
+    def commit(
+        self,
+        message: InMemoryMessage | None = None,
+        offsets: list[TopicPartition] | None = None,
+        asynchronous: bool = True,
+    ) -> list[TopicPartition] | None:
+        if message is not None:
+            offsets = [TopicPartition(message.topic(), message.partition(), message.offset() + 1)]
+        for tp in offsets or []:
+            self._broker.committed[(tp.topic, tp.partition)] = tp.offset
+        return None if asynchronous else offsets
+
+    def pause(self, partitions: list[TopicPartition]) -> None:
+        self._paused.update((tp.topic, tp.partition) for tp in partitions)
+
+    def resume(self, partitions: list[TopicPartition]) -> None:
+        self._paused.difference_update((tp.topic, tp.partition) for tp in partitions)
+
+    def seek(self, partition: TopicPartition) -> None:
+        self._positions[(partition.topic, partition.partition)] = partition.offset
+
+    def position(self, partitions: list[TopicPartition]) -> list[TopicPartition]:
+        return [
+            TopicPartition(tp.topic, tp.partition, self._positions.get((tp.topic, tp.partition), 0))
+            for tp in partitions
+        ]
+
+    def get_watermark_offsets(
+        self,
+        partition: TopicPartition,
+        timeout: float | None = None,
+        cached: bool = False,
+    ) -> tuple[int, int]:
+        return 0, self._broker.end_offset(partition.topic, partition.partition)
+
+    def close(self) -> None:
+        self.closed = True
\ No newline at end of file
@@ -1,7 +1,7 @@
 import json
 import logging
-from dataclasses import dataclass
-from typing import Type
+from dataclasses import dataclass, field
+from typing import Any, Type
 
 from src.domain.cast_member import CastMember
 from src.domain.category import Category
@@ -18,6 +18,9 @@ class ParsedEvent:
     entity: Type[Entity]
     operation: Operation
     payload: dict
+    source: dict = field(default_factory=dict, compare=False)
+    # Kafka message the event was parsed from, set by the consumer: buffered events that fail are retried with it
+    message: Any = field(default=None, compare=False, repr=False)
 
 
 table_to_entity = {
@@ -25,6 +28,13 @@ table_to_entity = {
     "cast_members": CastMember,
     "genres": Genre,
     "videos": Video,
+    # Relations of a video, joined locally when VIDEO_STATE_STORE_PATH is set
+    "video_categories": Video,
+    "video_genres": Video,
+    "video_cast_members": Video,
+    "video_banners": Video,
+    # Categories of a genre, read by the API to invalidate its cached genres
+    "genre_categories": Genre,
 }
 
 
@@ -43,4 +53,9 @@ def parse_debezium_message(data: bytes) -> ParsedEvent | None:
         logger.error(e)
         return None
 
-    return ParsedEvent(entity=entity, operation=operation, payload=payload)
\ No newline at end of file
+    return ParsedEvent(
+        entity=entity,
+        operation=operation,
+        payload=payload,
+        source=json_data["payload"]["source"],
+    )
\ No newline at end of file
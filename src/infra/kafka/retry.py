@@ -0,0 +1,141 @@
+import logging
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+from confluent_kafka import Message, Producer as KafkaProducer
+
+logger = logging.getLogger(__name__)
+
+ORIGINAL_TOPIC_HEADER = "x-original-topic"
+ORIGINAL_PARTITION_HEADER = "x-original-partition"
+ORIGINAL_OFFSET_HEADER = "x-original-offset"
+ATTEMPT_HEADER = "x-retry-attempt"
+NOT_BEFORE_HEADER = "x-retry-not-before"
+EXCEPTION_HEADER = "x-exception"
+EXCEPTION_MESSAGE_HEADER = "x-exception-message"
+
+_RETRY_HEADERS = {
+    ORIGINAL_TOPIC_HEADER,
+    ORIGINAL_PARTITION_HEADER,
+    ORIGINAL_OFFSET_HEADER,
+    ATTEMPT_HEADER,
+    NOT_BEFORE_HEADER,
+    EXCEPTION_HEADER,
+    EXCEPTION_MESSAGE_HEADER,
+}
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Failed messages go through `max_attempts` retry topics, each one waiting longer than the previous
+    (base_delay * multiplier ** (attempt - 1)), before landing on the dead-letter topic.
+
+    >>> RetryPolicy().retry_topic("catalog-db.codeflix.videos", attempt=2)
+    'catalog-db.codeflix.videos.retry.2'
+    """
+    max_attempts: int = 3
+    base_delay: float = 5.0
+    multiplier: float = 6.0
+
+    def delay(self, attempt: int) -> float:
+        return self.base_delay * self.multiplier ** (attempt - 1)
+
+    def retry_topic(self, topic: str, attempt: int) -> str:
+        return f"{topic}.retry.{attempt}"
+
+    def retry_topics(self, topic: str) -> list[str]:
+        return [self.retry_topic(topic, attempt) for attempt in range(1, self.max_attempts + 1)]
+
+    def dead_letter_topic(self, topic: str) -> str:
+        return f"{topic}.dlq"
+
+
+def _header(message: Message, name: str) -> str | None:
+    for key, value in message.headers() or []:
+        if key == name and value is not None:
+            return value.decode() if isinstance(value, bytes) else value
+    return None
+
+
+class RetryPublisher:
+    """
+    Moves messages that could not be processed out of the way, so the partition keeps flowing:
+    - transient failures are re-published to the next retry topic with a "not before" timestamp
+    - poison messages (or retries exhausted) go to the dead-letter topic with the error details
+    Original headers are always kept.
+    """
+
+    def __init__(
+        self,
+        producer: KafkaProducer,
+        policy: RetryPolicy | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._producer = producer
+        self.policy = policy or RetryPolicy()
+        self._clock = clock
+
+    @staticmethod
+    def original_topic(message: Message) -> str:
+        return _header(message, ORIGINAL_TOPIC_HEADER) or message.topic()
+
+    @staticmethod
+    def attempt(message: Message) -> int:
+        return int(_header(message, ATTEMPT_HEADER) or 0)
+
+    def delay_remaining(self, message: Message) -> float:
+        """Seconds to wait before a retried message may be processed again (0 if it is due)."""
+        not_before = _header(message, NOT_BEFORE_HEADER)
+        if not_before is None:
+            return 0.0
+        return max(0.0, float(not_before) - self._clock())
+
+    def retry(self, message: Message, error: Exception) -> None:
+        attempt = self.attempt(message) + 1
+        if attempt > self.policy.max_attempts:
+            self.dead_letter(message, error)
+            return
+
+        topic = self.policy.retry_topic(self.original_topic(message), attempt)
+        not_before = self._clock() + self.policy.delay(attempt)
+        self._publish(
+            topic,
+            message,
+            error,
+            extra_headers=[
+                (ATTEMPT_HEADER, str(attempt).encode()),
+                (NOT_BEFORE_HEADER, str(not_before).encode()),
+            ],
+        )
+        logger.warning(f"Message sent to {topic} (attempt {attempt}): {error!r}")
+
+    def dead_letter(self, message: Message, error: Exception) -> None:
+        topic = self.policy.dead_letter_topic(self.original_topic(message))
+        self._publish(topic, message, error, extra_headers=[(ATTEMPT_HEADER, str(self.attempt(message)).encode())])
+        logger.error(f"Message sent to {topic}: {error!r}")
+
+    def _publish(
+        self,
+        topic: str,
+        message: Message,
+        error: Exception,
+        extra_headers: list[tuple[str, bytes]],
+    ) -> None:
+        # A retried message keeps pointing at where it was first consumed
+        original_partition = _header(message, ORIGINAL_PARTITION_HEADER) or str(message.partition())
+        original_offset = _header(message, ORIGINAL_OFFSET_HEADER) or str(message.offset())
+
+        headers = [(key, value) for key, value in message.headers() or [] if key not in _RETRY_HEADERS]
+        headers += [
+            (ORIGINAL_TOPIC_HEADER, self.original_topic(message).encode()),
+            (ORIGINAL_PARTITION_HEADER, original_partition.encode()),
+            (ORIGINAL_OFFSET_HEADER, original_offset.encode()),
+            (EXCEPTION_HEADER, type(error).__name__.encode()),
+            (EXCEPTION_MESSAGE_HEADER, str(error).encode()),
+            *extra_headers,
+        ]
+        self._producer.produce(topic, value=message.value(), key=message.key(), headers=headers)
+        # The original offset is committed right after: make sure the copy was delivered first
+        self._producer.flush()
\ No newline at end of file
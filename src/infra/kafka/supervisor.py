@@ -0,0 +1,168 @@
+"""
+Runs several consumer processes of the same consumer group on one host, so parsing and validation
+(GIL-bound) scale across cores: Kafka spreads the partitions among the workers.
+
+    CONSUMER_WORKERS=4 python src/infra/kafka/supervisor.py
+
+Without CONSUMER_WORKERS, one worker per partition of the consumed topics is started, up to the number of
+cores. Crashed workers are restarted with an exponential backoff, and the metrics of every worker are
+served aggregated on METRICS_PORT.
+"""
+import glob
+import logging
+import multiprocessing
+import os
+import signal
+import tempfile
+import time
+from multiprocessing.process import BaseProcess
+from typing import Callable
+
+from confluent_kafka.admin import AdminClient
+
+from src.infra.kafka.consumer import config, run, topics
+from src.infra.metrics import mark_process_dead, start_multiprocess_metrics_server
+from src.infra.structured_logging import configure_logging
+
+logger = logging.getLogger(__name__)
+
+CONSUMER_WORKERS = int(os.getenv("CONSUMER_WORKERS", "0"))
+
+
+def worker_count(partitions: int, cores: int | None = None, configured: int = CONSUMER_WORKERS) -> int:
+    if configured > 0:
+        return configured
+    # Workers beyond the partition count would sit idle without an assignment
+    return max(1, min(partitions, cores or os.cpu_count() or 1))
+
+
+def count_partitions(topics: list[str]) -> int:
+    metadata = AdminClient({"bootstrap.servers": config["bootstrap.servers"]}).list_topics(timeout=10)
+    return sum(len(metadata.topics[topic].partitions) for topic in topics if topic in metadata.topics)
+
+
+def run_worker(index: int) -> None:
+    configure_logging()
+    worker_config = dict(config)
+    if "group.instance.id" in worker_config:
+        # Static membership needs a distinct id per member
+        worker_config["group.instance.id"] = f"{worker_config['group.instance.id']}-{index}"
+    run(worker_config)
+
+
+class Supervisor:
+    def __init__(
+        self,
+        workers: int,
+        target: Callable[[int], None] = run_worker,
+        process_factory: Callable[..., BaseProcess] | None = None,
+        metrics_dir: str | None = None,
+        restart_delay: float = 1.0,
+        max_restart_delay: float = 60.0,
+        stable_after: float = 60.0,
+        stop_timeout: float = 25.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        :param workers: Number of consumer processes to keep running
+        :param target: Function run by each worker, called with the worker index
+        :param process_factory: Creates the worker processes. Spawned by default: forking a process that
+            already has librdkafka threads is unsafe, and workers must import prometheus_client anew
+        :param metrics_dir: PROMETHEUS_MULTIPROC_DIR of the workers, to clean up after the dead ones
+        :param restart_delay: Wait before the first restart of a crashed worker, doubled on each new crash
+        :param stable_after: A worker that ran this long before exiting is restarted without backoff
+        :param stop_timeout: Max seconds for the workers to drain on shutdown before they are killed
+        """
+        self.workers = workers
+        self._target = target
+        self._process_factory = process_factory or multiprocessing.get_context("spawn").Process
+        self._metrics_dir = metrics_dir
+        self.restart_delay = restart_delay
+        self.max_restart_delay = max_restart_delay
+        self.stable_after = stable_after
+        self.stop_timeout = stop_timeout
+        self._clock = clock
+
+        self._processes: list[BaseProcess | None] = [None] * workers
+        self._started_at = [0.0] * workers
+        self._crashes = [0] * workers
+        self._restart_at: list[float | None] = [None] * workers
+        self.restarts = 0
+        self._running = False
+
+    def start(self) -> None:
+        logger.info("Starting %d consumer workers...", self.workers)
+        self._running = True
+        signal.signal(signal.SIGTERM, self._handle_sigterm)
+        try:
+            while self._running:
+                self.check()
+                time.sleep(0.5)
+        except KeyboardInterrupt:
+            logger.info("Stopping workers...")
+        finally:
+            self.stop()
+
+    def _handle_sigterm(self, signum, frame) -> None:
+        logger.info("SIGTERM received, stopping workers...")
+        self._running = False
+
+    def check(self) -> None:
+        """Start the missing workers, and restart the ones that exited once their backoff is over."""
+        now = self._clock()
+        for index, process in enumerate(self._processes):
+            if process is None:
+                self._spawn(index)
+                continue
+            if process.is_alive():
+                continue
+
+            restart_at = self._restart_at[index]
+            if restart_at is None:
+                if now - self._started_at[index] >= self.stable_after:
+                    self._crashes[index] = 0
+                delay = min(self.restart_delay * 2 ** self._crashes[index], self.max_restart_delay)
+                self._crashes[index] += 1
+                self._restart_at[index] = now + delay
+                if self._metrics_dir:
+                    mark_process_dead(process.pid, self._metrics_dir)
+                logger.warning(
+                    "Worker %d (pid %s) exited with code %s, restarting in %.0fs",
+                    index, process.pid, process.exitcode, delay,
+                )
+            elif now >= restart_at:
+                self.restarts += 1
+                self._spawn(index)
+
+    def _spawn(self, index: int) -> None:
+        process = self._process_factory(target=self._target, args=(index,), name=f"consumer-{index}")
+        process.start()
+        self._processes[index] = process
+        self._started_at[index] = self._clock()
+        self._restart_at[index] = None
+
+    def stop(self) -> None:
+        processes = [process for process in self._processes if process is not None and process.is_alive()]
+        for process in processes:
+            # SIGTERM: each worker drains its buffered events and commits before leaving the group
+            process.terminate()
+
+        deadline = self._clock() + self.stop_timeout
+        for process in processes:
+            process.join(timeout=max(0.0, deadline - self._clock()))
+            if process.is_alive():
+                logger.warning("Worker %s did not stop in time, killing it", process.name)
+                process.kill()
+                process.join()
+
+
+if __name__ == "__main__":
+    configure_logging()
+    # Read by prometheus_client when the spawned workers import it
+    metrics_dir = os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", tempfile.mkdtemp(prefix="prometheus-"))
+    for path in glob.glob(os.path.join(metrics_dir, "*.db")):
+        os.remove(path)  # Samples of a previous run
+    start_multiprocess_metrics_server(metrics_dir)
+
+    supervisor = Supervisor(workers=worker_count(count_partitions(topics)), metrics_dir=metrics_dir)
+    supervisor.start()
\ No newline at end of file
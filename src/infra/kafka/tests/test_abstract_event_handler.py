@@ -54,6 +54,30 @@ class TestAbstractEventHandler:
 
         handler.handle_deleted.assert_called_once_with(event)
 
+    def test_when_operation_is_read_then_call_handle_snapshot(self):
+        event = ParsedEvent(
+            entity=Category,
+            operation=Operation.READ,
+            payload={"key": "value"},
+        )
+        handler = FakeHandler()
+        handler.handle_snapshot = create_autospec(handler.handle_snapshot)
+        handler(event)
+
+        handler.handle_snapshot.assert_called_once_with(event)
+
+    def test_snapshot_is_handled_as_created_by_default(self):
+        event = ParsedEvent(
+            entity=Category,
+            operation=Operation.READ,
+            payload={"key": "value"},
+        )
+        handler = FakeHandler()
+        handler.handle_created = create_autospec(handler.handle_created)
+        handler(event)
+
+        handler.handle_created.assert_called_once_with(event)
+
     def test_when_operation_is_unknown_then_log_info(self, mocker):
         event = ParsedEvent(
             entity=Category,
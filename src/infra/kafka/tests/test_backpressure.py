@@ -0,0 +1,216 @@
+import json
+from unittest.mock import MagicMock, create_autospec
+
+import pytest
+from elasticsearch import ApiError
+from elasticsearch.helpers import BulkIndexError
+from pytest_mock import MockFixture
+
+from src.application.save_video import SaveVideo
+from src.domain.category import Category
+from src.domain.video import Video
+from src.infra.kafka.backpressure import BackpressureController, is_rejection
+from src.infra.kafka.consumer import Consumer
+from src.infra.kafka.in_memory_broker import InMemoryBroker, InMemoryConsumer
+from src.infra.kafka.parser import parse_debezium_message
+from src.infra.kafka.video_event_handler import VideoEventHandler
+
+TOPIC = "catalog-db.codeflix.categories"
+CREATE_EVENT = json.dumps({
+    "payload": {
+        "source": {"table": "categories"},
+        "op": "c",
+        "after": {"id": "d5889ed5-3d3f-11ef-baf5-0242ac130006", "name": "Category 1"},
+    }
+}).encode()
+
+VIDEOS_TOPIC = "catalog-db.codeflix.videos"
+VIDEO_IDS = [
+    "5b0b1c3e-8d2f-4f47-9a51-1f0f3c6e2a01",
+    "5b0b1c3e-8d2f-4f47-9a51-1f0f3c6e2a02",
+    "5b0b1c3e-8d2f-4f47-9a51-1f0f3c6e2a03",
+]
+
+
+def video_snapshot_event(video_id: str) -> bytes:
+    return json.dumps({
+        "payload": {
+            "source": {"table": "videos", "snapshot": "true"},
+            "op": "r",
+            "after": {
+                "id": video_id,
+                "title": "Video",
+                "launch_year": 1972,
+                "rating": "AGE_18",
+                "created_at": "2024-12-13T20:46:20Z",
+                "updated_at": "2024-12-13T20:46:20Z",
+                "is_active": True,
+            },
+        }
+    }).encode()
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def too_many_requests() -> ApiError:
+    return ApiError("es_rejected_execution_exception", meta=MagicMock(status=429), body={})
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+@pytest.fixture
+def controller(clock: FakeClock) -> BackpressureController:
+    return BackpressureController(
+        latency_high=2.0,
+        latency_low=0.5,
+        queue_high=100,
+        queue_low=10,
+        window=10.0,
+        clock=clock,
+    )
+
+
+class TestIsRejection:
+    def test_api_error_with_status_429_is_a_rejection(self) -> None:
+        assert is_rejection(too_many_requests()) is True
+
+    def test_bulk_error_with_rejected_items_is_a_rejection(self) -> None:
+        error = BulkIndexError("1 document(s) failed to index.", [{"index": {"status": 429}}])
+
+        assert is_rejection(error) is True
+
+    def test_other_errors_are_not_rejections(self) -> None:
+        assert is_rejection(RuntimeError("boom")) is False
+
+
+class TestBackpressureController:
+    def test_pause_above_high_latency_and_resume_below_low_latency(
+        self,
+        controller: BackpressureController,
+        clock: FakeClock,
+    ) -> None:
+        controller.record(3.0)
+        assert controller.should_pause() is True
+
+        clock.now = 5.0
+        controller.record(0.1)
+        assert controller.should_pause() is True  # Mean latency is between the water marks
+
+        clock.now = 11.0  # First sample expired
+        assert controller.should_pause() is False
+        assert controller.pause_count == 1
+        assert controller.paused_seconds == 11.0
+
+    def test_pause_when_work_queue_is_too_deep(self, controller: BackpressureController) -> None:
+        controller.record_queue_depth(101)
+        assert controller.should_pause() is True
+
+        controller.record_queue_depth(50)
+        assert controller.should_pause() is True
+
+        controller.record_queue_depth(5)
+        assert controller.should_pause() is False
+
+    def test_resume_once_samples_expire_while_paused(
+        self,
+        controller: BackpressureController,
+        clock: FakeClock,
+    ) -> None:
+        controller.record(0.1, rejected=True)
+        assert controller.should_pause() is True
+
+        clock.now = 10.5
+        assert controller.should_pause() is False
+
+
+class TestConsumerBackpressure:
+    def test_when_elasticsearch_rejects_then_rewind_pause_and_retry_after_resume(
+        self,
+        controller: BackpressureController,
+        clock: FakeClock,
+        mocker: MockFixture,
+    ) -> None:
+        broker = InMemoryBroker()
+        broker.append(TOPIC, value=CREATE_EVENT)
+        client = InMemoryConsumer(broker)
+        client.subscribe([TOPIC])
+        handler = mocker.MagicMock()
+        handler.return_value.has_pending = False
+        handler.return_value.pending_count = 0
+        handler.return_value.flush.return_value = 0
+        handler.return_value.side_effect = [too_many_requests(), None]
+        consumer = Consumer(
+            client=client,
+            parser=parse_debezium_message,
+            router={Category: handler},
+            backpressure=controller,
+        )
+
+        consumer.consume()  # Rejected: message rewound, not committed
+        assert consumer.stats["rejected"] == 1
+        assert (TOPIC, 0) not in broker.committed
+
+        consumer.consume()  # Paused: nothing is fetched
+        assert controller.paused is True
+        assert handler.return_value.call_count == 1
+
+        clock.now = 11.0
+        consumer.consume()  # Resumed: the same message is processed again
+
+        assert handler.return_value.call_count == 2
+        assert broker.committed[(TOPIC, 0)] == 1
+        assert controller.paused_seconds == 11.0
+
+    def test_when_a_buffered_batch_is_rejected_then_keep_it_without_redelivery_and_pause(
+        self,
+        clock: FakeClock,
+    ) -> None:
+        broker = InMemoryBroker()
+        for video_id in VIDEO_IDS:
+            broker.append(VIDEOS_TOPIC, value=video_snapshot_event(video_id))
+        client = InMemoryConsumer(broker)
+        client.subscribe([VIDEOS_TOPIC])
+        save_use_case = create_autospec(SaveVideo)
+        save_use_case.execute_many.side_effect = [too_many_requests(), 0]
+        handler = VideoEventHandler(save_use_case=save_use_case)
+        handler.BACKFILL_BATCH_SIZE = 2
+        controller = BackpressureController(
+            rejection_rate_high=1.0,  # Only the queue of the rejected batch pauses
+            queue_high=handler.BACKFILL_BATCH_SIZE - 1,
+            queue_low=handler.BACKFILL_BATCH_SIZE // 2,
+            clock=clock,
+        )
+        consumer = Consumer(
+            client=client,
+            parser=parse_debezium_message,
+            router={Video: lambda: handler},
+            backpressure=controller,
+        )
+
+        consumer.consume()
+        consumer.consume()  # Completes the batch, rejected: the event stays buffered, not rewound
+        assert consumer.stats["rejected"] == 1
+        assert handler.pending_count == 2
+        assert (VIDEOS_TOPIC, 0) not in broker.committed
+
+        consumer.consume()  # Paused: the idle flush writes the kept batch
+        assert controller.paused is True
+        assert handler.pending_count == 0
+        assert broker.committed[(VIDEOS_TOPIC, 0)] == 2
+
+        clock.now = 11.0
+        consumer.consume()  # Resumed: the next message is the third one, none is delivered again
+        assert controller.paused is False
+        assert handler.pending_count == 1
+        [rejected_batch, written_batch] = save_use_case.execute_many.call_args_list
+        assert [str(input.id) for input in rejected_batch.kwargs["inputs"]] == VIDEO_IDS[:2]
+        assert written_batch == rejected_batch
\ No newline at end of file
@@ -0,0 +1,117 @@
+import json
+from datetime import datetime, timezone
+from uuid import UUID, uuid4
+
+import pytest
+
+from src.domain.category import Category
+from src.domain.genre import Genre
+from src.domain.video import Video
+from src.infra.elasticsearch.entity_cache import EntityCache
+from src.infra.kafka.cache_invalidator import CacheInvalidator, topics
+from src.infra.kafka.in_memory_broker import InMemoryBroker, InMemoryConsumer, InMemoryProducer
+
+
+def debezium_message(table: str, after: dict, op: str = "u") -> bytes:
+    return json.dumps({"payload": {"op": op, "before": after, "after": after, "source": {"table": table}}}).encode()
+
+
+class SpyCache(EntityCache):
+    def __init__(self, name: str) -> None:
+        super().__init__(name)
+        self.invalidated: list[UUID] = []
+        self.versions: list[datetime | None] = []
+
+    def invalidate(self, id: UUID, updated_at: datetime | None = None) -> None:
+        self.invalidated.append(id)
+        self.versions.append(updated_at)
+
+
+@pytest.fixture
+def broker() -> InMemoryBroker:
+    return InMemoryBroker()
+
+
+@pytest.fixture
+def caches() -> dict:
+    return {Category: SpyCache("category"), Genre: SpyCache("genre"), Video: SpyCache("video")}
+
+
+@pytest.fixture
+def client(broker) -> InMemoryConsumer:
+    for topic in topics:
+        broker.create_topic(topic)
+    return InMemoryConsumer(broker)
+
+
+@pytest.fixture
+def invalidator(client, caches) -> CacheInvalidator:
+    invalidator = CacheInvalidator(client, caches)
+    invalidator.assign()
+    return invalidator
+
+
+class TestCacheInvalidator:
+    def test_assign_every_partition_from_the_end_without_a_group(self, broker, caches):
+        broker.create_topic("catalog-db.codeflix.categories", partitions=2)
+        InMemoryProducer(broker).produce("catalog-db.codeflix.categories", value=debezium_message("categories", {"id": str(uuid4())}))
+        client = InMemoryConsumer(broker)
+
+        CacheInvalidator(client, caches).assign()
+
+        assert ("catalog-db.codeflix.categories", 1) in {(tp.topic, tp.partition) for tp in client.assignment()}
+        assert client.poll() is None  # Changes made before the process started are not read
+        assert broker.committed == {}
+
+    def test_invalidate_changed_entity(self, broker, invalidator, caches):
+        id = uuid4()
+        InMemoryProducer(broker).produce("catalog-db.codeflix.categories", value=debezium_message("categories", {"id": str(id)}))
+
+        assert invalidator.poll(timeout=0)
+
+        assert caches[Category].invalidated == [id]
+
+    def test_pass_the_version_of_the_change(self, broker, invalidator, caches):
+        row = {"id": str(uuid4()), "updated_at": "2024-12-13T20:46:20Z"}
+        InMemoryProducer(broker).produce("catalog-db.codeflix.categories", value=debezium_message("categories", row))
+
+        invalidator.poll(timeout=0)
+
+        assert caches[Category].versions == [datetime(2024, 12, 13, 20, 46, 20, tzinfo=timezone.utc)]
+
+    def test_changes_of_relations_have_no_version(self, broker, invalidator, caches):
+        row = {"id": str(uuid4()), "genre_id": str(uuid4()), "updated_at": "2024-12-13T20:46:20Z"}
+        InMemoryProducer(broker).produce("catalog-db.codeflix.genre_categories", value=debezium_message("genre_categories", row))
+
+        invalidator.poll(timeout=0)
+
+        assert caches[Genre].versions == [None]
+
+    def test_invalidate_video_of_changed_relation(self, broker, invalidator, caches):
+        video_id = uuid4()
+        row = {"id": str(uuid4()), "video_id": str(video_id), "genre_id": str(uuid4())}
+        InMemoryProducer(broker).produce("catalog-db.codeflix.video_genres", value=debezium_message("video_genres", row, op="d"))
+
+        invalidator.poll(timeout=0)
+
+        assert caches[Video].invalidated == [video_id]
+        assert caches[Genre].invalidated == []
+
+    def test_invalidate_genre_of_changed_category_link(self, broker, invalidator, caches):
+        genre_id = uuid4()
+        row = {"id": str(uuid4()), "genre_id": str(genre_id), "category_id": str(uuid4())}
+        InMemoryProducer(broker).produce("catalog-db.codeflix.genre_categories", value=debezium_message("genre_categories", row))
+
+        invalidator.poll(timeout=0)
+
+        assert caches[Genre].invalidated == [genre_id]
+
+    def test_ignore_unparseable_message(self, broker, invalidator, caches):
+        InMemoryProducer(broker).produce("catalog-db.codeflix.categories", value=b"not json")
+
+        assert invalidator.poll(timeout=0)
+
+        assert caches[Category].invalidated == []
+
+    def test_nothing_to_apply(self, invalidator):
+        assert not invalidator.poll(timeout=0)
\ No newline at end of file
@@ -4,7 +4,8 @@ import pytest
 from pytest_mock import MockFixture
 from confluent_kafka import KafkaException, Consumer as KafkaConsumer, Message
 
-from src.domain.category.category import Category
+from src.domain.category import Category
+from src.domain.repository import StaleEntityError
 from src.infra.kafka.consumer import Consumer
 
 # from src.infra.kafka.abstract_kafka_client import AbstractKafkaClient
@@ -48,6 +49,15 @@ def message_with_create_data() -> Message:
     return message
 
 
+@pytest.fixture
+def mock_handler(mocker: MockFixture) -> MagicMock:
+    handler = mocker.MagicMock()
+    handler.return_value.has_pending = False
+    handler.return_value.pending_count = 0
+    handler.return_value.flush.return_value = 0
+    return handler
+
+
 @pytest.fixture
 def consumer_logger(mocker: MockFixture) -> MagicMock:
     return mocker.patch("src.infra.kafka.consumer.logger")
@@ -93,25 +103,100 @@ class TestConsume:
         consumer.client.poll.return_value = message_with_invalid_data
 
         assert consumer.consume() is None
-        consumer_logger.info.assert_called_once_with("Received message with data: b'not a json data'")
-        consumer_logger.error.assert_called_once_with("Failed to parse message data: b'not a json data'")
+        consumer_logger.info.assert_called_once()
+        message, data = consumer_logger.error.call_args.args
+        assert message % data == "Failed to parse message data: not a json data"
 
     def test_when_message_data_is_valid_then_parse_and_call_handler(
         self,
         consumer: Consumer,
         message_with_create_data: Message,
-        mocker: MockFixture,
+        mock_handler: MagicMock,
+    ) -> None:
+        consumer.client.poll.return_value = message_with_create_data
+        consumer.router = {Category: mock_handler}
+
+        consumer.consume()
+
+        mock_handler.return_value.assert_called_once()
+
+        consumer.client.commit.assert_called_once_with(message=message_with_create_data)
+
+    def test_when_handler_buffers_event_then_commit_only_after_flush(
+        self,
+        consumer: Consumer,
+        message_with_create_data: Message,
+        mock_handler: MagicMock,
     ) -> None:
         consumer.client.poll.return_value = message_with_create_data
-        mock_handler = mocker.MagicMock()
+        mock_handler.return_value.has_pending = True
+        mock_handler.return_value.pending_count = 1
         consumer.router = {Category: mock_handler}
 
         consumer.consume()
+        consumer.client.commit.assert_not_called()
+
+        consumer.client.poll.return_value = None
+        consumer.consume()
+
+        mock_handler.return_value.on_idle.assert_called_once()
+        mock_handler.return_value.flush.assert_called_once()
+        consumer.client.commit.assert_called_once_with(message=message_with_create_data)
+
+    def test_when_event_is_stale_then_count_as_skipped_and_commit(
+        self,
+        consumer: Consumer,
+        message_with_create_data: Message,
+        mock_handler: MagicMock,
+    ) -> None:
+        consumer.client.poll.return_value = message_with_create_data
+        mock_handler.return_value.side_effect = StaleEntityError("stale")
+        consumer.router = {Category: mock_handler}
 
-        mock_handler.assert_called_once()
+        consumer.consume()
 
+        assert consumer.stats["skipped"] == 1
+        assert consumer.stats["processed"] == 0
         consumer.client.commit.assert_called_once_with(message=message_with_create_data)
 
+    def test_handler_is_instantiated_once_per_entity(
+        self,
+        consumer: Consumer,
+        message_with_create_data: Message,
+        mock_handler: MagicMock,
+    ) -> None:
+        consumer.client.poll.return_value = message_with_create_data
+        consumer.router = {Category: mock_handler}
+
+        consumer.consume()
+        consumer.consume()
+
+        mock_handler.assert_called_once_with()
+        assert mock_handler.return_value.call_count == 2
+
+    def test_log_one_summary_line_per_interval_instead_of_one_per_message(
+        self,
+        consumer: Consumer,
+        message_with_create_data: Message,
+        mock_handler: MagicMock,
+        consumer_logger: MagicMock,
+    ) -> None:
+        consumer.client.poll.return_value = message_with_create_data
+        consumer.router = {Category: mock_handler}
+        consumer.consume()
+        consumer.consume()
+
+        consumer_logger.reset_mock()
+        consumer._summary_started -= 10
+        consumer._log_summary(interval=10)
+        consumer._log_summary(interval=10)
+
+        consumer_logger.info.assert_called_once()
+        message, *args = consumer_logger.info.call_args.args
+        assert message.startswith("Consumed %d messages")
+        assert args[0] == 2
+        assert args[-1] == "processed=2"
+
 
 class TestStart:
     def test_consume_message_until_keyboard_interruption(
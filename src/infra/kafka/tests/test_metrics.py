@@ -0,0 +1,60 @@
+import json
+
+from confluent_kafka import OFFSET_INVALID, TopicPartition
+from prometheus_client import REGISTRY
+from pytest_mock import MockFixture
+
+from src.domain.category import Category
+from src.infra.kafka.consumer import Consumer
+from src.infra.kafka.in_memory_broker import InMemoryBroker, InMemoryConsumer
+from src.infra.kafka.parser import parse_debezium_message
+
+TOPIC = "catalog-db.codeflix.metrics-test"
+CREATE_EVENT = json.dumps({
+    "payload": {
+        "source": {"table": "categories"},
+        "op": "c",
+        "after": {"id": "d5889ed5-3d3f-11ef-baf5-0242ac130006", "name": "Category 1"},
+    }
+}).encode()
+
+
+def sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_consumer_exposes_throughput_stage_latency_and_lag(mocker: MockFixture) -> None:
+    broker = InMemoryBroker()
+    for _ in range(3):
+        broker.append(TOPIC, value=CREATE_EVENT)
+    client = InMemoryConsumer(broker)
+    client.subscribe([TOPIC])
+    handler = mocker.MagicMock()
+    handler.return_value.has_pending = False
+    handler.return_value.pending_count = 0
+    handler.return_value.flush.return_value = 0
+    consumer = Consumer(client=client, parser=parse_debezium_message, router={Category: handler})
+    parsed_before = sample("consumer_stage_seconds_count", stage="parse")
+
+    consumer.consume()
+    consumer.consume()
+    consumer._next_metrics_report = 0  # Report right away instead of waiting for the next interval
+    consumer._report_metrics()
+
+    assert sample("consumer_messages_total", topic=TOPIC, entity="Category", outcome="processed") == 2
+    assert sample("consumer_stage_seconds_count", stage="parse") == parsed_before + 2
+    assert sample("consumer_partition_lag", topic=TOPIC, partition="0") == 1
+
+
+def test_consumer_reads_lag_from_cached_watermarks(mocker: MockFixture) -> None:
+    client = mocker.MagicMock()
+    known, unknown = TopicPartition(TOPIC, 1, 40), TopicPartition(TOPIC, 2, OFFSET_INVALID)
+    client.position.return_value = [known, unknown]
+    client.get_watermark_offsets.side_effect = [(0, 50), (OFFSET_INVALID, OFFSET_INVALID)]
+    consumer = Consumer(client=client, parser=parse_debezium_message, router={})
+
+    consumer._report_metrics()
+
+    assert sample("consumer_partition_lag", topic=TOPIC, partition="1") == 10
+    assert REGISTRY.get_sample_value("consumer_partition_lag", {"topic": TOPIC, "partition": "2"}) is None
+    client.get_watermark_offsets.assert_called_with(unknown, cached=True)
\ No newline at end of file
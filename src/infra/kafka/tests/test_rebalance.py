@@ -0,0 +1,128 @@
+import json
+import signal
+import time
+from typing import Iterator
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.domain.category import Category
+from src.infra.kafka.consumer import Consumer
+from src.infra.kafka.in_memory_broker import InMemoryBroker, InMemoryConsumer
+from src.infra.kafka.parser import parse_debezium_message
+
+TOPIC = "catalog-db.codeflix.categories"
+SNAPSHOT_EVENT = json.dumps({
+    "payload": {
+        "source": {"table": "categories", "snapshot": "true"},
+        "op": "r",
+        "after": {"id": "d5889ed5-3d3f-11ef-baf5-0242ac130006", "name": "Category 1"},
+    }
+}).encode()
+
+
+class BufferingHandler:
+    def __init__(self, flush_delay: float = 0.0) -> None:
+        self.buffer = []
+        self.saved = []
+        self.flush_delay = flush_delay
+
+    @property
+    def pending_count(self) -> int:
+        return len(self.buffer)
+
+    @property
+    def has_pending(self) -> bool:
+        return bool(self.buffer)
+
+    def __call__(self, event) -> None:
+        self.buffer.append(event)
+
+    def flush(self) -> int:
+        time.sleep(self.flush_delay)
+        self.saved += self.buffer
+        self.buffer = []
+        return 0
+
+
+@pytest.fixture
+def broker() -> InMemoryBroker:
+    broker = InMemoryBroker()
+    broker.append(TOPIC, value=SNAPSHOT_EVENT)
+    broker.append(TOPIC, value=SNAPSHOT_EVENT)
+    return broker
+
+
+@pytest.fixture
+def sigterm_handler() -> Iterator[None]:
+    previous = signal.getsignal(signal.SIGTERM)
+    yield
+    signal.signal(signal.SIGTERM, previous)
+
+
+def make_consumer(broker: InMemoryBroker, handler: BufferingHandler, drain_timeout: float = 1.0) -> Consumer:
+    consumer = Consumer(
+        client=InMemoryConsumer(broker),
+        parser=parse_debezium_message,
+        router={Category: lambda: handler},
+        drain_timeout=drain_timeout,
+    )
+    consumer.subscribe([TOPIC])
+    return consumer
+
+
+class TestRevoke:
+    def test_drain_buffered_events_and_commit_revoked_partitions(self, broker: InMemoryBroker) -> None:
+        handler = BufferingHandler()
+        consumer = make_consumer(broker, handler)
+        consumer.consume()
+        consumer.consume()
+        assert (TOPIC, 0) not in broker.committed
+
+        consumer.client.revoke()
+
+        assert len(handler.saved) == 2
+        assert broker.committed[(TOPIC, 0)] == 2
+
+    def test_when_drain_times_out_then_do_not_commit(self, broker: InMemoryBroker) -> None:
+        handler = BufferingHandler(flush_delay=0.2)
+        consumer = make_consumer(broker, handler, drain_timeout=0.01)
+        consumer.consume()
+
+        consumer.client.revoke()
+
+        assert (TOPIC, 0) not in broker.committed
+
+
+class TestShutdown:
+    def test_sigterm_stops_consumer_after_draining_and_committing(
+        self,
+        broker: InMemoryBroker,
+        sigterm_handler: None,
+    ) -> None:
+        handler = BufferingHandler()
+        consumer = make_consumer(broker, handler)
+        consume = consumer.consume
+
+        def consume_then_terminate() -> None:
+            consume()
+            signal.raise_signal(signal.SIGTERM)
+
+        consumer.consume = MagicMock(side_effect=consume_then_terminate)
+
+        consumer.start()
+
+        assert consumer.consume.call_count == 1
+        assert len(handler.saved) == 1
+        assert broker.committed[(TOPIC, 0)] == 1
+        assert consumer.client.closed is True
+
+    def test_when_drain_times_out_then_close_without_committing(self, broker: InMemoryBroker) -> None:
+        handler = BufferingHandler(flush_delay=0.2)
+        consumer = make_consumer(broker, handler, drain_timeout=0.01)
+        consumer.consume()
+
+        consumer.stop()
+
+        assert (TOPIC, 0) not in broker.committed
+        assert consumer.client.closed is True
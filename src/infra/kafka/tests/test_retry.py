@@ -0,0 +1,224 @@
+import json
+import uuid
+from unittest.mock import MagicMock, create_autospec
+
+import pytest
+from pytest_mock import MockFixture
+
+from src.application.save_video import SaveVideo
+from src.domain.category import Category
+from src.domain.video import Video
+from src.infra.kafka.consumer import Consumer
+from src.infra.kafka.in_memory_broker import InMemoryBroker, InMemoryConsumer, InMemoryProducer
+from src.infra.kafka.parser import parse_debezium_message
+from src.infra.kafka.video_event_handler import VideoEventHandler
+from src.infra.kafka.retry import (
+    ATTEMPT_HEADER,
+    EXCEPTION_HEADER,
+    EXCEPTION_MESSAGE_HEADER,
+    ORIGINAL_OFFSET_HEADER,
+    ORIGINAL_TOPIC_HEADER,
+    RetryPolicy,
+    RetryPublisher,
+)
+
+TOPIC = "catalog-db.codeflix.categories"
+CREATE_EVENT = json.dumps({
+    "payload": {
+        "source": {"table": "categories"},
+        "op": "c",
+        "after": {"id": "d5889ed5-3d3f-11ef-baf5-0242ac130006", "name": "Category 1"},
+    }
+}).encode()
+
+
+
+def snapshot_event(title: str, video_id: str = "9f8e6f2b-b277-4253-b959-6786b32aeb18") -> bytes:
+    return json.dumps({
+        "payload": {
+            "source": {"table": "videos", "snapshot": "true"},
+            "op": "r",
+            "after": {
+                "id": video_id,
+                "title": title,
+                "launch_year": 1972,
+                "rating": "AGE_18",
+                "created_at": "2024-12-13T20:46:20Z",
+                "updated_at": "2024-12-13T20:46:20Z",
+                "is_active": True,
+            },
+        }
+    }).encode()
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def broker() -> InMemoryBroker:
+    return InMemoryBroker()
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+@pytest.fixture
+def retry(broker: InMemoryBroker, clock: FakeClock) -> RetryPublisher:
+    return RetryPublisher(
+        producer=InMemoryProducer(broker),
+        policy=RetryPolicy(max_attempts=2, base_delay=10, multiplier=3),
+        clock=clock,
+    )
+
+
+@pytest.fixture
+def handler(mocker: MockFixture) -> MagicMock:
+    handler = mocker.MagicMock()
+    handler.return_value.has_pending = False
+    handler.return_value.flush.return_value = 0
+    return handler
+
+
+@pytest.fixture
+def consumer(broker: InMemoryBroker, retry: RetryPublisher, handler: MagicMock) -> Consumer:
+    client = InMemoryConsumer(broker)
+    client.subscribe([TOPIC, *retry.policy.retry_topics(TOPIC)])
+    return Consumer(client=client, parser=parse_debezium_message, router={Category: handler}, retry=retry)
+
+
+def headers(message) -> dict[str, bytes]:
+    return dict(message.headers())
+
+
+class TestRetryPolicy:
+    def test_delay_grows_exponentially(self) -> None:
+        policy = RetryPolicy(max_attempts=3, base_delay=5, multiplier=6)
+
+        assert [policy.delay(attempt) for attempt in (1, 2, 3)] == [5, 30, 180]
+
+
+class TestRetryPublisher:
+    def test_failed_message_goes_to_next_retry_tier_keeping_original_headers(
+        self,
+        broker: InMemoryBroker,
+        retry: RetryPublisher,
+    ) -> None:
+        message = broker.append(TOPIC, value=b"data", key=b"key", headers=[("trace-id", b"abc")])
+
+        retry.retry(message, RuntimeError("ES unavailable"))
+
+        [retried] = broker.messages(f"{TOPIC}.retry.1")
+        assert retried.value() == b"data"
+        assert retried.key() == b"key"
+        assert headers(retried)["trace-id"] == b"abc"
+        assert headers(retried)[ORIGINAL_TOPIC_HEADER] == TOPIC.encode()
+        assert headers(retried)[ORIGINAL_OFFSET_HEADER] == b"0"
+        assert headers(retried)[ATTEMPT_HEADER] == b"1"
+        assert headers(retried)[EXCEPTION_HEADER] == b"RuntimeError"
+        assert retry.delay_remaining(retried) == 10
+
+    def test_when_retries_are_exhausted_then_send_to_dead_letter_topic(
+        self,
+        broker: InMemoryBroker,
+        retry: RetryPublisher,
+    ) -> None:
+        message = broker.append(TOPIC, value=b"data")
+
+        retry.retry(message, RuntimeError("first"))
+        retry.retry(broker.messages(f"{TOPIC}.retry.1")[0], RuntimeError("second"))
+        retry.retry(broker.messages(f"{TOPIC}.retry.2")[0], RuntimeError("third"))
+
+        [dead] = broker.messages(f"{TOPIC}.dlq")
+        assert headers(dead)[ORIGINAL_TOPIC_HEADER] == TOPIC.encode()
+        assert headers(dead)[ATTEMPT_HEADER] == b"2"
+        assert headers(dead)[EXCEPTION_MESSAGE_HEADER] == b"third"
+
+
+class TestConsumerWithRetry:
+    def test_when_handler_fails_then_publish_retry_commit_and_keep_consuming(
+        self,
+        broker: InMemoryBroker,
+        consumer: Consumer,
+        handler: MagicMock,
+    ) -> None:
+        broker.append(TOPIC, value=CREATE_EVENT)
+        broker.append(TOPIC, value=CREATE_EVENT)
+        handler.return_value.side_effect = [RuntimeError("ES unavailable"), None]
+
+        for _ in range(3):  # The retried copy is not due yet and must not block the next message
+            consumer.consume()
+
+        assert len(broker.messages(f"{TOPIC}.retry.1")) == 1
+        assert broker.committed[(TOPIC, 0)] == 2
+        assert consumer.stats["retried"] == 1
+
+    def test_when_message_cannot_be_parsed_then_send_to_dead_letter_topic(
+        self,
+        broker: InMemoryBroker,
+        consumer: Consumer,
+    ) -> None:
+        broker.append(TOPIC, value=b"not a json data")
+
+        consumer.consume()
+
+        [dead] = broker.messages(f"{TOPIC}.dlq")
+        assert dead.value() == b"not a json data"
+        assert broker.committed[(TOPIC, 0)] == 1
+
+    def test_retried_message_is_only_processed_once_due(
+        self,
+        broker: InMemoryBroker,
+        consumer: Consumer,
+        handler: MagicMock,
+        clock: FakeClock,
+        mocker: MockFixture,
+    ) -> None:
+        broker.append(TOPIC, value=CREATE_EVENT)
+        handler.return_value.side_effect = [RuntimeError("ES unavailable"), None]
+        monotonic = mocker.patch("src.infra.kafka.consumer.time.monotonic", return_value=0.0)
+
+        consumer.consume()  # Fails and goes to retry.1
+        consumer.consume()  # Retry not due yet: partition paused and rewound
+        assert handler.return_value.call_count == 1
+        assert consumer.consume() is None
+
+        clock.now += 10
+        monotonic.return_value = 10.0
+        consumer.consume()
+
+        assert handler.return_value.call_count == 2
+        assert broker.committed[(f"{TOPIC}.retry.1", 0)] == 1
+
+
+    def test_when_a_buffered_batch_fails_then_retry_only_its_failing_events(
+        self,
+        broker: InMemoryBroker,
+        retry: RetryPublisher,
+    ) -> None:
+        videos = "catalog-db.codeflix.videos"
+        save_use_case = create_autospec(SaveVideo)
+        save_use_case.execute_many.side_effect = LookupError("Video deleted upstream")
+        save_use_case.execute.side_effect = [LookupError("Video deleted upstream"), None]
+        handler = VideoEventHandler(save_use_case=save_use_case)
+        handler.BACKFILL_BATCH_SIZE = 2
+        client = InMemoryConsumer(broker)
+        client.subscribe([videos])
+        consumer = Consumer(client=client, parser=parse_debezium_message, router={Video: lambda: handler}, retry=retry)
+        for title in ["Deleted", "Kept"]:
+            broker.append(videos, value=snapshot_event(title, video_id=str(uuid.uuid4())))
+
+        consumer.consume()
+        consumer.consume()
+
+        [retried] = broker.messages(f"{videos}.retry.1")
+        assert json.loads(retried.value())["payload"]["after"]["title"] == "Deleted"
+        assert handler.has_pending is False
+        assert broker.committed[(videos, 0)] == 2
+        assert consumer.stats["retried"] == 1
\ No newline at end of file
@@ -0,0 +1,123 @@
+import pytest
+
+from src.infra.kafka.supervisor import Supervisor, worker_count
+
+
+class FakeProcess:
+    def __init__(self, target, args, name) -> None:
+        self.args = args
+        self.name = name
+        self.pid = None
+        self.exitcode = None
+        self.alive = False
+        self.terminated = False
+
+    def start(self) -> None:
+        self.alive = True
+
+    def is_alive(self) -> bool:
+        return self.alive
+
+    def crash(self) -> None:
+        self.alive = False
+        self.exitcode = 1
+
+    def terminate(self) -> None:
+        self.terminated = True
+        self.alive = False
+
+    def join(self, timeout: float | None = None) -> None:
+        pass
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+@pytest.fixture
+def processes() -> list[FakeProcess]:
+    return []
+
+
+@pytest.fixture
+def supervisor(clock: FakeClock, processes: list[FakeProcess]) -> Supervisor:
+    def factory(**kwargs) -> FakeProcess:
+        processes.append(FakeProcess(**kwargs))
+        return processes[-1]
+
+    return Supervisor(workers=2, process_factory=factory, restart_delay=1, max_restart_delay=4, clock=clock)
+
+
+class TestWorkerCount:
+    def test_one_worker_per_partition_up_to_the_number_of_cores(self) -> None:
+        assert worker_count(partitions=3, cores=8, configured=0) == 3
+        assert worker_count(partitions=12, cores=8, configured=0) == 8
+
+    def test_at_least_one_worker_when_topics_do_not_exist_yet(self) -> None:
+        assert worker_count(partitions=0, cores=8, configured=0) == 1
+
+    def test_configured_count_wins(self) -> None:
+        assert worker_count(partitions=3, cores=8, configured=5) == 5
+
+
+class TestSupervisor:
+    def test_start_one_process_per_worker(self, supervisor: Supervisor, processes: list[FakeProcess]) -> None:
+        supervisor.check()
+
+        assert [process.args for process in processes] == [(0,), (1,)]
+        assert all(process.is_alive() for process in processes)
+
+    def test_restart_crashed_worker_with_exponential_backoff(
+        self,
+        supervisor: Supervisor,
+        clock: FakeClock,
+    ) -> None:
+        supervisor.check()
+        delays = []
+        for _ in range(4):
+            crashed = supervisor._processes[0]
+            crashed.crash()
+            crashed_at = clock.now
+            while supervisor._processes[0] is crashed:
+                supervisor.check()
+                clock.now += 0.5
+            delays.append(clock.now - 0.5 - crashed_at)
+
+        assert delays == [1, 2, 4, 4]
+        assert supervisor.restarts == 4
+
+    def test_worker_that_ran_long_enough_is_restarted_without_backoff(
+        self,
+        supervisor: Supervisor,
+        clock: FakeClock,
+    ) -> None:
+        supervisor.check()
+        for _ in range(3):
+            supervisor._processes[0].crash()
+            supervisor.check()
+            clock.now += 10
+            supervisor.check()
+
+        clock.now += supervisor.stable_after
+        supervisor._processes[0].crash()
+        supervisor.check()
+        clock.now += 1
+        supervisor.check()
+
+        assert supervisor.restarts == 4
+
+    def test_stop_terminates_running_workers(self, supervisor: Supervisor, processes: list[FakeProcess]) -> None:
+        supervisor.check()
+
+        supervisor.stop()
+
+        assert all(process.terminated for process in processes)
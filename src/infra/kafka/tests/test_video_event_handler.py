@@ -0,0 +1,210 @@
+import uuid
+from unittest.mock import MagicMock, create_autospec
+
+import pytest
+from elasticsearch import ApiError
+
+from src.application.save_video import SaveVideo, SaveVideoInput
+from src.domain.video import Rating, Video
+from src.infra.codeflix_client.cdc_state_store import CdcVideoStateStore
+from src.infra.kafka.abstract_event_handler import BufferedEventsError
+from src.infra.kafka.operation import Operation
+from src.infra.kafka.parser import ParsedEvent
+from src.infra.kafka.video_event_handler import VideoEventHandler
+
+
+def make_event(operation: Operation, snapshot: str = "false") -> ParsedEvent:
+    return ParsedEvent(
+        entity=Video,
+        operation=operation,
+        payload={
+            "id": str(uuid.uuid4()),
+            "title": "The Godfather",
+            "launch_year": 1972,
+            "rating": "AGE_18",
+            "created_at": "2024-12-13T20:46:20Z",
+            "updated_at": "2024-12-13T20:46:20Z",
+            "is_active": True,
+        },
+        source={"table": "videos", "snapshot": snapshot},
+    )
+
+
+@pytest.fixture
+def save_use_case() -> SaveVideo:
+    return create_autospec(SaveVideo)
+
+
+class TestHandleCreated:
+    def test_call_save_video_use_case(self, save_use_case: SaveVideo) -> None:
+        event = make_event(Operation.CREATE)
+        handler = VideoEventHandler(save_use_case=save_use_case)
+
+        handler(event)
+
+        save_use_case.execute.assert_called_once_with(
+            input=SaveVideoInput(
+                id=event.payload["id"],
+                title="The Godfather",
+                launch_year=1972,
+                rating=Rating.AGE_18,
+                created_at="2024-12-13T20:46:20Z",
+                updated_at="2024-12-13T20:46:20Z",
+                is_active=True,
+            )
+        )
+        assert handler.has_pending is False
+
+
+class TestHandleSnapshot:
+    def test_first_snapshot_event_starts_backfill_and_buffers_event(self, save_use_case: SaveVideo) -> None:
+        handler = VideoEventHandler(save_use_case=save_use_case)
+
+        handler(make_event(Operation.READ, snapshot="first"))
+        handler(make_event(Operation.READ, snapshot="true"))
+
+        save_use_case.start_backfill.assert_called_once()
+        save_use_case.execute_many.assert_not_called()
+        save_use_case.execute.assert_not_called()
+        assert handler.has_pending is True
+
+    def test_buffer_is_bulk_saved_when_batch_is_full(self, save_use_case: SaveVideo) -> None:
+        handler = VideoEventHandler(save_use_case=save_use_case)
+        handler.BACKFILL_BATCH_SIZE = 2
+
+        handler(make_event(Operation.READ, snapshot="first"))
+        handler(make_event(Operation.READ, snapshot="true"))
+
+        save_use_case.execute_many.assert_called_once()
+        assert len(save_use_case.execute_many.call_args.kwargs["inputs"]) == 2
+        assert handler.has_pending is False
+
+    def test_last_snapshot_event_flushes_and_finishes_backfill(self, save_use_case: SaveVideo) -> None:
+        handler = VideoEventHandler(save_use_case=save_use_case)
+
+        handler(make_event(Operation.READ, snapshot="first"))
+        handler(make_event(Operation.READ, snapshot="last"))
+
+        save_use_case.execute_many.assert_called_once()
+        assert len(save_use_case.execute_many.call_args.kwargs["inputs"]) == 2
+        save_use_case.finish_backfill.assert_called_once()
+        assert handler.has_pending is False
+
+    def test_streamed_event_after_snapshot_finishes_pending_backfill(self, save_use_case: SaveVideo) -> None:
+        handler = VideoEventHandler(save_use_case=save_use_case)
+
+        handler(make_event(Operation.READ, snapshot="first"))
+        handler(make_event(Operation.UPDATE))
+
+        save_use_case.execute_many.assert_called_once()
+        save_use_case.finish_backfill.assert_called_once()
+        save_use_case.execute.assert_called_once()
+
+    def test_idle_consumer_finishes_pending_backfill(self, save_use_case: SaveVideo) -> None:
+        handler = VideoEventHandler(save_use_case=save_use_case)
+
+        handler(make_event(Operation.READ, snapshot="true"))
+        handler.on_idle()
+
+        save_use_case.execute_many.assert_called_once()
+        save_use_case.finish_backfill.assert_called_once()
+        assert handler.has_pending is False
+
+    def test_idle_without_backfill_does_nothing(self, save_use_case: SaveVideo) -> None:
+        VideoEventHandler(save_use_case=save_use_case).on_idle()
+
+        save_use_case.finish_backfill.assert_not_called()
+
+
+class TestJoinRelationsFromStateStore:
+    @pytest.fixture
+    def handler(self, save_use_case: SaveVideo) -> VideoEventHandler:
+        return VideoEventHandler(save_use_case=save_use_case, state_store=CdcVideoStateStore())
+
+    @staticmethod
+    def banner_event(video_id: str) -> ParsedEvent:
+        return ParsedEvent(
+            entity=Video,
+            operation=Operation.CREATE,
+            payload={"id": str(uuid.uuid4()), "video_id": video_id, "name": "banner", "raw_location": "https://b.com/1"},
+            source={"table": "video_banners"},
+        )
+
+    def test_wait_for_banner_before_saving_video(self, handler: VideoEventHandler, save_use_case: SaveVideo) -> None:
+        event = make_event(Operation.CREATE)
+
+        handler(event)
+        save_use_case.execute.assert_not_called()
+
+        handler(self.banner_event(event.payload["id"]))
+        save_use_case.execute.assert_called_once()
+        assert save_use_case.execute.call_args.kwargs["input"].id == uuid.UUID(event.payload["id"])
+
+    def test_relation_change_saves_its_video_again(self, handler: VideoEventHandler, save_use_case: SaveVideo) -> None:
+        event = make_event(Operation.CREATE)
+        handler(self.banner_event(event.payload["id"]))
+        handler(event)
+
+        handler(ParsedEvent(
+            entity=Video,
+            operation=Operation.CREATE,
+            payload={"id": str(uuid.uuid4()), "video_id": event.payload["id"], "genre_id": str(uuid.uuid4())},
+            source={"table": "video_genres"},
+        ))
+
+        assert save_use_case.execute.call_count == 2
+
+    def test_snapshot_rows_of_relations_buffer_their_video_once(
+        self,
+        handler: VideoEventHandler,
+        save_use_case: SaveVideo,
+    ) -> None:
+        event = make_event(Operation.READ, snapshot="true")
+        handler(self.banner_event(event.payload["id"]))
+        handler(event)
+        for _ in range(3):
+            handler(ParsedEvent(
+                entity=Video,
+                operation=Operation.READ,
+                payload={"id": str(uuid.uuid4()), "video_id": event.payload["id"], "genre_id": str(uuid.uuid4())},
+                source={"table": "video_genres", "snapshot": "true"},
+            ))
+
+        assert handler.pending_count == 1
+        handler.flush()
+        [input] = save_use_case.execute_many.call_args.kwargs["inputs"]
+        assert input.id == uuid.UUID(event.payload["id"])
+
+    def test_relation_of_unknown_video_is_only_stored(self, handler: VideoEventHandler, save_use_case: SaveVideo) -> None:
+        handler(self.banner_event(str(uuid.uuid4())))
+
+        save_use_case.execute.assert_not_called()
+
+
+class TestFailedBackfillBatch:
+    def test_save_one_by_one_and_raise_only_the_failing_events(self, save_use_case: SaveVideo) -> None:
+        save_use_case.execute_many.side_effect = LookupError("Video deleted upstream")
+        save_use_case.execute.side_effect = [None, ValueError("Invalid row"), None]
+        handler = VideoEventHandler(save_use_case=save_use_case)
+        events = [make_event(Operation.READ, snapshot="true") for _ in range(3)]
+        for event in events:
+            handler(event)
+
+        with pytest.raises(BufferedEventsError) as error:
+            handler.flush()
+
+        assert [event for event, _ in error.value.failures] == [events[1]]
+        assert save_use_case.execute.call_count == 3
+        assert handler.has_pending is False
+        assert handler.flush() == 0
+
+    def test_keep_the_batch_when_elasticsearch_rejects_it(self, save_use_case: SaveVideo) -> None:
+        save_use_case.execute_many.side_effect = ApiError("rejected", meta=MagicMock(status=429), body={})
+        handler = VideoEventHandler(save_use_case=save_use_case)
+        handler(make_event(Operation.READ, snapshot="true"))
+
+        with pytest.raises(ApiError):
+            handler.flush()
+
+        save_use_case.execute.assert_not_called()
+        assert handler.pending_count == 1
\ No newline at end of file
@@ -1,24 +1,106 @@
 import logging
+from uuid import UUID
 
 from src.application.save_video import SaveVideoInput, SaveVideo
 from src.domain.video import Rating
+from src.domain.video import Video
+from src.infra.codeflix_client.cached_client import CachedCodeflixClient
+from src.infra.codeflix_client.cdc_state_store import VIDEO_STATE_STORE_PATH, VIDEOS_TABLE, CdcVideoStateStore
 from src.infra.codeflix_client.http_client import HttpClient
+from src.infra.codeflix_client.resilient_client import ResilientCodeflixClient
 from src.infra.elasticsearch.elasticsearch_video_repository import ElasticsearchVideoRepository
-from src.infra.kafka.abstract_event_handler import AbstractEventHandler
+from src.domain.repository import StaleEntityError
+from src.infra.kafka.abstract_event_handler import AbstractEventHandler, BufferedEventsError
+from src.infra.kafka.backpressure import is_rejection
+from src.infra.kafka.operation import Operation
 from src.infra.kafka.parser import ParsedEvent
+from src.infra.structured_logging import SAMPLED
 
 logger = logging.getLogger(__name__)
 
 
+# Values of `source.snapshot` that Debezium sets on the last row of a snapshot
+SNAPSHOT_LAST_MARKERS = {"last", "last_in_data_collection"}
+
+
 class VideoEventHandler(AbstractEventHandler):  # Similar to a View in Django
-    def __init__(self, save_use_case: SaveVideo | None = None):
+    BACKFILL_BATCH_SIZE = 1_000
+
+    def __init__(self, save_use_case: SaveVideo | None = None, state_store: CdcVideoStateStore | None = None):
+        """
+        :param state_store: Relations of the videos joined from their CDC streams. Without it, they are
+            fetched from the Codeflix admin API
+        """
+        if state_store is None and VIDEO_STATE_STORE_PATH:
+            state_store = CdcVideoStateStore(path=VIDEO_STATE_STORE_PATH)
+        self._state_store = state_store
         self.save_use_case = save_use_case or SaveVideo(
             repository=ElasticsearchVideoRepository(),
-            codeflix_client=HttpClient(),
+            codeflix_client=state_store or CachedCodeflixClient(ResilientCodeflixClient(HttpClient())),
         )
+        self._backfilling = False
+        # Keyed by video: the rows of its relations build the same video again, only the last one is saved
+        self._backfill_buffer: dict[UUID, tuple[SaveVideoInput, ParsedEvent]] = {}
+        self._stale_skipped = 0
 
-    def _handle_update_or_create(self, event: ParsedEvent) -> None:
-        input = SaveVideoInput(
+    @property
+    def pending_count(self) -> int:
+        return len(self._backfill_buffer)
+
+    def flush(self) -> int:
+        self._save_buffer()
+        skipped, self._stale_skipped = self._stale_skipped, 0
+        return skipped
+
+    def on_idle(self) -> None:
+        # Debezium marks a single row of a single partition as `last`: the other partitions and workers
+        # only learn that their share of the snapshot is over when nothing more comes
+        if self._backfilling:
+            logger.info("No more snapshot events, leaving backfill mode")
+            self._finish_backfill()
+
+    def _save_buffer(self) -> None:
+        if not self._backfill_buffer:
+            return
+
+        try:
+            self._stale_skipped += self.save_use_case.execute_many(
+                inputs=[input for input, _ in self._backfill_buffer.values()]
+            )
+        except Exception as e:
+            if is_rejection(e):
+                raise  # Elasticsearch is overloaded: the consumer backs off and the whole batch is kept
+            # A single bad video (deleted upstream, invalid) must not hold back the batch, nor stay buffered
+            # and fail every later flush: save the videos one by one and hand back only those that fail
+            logger.warning("Batch of %d videos failed (%r), saving them one by one", len(self._backfill_buffer), e)
+            buffer, self._backfill_buffer = list(self._backfill_buffer.values()), {}
+            failures = self._save_one_by_one(buffer)
+            if failures:
+                raise BufferedEventsError(failures) from e
+        else:
+            self._backfill_buffer = {}
+
+    def _save_one_by_one(self, buffer: list[tuple[SaveVideoInput, ParsedEvent]]) -> list[tuple[ParsedEvent, Exception]]:
+        failures = []
+        for input, event in buffer:
+            try:
+                self.save_use_case.execute(input=input)
+            except StaleEntityError:
+                self._stale_skipped += 1
+            except Exception as e:
+                failures.append((event, e))
+        return failures
+
+    def _finish_backfill(self) -> None:
+        try:
+            self._save_buffer()
+        finally:
+            self.save_use_case.finish_backfill()
+            self._backfilling = False
+
+    @staticmethod
+    def _to_input(event: ParsedEvent) -> SaveVideoInput:
+        return SaveVideoInput(
             id=event.payload["id"],
             title=event.payload["title"],
             launch_year=event.payload["launch_year"],
@@ -27,16 +109,59 @@ class VideoEventHandler(AbstractEventHandler):  # Similar to a View in Django
             updated_at=event.payload["updated_at"],
             is_active=event.payload["is_active"],
         )
-        self.save_use_case.execute(input=input)
+
+    def _handle_update_or_create(self, event: ParsedEvent) -> None:
+        if self._backfilling:
+            # Debezium only streams changes once the snapshot is over
+            self._finish_backfill()
+
+        self.save_use_case.execute(input=self._to_input(event))
+
+    def handle_snapshot(self, event: ParsedEvent) -> None:
+        if not self._backfilling:
+            logger.info("Snapshot detected, switching to backfill mode")
+            self.save_use_case.start_backfill()
+            self._backfilling = True
+
+        input = self._to_input(event)
+        self._backfill_buffer[input.id] = (input, event)
+        if len(self._backfill_buffer) >= self.BACKFILL_BATCH_SIZE:
+            self._save_buffer()
+
+        if event.source.get("snapshot") in SNAPSHOT_LAST_MARKERS:
+            logger.info("Snapshot finished, leaving backfill mode")
+            self._finish_backfill()
+
+    def __call__(self, event: ParsedEvent) -> None:
+        if self._state_store is None:
+            super().__call__(event)
+            return
+
+        self._state_store.apply(event)
+        if event.source.get("table", VIDEOS_TABLE) != VIDEOS_TABLE:
+            # A relation changed: the document of its video has to be built again
+            row = self._state_store.video_row(event.payload["video_id"])
+            if row is None:
+                return  # Built when the video row arrives
+            operation = Operation.READ if event.operation == Operation.READ else Operation.UPDATE
+            event = ParsedEvent(entity=Video, operation=operation, payload=row, source=event.source, message=event.message)
+        elif event.operation == Operation.DELETE:
+            super().__call__(event)
+            return
+
+        if not self._state_store.is_complete(event.payload["id"]):
+            logger.debug("Video %s has no banner yet, waiting for it", event.payload["id"])
+            return
+        super().__call__(event)
 
     def handle_created(self, event: ParsedEvent) -> None:
-        logger.info(f"Creating video with payload: {event.payload}")
+        logger.info("Creating video %s", event.payload["id"], extra=SAMPLED)
         self._handle_update_or_create(event)
 
     def handle_updated(self, event: ParsedEvent) -> None:
-        logger.info(f"Updating video with payload: {event.payload}")
+        logger.info("Updating video %s", event.payload["id"], extra=SAMPLED)
         self._handle_update_or_create(event)
 
     def handle_deleted(self, event: ParsedEvent) -> None:
-        print(f"Deleting video: {event.payload}")
+        logger.info("Deleting video %s", event.payload["id"], extra=SAMPLED)
         # TODO: implement delete use case
\ No newline at end of file
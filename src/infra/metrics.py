@@ -0,0 +1,142 @@
+"""
+Metrics of the CDC ingestion pipeline (Kafka consumer -> enrichment -> Elasticsearch), exposed in the
+Prometheus text format on a side port of the consumer process (`curl localhost:9100/metrics`), and of the
+listing API, served by the API itself (`curl localhost:8000/metrics`).
+
+When several consumer processes run under the supervisor, each one writes its samples to
+PROMETHEUS_MULTIPROC_DIR and the supervisor serves them aggregated. The `multiprocess_mode` of the gauges
+says how they are combined, and is ignored in a single process.
+"""
+import os
+
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, multiprocess, start_http_server
+
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9100"))
+
+MESSAGES = Counter(
+    "consumer_messages",
+    "Messages consumed, by outcome (processed, skipped, retried, dead_lettered, rejected)",
+    ["topic", "entity", "outcome"],
+)
+ERRORS = Counter(
+    "consumer_errors",
+    "Errors raised while processing or flushing messages",
+    ["stage", "error"],
+)
+STAGE_LATENCY = Histogram(
+    "consumer_stage_seconds",
+    "Latency of each ingestion stage (parse, handle, enrichment, es_write, commit)",
+    ["stage"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+BATCH_SIZE = Histogram(
+    "consumer_batch_size",
+    "Number of documents per Elasticsearch bulk write",
+    buckets=(1, 10, 50, 100, 250, 500, 1_000, 2_500, 5_000),
+)
+CACHE_REQUESTS = Counter(
+    "enrichment_cache_requests",
+    "Lookups of the enrichment cache, by tier (memory, disk) and result (hit, miss)",
+    ["tier", "result"],
+)
+HEDGED_REQUESTS = Counter(
+    "enrichment_hedged_requests",
+    "Enrichment calls that passed the latency budget and were sent a second time",
+)
+CIRCUIT_OPEN = Gauge(
+    "enrichment_circuit_open",
+    "1 while the circuit breaker of the enrichment API is open",
+    multiprocess_mode="livemax",
+)
+PARTITION_LAG = Gauge(
+    "consumer_partition_lag",
+    "Messages between the consumer position and the high watermark",
+    ["topic", "partition"],
+    # A partition has a single owner: keep what its current owner reported last
+    multiprocess_mode="livemostrecent",
+)
+QUEUE_DEPTH = Gauge(
+    "consumer_queue_depth",
+    "Events buffered by the handlers and not persisted yet",
+    multiprocess_mode="livesum",
+)
+PAUSED = Gauge(
+    "consumer_paused",
+    "1 while the consumer is paused by backpressure",
+    multiprocess_mode="livemax",
+)
+PAUSED_SECONDS = Gauge(
+    "consumer_paused_seconds",
+    "Total time spent paused by backpressure",
+    multiprocess_mode="livesum",
+)
+
+API_IN_FLIGHT = Gauge(
+    "api_requests_in_flight",
+    "Requests being served, by route",
+    ["route"],
+    multiprocess_mode="livesum",
+)
+API_CONCURRENCY_LIMIT = Gauge(
+    "api_concurrency_limit",
+    "Adaptive limit of requests in flight, by route",
+    ["route"],
+    multiprocess_mode="livesum",
+)
+API_SHED_REQUESTS = Counter(
+    "api_shed_requests",
+    "Requests rejected with a 503 because their route was at its concurrency limit",
+    ["route"],
+)
+API_STAGE_LATENCY = Histogram(
+    "api_stage_seconds",
+    "Latency of each stage of the API requests (auth, use_case, es, es_took, validate, render, total)",
+    ["stage"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+ES_QUERY_LATENCY = Histogram(
+    "api_es_query_seconds",
+    "Latency of the listing searches, by query shape (entity, sort, search, page depth)",
+    ["entity", "sort", "search", "page"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+SLOW_QUERIES = Counter(
+    "api_es_slow_queries",
+    "Listing searches slower than SLOW_QUERY_THRESHOLD, by query shape",
+    ["entity", "sort", "search", "page"],
+)
+ENTITY_CACHE_REQUESTS = Counter(
+    "api_entity_cache_requests",
+    "Entities looked up by id in the API cache, by entity and result (hit, miss, stale: loaded before their change was indexed)",
+    ["entity", "result"],
+)
+ENTITY_CACHE_INVALIDATIONS = Counter(
+    "api_entity_cache_invalidations",
+    "Cached entities dropped because a CDC event changed them",
+    ["entity"],
+)
+
+
+def registry() -> CollectorRegistry:
+    """Registry of the metrics of this process, or of every worker process under PROMETHEUS_MULTIPROC_DIR."""
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return REGISTRY
+    multiprocess_registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(multiprocess_registry)
+    return multiprocess_registry
+
+
+def start_metrics_server(port: int = METRICS_PORT) -> None:
+    start_http_server(port)
+
+
+def start_multiprocess_metrics_server(path: str, port: int = METRICS_PORT) -> None:
+    """Serve the metrics written to `path` by every worker process, aggregated."""
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry, path=path)
+    start_http_server(port, registry=registry)
+
+
+def mark_process_dead(pid: int, path: str) -> None:
+    # Drops the live gauges of a worker that exited; its counters and histograms are kept
+    multiprocess.mark_process_dead(pid, path=path)
\ No newline at end of file
@@ -0,0 +1,94 @@
+"""
+Logging setup for the ingestion hot path, where a log line per message can cost more than the work itself:
+- messages are formatted lazily (`logger.info("Saved %s", id)`), only when the record is actually emitted
+- per-event records flagged with `extra=SAMPLED` are kept with a probability of LOG_SAMPLE_RATE
+  (warnings and errors are never sampled out)
+- payloads are wrapped with `truncate()` so a multi-KB message never ends up whole in the logs
+- LOG_FORMAT=json emits one JSON object per line, with the `extra` fields of the record
+
+Configured through the environment: LOG_LEVEL, LOG_FORMAT (text|json), LOG_SAMPLE_RATE,
+LOG_MAX_FIELD_LENGTH and LOG_SUMMARY_INTERVAL (seconds between the consumer throughput summaries).
+"""
+import json
+import logging
+import os
+import random
+from typing import Any, Callable
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text")
+LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", "0.01"))
+LOG_MAX_FIELD_LENGTH = int(os.getenv("LOG_MAX_FIELD_LENGTH", "256"))
+LOG_SUMMARY_INTERVAL = float(os.getenv("LOG_SUMMARY_INTERVAL", "30"))
+
+SAMPLED = {"sampled": True}
+# LOG_FORMAT=text: the `extra` fields of the records are not part of it
+TEXT_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+# Attributes every LogRecord has: anything else was passed through `extra`
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName", "sampled"}
+
+
+class Truncated:
+    """Defers the conversion (and truncation) of a value to text until the record is emitted."""
+    __slots__ = ("value", "limit")
+
+    def __init__(self, value: Any, limit: int) -> None:
+        self.value = value
+        self.limit = limit
+
+    def __str__(self) -> str:
+        text = self.value.decode(errors="replace") if isinstance(self.value, bytes) else str(self.value)
+        if len(text) <= self.limit:
+            return text
+        return f"{text[:self.limit]}... ({len(text)} chars)"
+
+
+def truncate(value: Any, limit: int | None = None) -> Truncated:
+    return Truncated(value, LOG_MAX_FIELD_LENGTH if limit is None else limit)
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps a `rate` fraction of the records flagged as sampled, and every other record."""
+
+    def __init__(self, rate: float, rng: Callable[[], float] = random.random) -> None:
+        super().__init__()
+        self.rate = rate
+        self._random = rng
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or not getattr(record, "sampled", False):
+            return True
+        return self._random() < self.rate
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        data.update((key, value) for key, value in vars(record).items() if key not in _RECORD_ATTRIBUTES)
+        if record.exc_info:
+            data["exception"] = self.formatException(record.exc_info)
+        return json.dumps(data, default=str)
+
+
+def configure_logging(
+    level: str = LOG_LEVEL,
+    log_format: str = LOG_FORMAT,
+    sample_rate: float = LOG_SAMPLE_RATE,
+) -> None:
+    handler = logging.StreamHandler()
+    # On the handler rather than on a logger: logger filters do not apply to records of child loggers
+    handler.addFilter(SamplingFilter(sample_rate))
+    if log_format == "json":
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel(level)
\ No newline at end of file
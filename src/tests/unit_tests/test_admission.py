@@ -0,0 +1,189 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from src.infra.api.http.admission import AdaptiveConcurrencyLimit, AdmissionControlMiddleware
+
+
+class TestAdaptiveConcurrencyLimit:
+    def test_reject_above_limit(self):
+        limit = AdaptiveConcurrencyLimit(initial_limit=2)
+
+        assert limit.try_acquire()
+        assert limit.try_acquire()
+        assert not limit.try_acquire()
+
+    def test_admit_priority_requests_up_to_max_limit(self):
+        limit = AdaptiveConcurrencyLimit(initial_limit=1, max_limit=2)
+        limit.try_acquire()
+
+        assert not limit.try_acquire()
+        assert limit.try_acquire(priority=True)
+        assert not limit.try_acquire(priority=True)
+
+    def test_grow_while_latency_stays_close_to_baseline(self):
+        limit = AdaptiveConcurrencyLimit(initial_limit=10)
+        for _ in range(100):
+            limit.try_acquire()
+            limit.release(latency=0.010)
+
+        assert limit.limit > 15
+
+    def test_shrink_when_latency_climbs(self):
+        limit = AdaptiveConcurrencyLimit(initial_limit=10)
+        limit.try_acquire()
+        limit.release(latency=0.010)
+
+        for _ in range(10):
+            limit.try_acquire()
+            limit.release(latency=0.100)
+
+        assert limit.limit < 5
+
+    def test_keep_limit_when_a_few_responses_are_much_faster(self):
+        limit = AdaptiveConcurrencyLimit(initial_limit=20, baseline_samples=100)
+        for i in range(1000):
+            limit.try_acquire()
+            limit.release(latency=0.001 if i % 10 == 0 else 0.050)
+
+        assert limit.baseline == 0.050
+        assert limit.limit > 20
+
+    def test_ignore_latency_of_client_errors(self):
+        limit = AdaptiveConcurrencyLimit(initial_limit=10)
+        limit.try_acquire()
+        limit.release(latency=0.050)
+
+        for _ in range(10):
+            limit.try_acquire()
+            limit.release(latency=0.001, sampled=False)
+        limit.try_acquire()
+        limit.release(latency=0.050)
+
+        assert limit.baseline == 0.050
+        assert limit.limit > 10
+        assert limit.in_flight == 0
+
+    def test_shrink_on_failure_down_to_min_limit(self):
+        limit = AdaptiveConcurrencyLimit(initial_limit=10, min_limit=3)
+        for _ in range(50):
+            limit.try_acquire()
+            limit.release(latency=0.010, failed=True)
+
+        assert limit.limit == 3
+        assert limit.in_flight == 0
+
+
+@pytest.fixture
+def app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/videos/")
+    async def list_videos():
+        await asyncio.sleep(0.05)
+        return {"data": []}
+
+    @app.get("/healthcheck/")
+    async def healthcheck():
+        await asyncio.sleep(0.05)
+        return {"status": "ok"}
+
+    @app.post("/videos/batch_get")
+    async def batch_get_videos():
+        await asyncio.sleep(0.05)
+        return {"data": []}
+
+    @app.get("/genres/")
+    def list_genres():
+        raise HTTPException(status_code=500)
+
+    return app
+
+
+def make_middleware(app: FastAPI, initial_limit: int, max_limit: int = 200) -> AdmissionControlMiddleware:
+    return AdmissionControlMiddleware(
+        app,
+        limit_factory=lambda: AdaptiveConcurrencyLimit(initial_limit=initial_limit, max_limit=max_limit),
+    )
+
+
+async def get_concurrently(
+    middleware: AdmissionControlMiddleware, path: str, requests: int, query_string: bytes = b"", method: str = "GET"
+) -> list[int]:
+    async def get() -> int:
+        statuses = []
+
+        async def receive():
+            return {"type": "http.request", "body": b""}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                statuses.append(message["status"])
+
+        scope = {"type": "http", "method": method, "path": path, "query_string": query_string, "headers": []}
+        await middleware(scope, receive, send)
+        return statuses[0]
+
+    return await asyncio.gather(*(get() for _ in range(requests)))
+
+
+class TestAdmissionControlMiddleware:
+    def test_shed_requests_above_limit_with_retry_after(self, app):
+        client = TestClient(make_middleware(app, initial_limit=0))
+
+        response = client.get("/videos/")
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+
+    def test_serve_requests_within_limit(self, app):
+        statuses = asyncio.run(get_concurrently(make_middleware(app, initial_limit=2), "/videos/", 5))
+
+        assert sorted(statuses) == [200, 200, 503, 503, 503]
+
+    def test_admit_priority_route_beyond_adaptive_limit(self, app):
+        statuses = asyncio.run(get_concurrently(make_middleware(app, initial_limit=2), "/healthcheck/", 5))
+
+        assert statuses == [200] * 5
+
+    def test_admit_cached_lookups_beyond_adaptive_limit(self, app):
+        middleware = make_middleware(app, initial_limit=2)
+
+        by_ids = asyncio.run(get_concurrently(middleware, "/videos/", 5, query_string=b"ids=1,2"))
+        batch_get = asyncio.run(get_concurrently(middleware, "/videos/batch_get", 5, method="POST"))
+
+        assert by_ids == [200] * 5
+        assert batch_get == [200] * 5
+        assert middleware.limits["/videos?ids"] is not middleware.limits["/videos/batch_get"]
+        assert "/videos" not in middleware.limits
+
+    def test_shrink_limit_of_failing_route_only(self, app):
+        middleware = make_middleware(app, initial_limit=10)
+        client = TestClient(middleware)
+
+        client.get("/genres/")
+        client.get("/videos/")
+
+        assert middleware.limits["/genres"].limit == 9
+        assert middleware.limits["/videos"].limit > 10
+
+    @pytest.mark.parametrize(
+        "path, route",
+        [("/videos/", "/videos"), ("/videos", "/videos"), ("/graphql", "/graphql"), ("/", "/")],
+    )
+    def test_route_of_path(self, path, route):
+        assert AdmissionControlMiddleware.route(path) == route
+
+    @pytest.mark.parametrize(
+        "path, query_string, route",
+        [
+            ("/videos/", b"ids=1,2", "/videos?ids"),
+            ("/videos/", b"page=2&ids=1", "/videos?ids"),
+            ("/videos/", b"search_term=ids=1", "/videos"),
+            ("/genres/batch_get", b"", "/genres/batch_get"),
+        ],
+    )
+    def test_route_of_cached_lookup(self, path, query_string, route):
+        assert AdmissionControlMiddleware.route(path, query_string) == route
\ No newline at end of file
@@ -0,0 +1,55 @@
+import runpy
+from unittest.mock import Mock
+
+import anyio.to_thread
+from fastapi.testclient import TestClient
+
+from src.infra.api.http import main
+from src.infra.api.http.dependencies import get_category_repository, get_elasticsearch_client, get_video_repository
+
+
+def test_startup_sizes_the_threadpool_of_sync_routes(monkeypatch):
+    monkeypatch.setattr(main, "API_THREADPOOL_SIZE", 7)
+
+    with TestClient(main.app) as client:
+        tokens = client.portal.call(lambda: anyio.to_thread.current_default_thread_limiter().total_tokens)
+
+    assert tokens == 7
+
+
+def test_repositories_share_the_elasticsearch_client_of_the_process():
+    get_elasticsearch_client.cache_clear()
+
+    assert get_category_repository()._client is get_video_repository()._client
+    assert get_video_repository()._client is get_elasticsearch_client()
+
+
+def test_gunicorn_drops_the_live_metrics_of_exited_workers(monkeypatch, tmp_path):
+    from src.infra.api.http import gunicorn_conf
+
+    mark_process_dead = Mock()
+    monkeypatch.setattr("src.infra.metrics.mark_process_dead", mark_process_dead)
+    worker = Mock(pid=1234)
+
+    gunicorn_conf.child_exit(server=None, worker=worker)
+    mark_process_dead.assert_not_called()
+
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+    gunicorn_conf.child_exit(server=None, worker=worker)
+    mark_process_dead.assert_called_once_with(1234, str(tmp_path))
+
+def test_gunicorn_accepts_the_settings_overridden_from_the_environment(monkeypatch):
+    from gunicorn.config import Config
+    from uvicorn_worker import UvicornWorker
+
+    from src.infra.api.http import gunicorn_conf
+
+    monkeypatch.setenv("WEB_CONCURRENCY", "3")
+    monkeypatch.setenv("API_KEEPALIVE", "5")
+    config = Config()
+    for name, value in runpy.run_path(gunicorn_conf.__file__).items():
+        if name in config.settings:
+            config.set(name, value)
+
+    assert config.worker_class is UvicornWorker
+    assert (config.workers, config.keepalive, config.preload_app) == (3, 5, True)
\ No newline at end of file
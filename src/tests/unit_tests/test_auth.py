@@ -0,0 +1,91 @@
+import time
+from unittest.mock import create_autospec, patch
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from src.infra.api.http.auth import TokenVerifier
+
+NOW = int(time.time())
+
+
+@pytest.fixture(scope="module")
+def private_key() -> rsa.RSAPrivateKey:
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+@pytest.fixture
+def clock() -> list[float]:
+    return [NOW]
+
+
+@pytest.fixture
+def verifier(private_key, clock) -> TokenVerifier:
+    return TokenVerifier(public_key=private_key.public_key(), max_entries=2, clock=lambda: clock[0])
+
+
+def make_token(private_key, **claims) -> str:
+    return jwt.encode({"aud": "account", "exp": NOW + 60, **claims}, private_key, algorithm="RS256")
+
+
+class TestVerify:
+    def test_verify_signature_once_per_token(self, verifier, private_key):
+        token = make_token(private_key, sub="user")
+
+        with patch("src.infra.api.http.auth.jwt.decode", wraps=jwt.decode) as decode:
+            assert verifier.verify(token)["sub"] == "user"
+            assert verifier.verify(token)["sub"] == "user"
+
+        decode.assert_called_once()
+
+    def test_verify_token_again_once_past_its_exp(self, verifier, private_key, clock):
+        token = make_token(private_key)
+        verifier.verify(token)
+
+        clock[0] = NOW + 61
+        with patch("src.infra.api.http.auth.jwt.decode", wraps=jwt.decode) as decode:
+            verifier.verify(token)
+
+        decode.assert_called_once()
+
+    def test_reject_expired_token(self, verifier, private_key):
+        with pytest.raises(jwt.ExpiredSignatureError):
+            verifier.verify(make_token(private_key, exp=NOW - 1))
+
+    def test_reject_token_signed_with_another_key(self, verifier):
+        other_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+        with pytest.raises(jwt.InvalidSignatureError):
+            verifier.verify(make_token(other_key))
+
+    def test_reject_token_for_another_audience(self, verifier, private_key):
+        with pytest.raises(jwt.InvalidAudienceError):
+            verifier.verify(make_token(private_key, aud="other"))
+
+    def test_evict_least_recently_used_token(self, verifier, private_key):
+        first, second, third = (make_token(private_key, sub=sub) for sub in ("a", "b", "c"))
+        for token in (first, second, first, third):
+            verifier.verify(token)
+
+        with patch("src.infra.api.http.auth.jwt.decode", wraps=jwt.decode) as decode:
+            verifier.verify(first)
+            verifier.verify(second)
+
+        assert decode.call_count == 1
+
+    def test_reject_every_token_without_key(self, private_key):
+        with pytest.raises(jwt.InvalidKeyError):
+            TokenVerifier().verify(make_token(private_key))
+
+
+class TestJwks:
+    def test_verify_with_signing_key_of_the_token(self, private_key):
+        jwks_client = create_autospec(jwt.PyJWKClient)
+        jwks_client.get_signing_key_from_jwt.return_value.key = private_key.public_key()
+        verifier = TokenVerifier(jwks_client=jwks_client, clock=lambda: NOW)
+        token = make_token(private_key, sub="user")
+
+        assert verifier.verify(token)["sub"] == "user"
+        assert verifier.verify(token)["sub"] == "user"
+        jwks_client.get_signing_key_from_jwt.assert_called_once_with(token)
\ No newline at end of file
@@ -0,0 +1,89 @@
+from typing import Iterator
+
+import pytest
+
+from src.benchmarks.fake_elasticsearch import (
+    GENRE_CATEGORIES_INDEX,
+    VIDEOS_INDEX,
+    FakeElasticsearch,
+    catalog_documents,
+)
+from src.benchmarks.suite import benchmarks, check, compare
+from src.infra.api.http.main import app
+
+
+@pytest.fixture(scope="module")
+def documents() -> dict[str, list[dict]]:
+    return catalog_documents(videos=40)
+
+
+class TestFakeElasticsearch:
+    def test_catalog_is_the_same_for_a_seed(self) -> None:
+        assert catalog_documents(videos=10, seed=1) == catalog_documents(videos=10, seed=1)
+        assert catalog_documents(videos=10, seed=1) != catalog_documents(videos=10, seed=2)
+
+    def test_pages_with_from_and_search_after(self, documents: dict[str, list[dict]]) -> None:
+        es = FakeElasticsearch(documents)
+        body = {"size": 5, "sort": [{"title.keyword": {"order": "asc"}}, {"id.keyword": {"order": "asc"}}]}
+
+        first = es.search(index=VIDEOS_INDEX, body={**body, "from": 0})["hits"]["hits"]
+        second = es.search(index=VIDEOS_INDEX, body={**body, "from": 5})["hits"]["hits"]
+        after = es.search(index=VIDEOS_INDEX, body={**body, "search_after": first[-1]["sort"]})["hits"]["hits"]
+
+        assert [hit["_id"] for hit in first] == [document["id"] for document in documents[VIDEOS_INDEX][:5]]
+        assert after == second
+        assert first[0]["sort"] == [first[0]["_source"]["title"], first[0]["_id"]]
+
+    def test_returns_the_requested_source_fields(self, documents: dict[str, list[dict]]) -> None:
+        es = FakeElasticsearch(documents)
+
+        [hit] = es.search(index=VIDEOS_INDEX, body={"size": 1, "_source": ["id", "title"]})["hits"]["hits"]
+
+        assert set(hit["_source"]) == {"id", "title"}
+
+    def test_applies_terms_filters(self, documents: dict[str, list[dict]]) -> None:
+        es = FakeElasticsearch(documents)
+        genre_id = documents[GENRE_CATEGORIES_INDEX][0]["genre_id"]
+
+        response = es.search(
+            index=GENRE_CATEGORIES_INDEX,
+            body={"size": 10_000, "query": {"terms": {"genre_id.keyword": [genre_id]}}},
+        )
+
+        assert response["hits"]["hits"]
+        assert {hit["_source"]["genre_id"] for hit in response["hits"]["hits"]} == {genre_id}
+
+    def test_responses_are_not_shared_between_calls(self, documents: dict[str, list[dict]]) -> None:
+        es = FakeElasticsearch(documents)
+
+        first = es.search(index=VIDEOS_INDEX, body={"size": 1})
+        first["hits"]["hits"].clear()
+
+        assert es.search(index=VIDEOS_INDEX, body={"size": 1})["hits"]["hits"]
+
+    def test_mget_flags_missing_documents(self, documents: dict[str, list[dict]]) -> None:
+        es = FakeElasticsearch(documents)
+        id = documents[VIDEOS_INDEX][0]["id"]
+
+        docs = es.mget(index=VIDEOS_INDEX, ids=[id, "missing"])["docs"]
+
+        assert [(doc["_id"], doc["found"]) for doc in docs] == [(id, True), ("missing", False)]
+
+
+class TestSuite:
+    @pytest.fixture
+    def suite(self) -> Iterator[dict]:
+        yield benchmarks()
+        app.dependency_overrides.clear()
+
+    def test_every_benchmark_succeeds(self, suite: dict) -> None:
+        for name, function in suite.items():
+            check(name, function())
+
+    def test_compare_flags_regressions_over_the_threshold(self) -> None:
+        baseline = {"benchmarks": {"a": {"min": 1.0}, "b": {"min": 1.0}, "c": {"min": 1.0}}}
+        current = {"benchmarks": {"a": {"min": 1.05}, "b": {"min": 1.2}, "c": {"min": 0.5}, "d": {"min": 1.0}}}
+
+        statuses = {name: status for name, _, _, status in compare(baseline, current, threshold=0.1)}
+
+        assert statuses == {"a": "ok", "b": "regression", "c": "faster", "d": "new"}
\ No newline at end of file
@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import create_autospec
+from uuid import uuid4
+
+import pytest
+
+from src.infra.codeflix_client.cached_client import CachedCodeflixClient
+from src.infra.codeflix_client.codeflix_client import CodeflixClient
+from src.infra.codeflix_client.dtos import VideoResponse
+from src.infra.codeflix_client.stub_server import video_payload
+
+UPDATED_AT = datetime(2024, 12, 13, 20, 46, 20)
+
+
+@pytest.fixture
+def client() -> CodeflixClient:
+    client = create_autospec(CodeflixClient)
+    client.get_video.side_effect = lambda id, updated_at=None: VideoResponse(**video_payload(id))
+    client.get_videos.side_effect = lambda ids, versions=None: {id: VideoResponse(**video_payload(id)) for id in ids}
+    return client
+
+
+class TestCachedCodeflixClient:
+    def test_unchanged_video_is_fetched_once(self, client: CodeflixClient) -> None:
+        cached = CachedCodeflixClient(client, path=None)
+        id = uuid4()
+
+        first = cached.get_video(id=id, updated_at=UPDATED_AT)
+        second = cached.get_video(id=id, updated_at=UPDATED_AT)
+
+        assert first == second
+        client.get_video.assert_called_once_with(id=id, updated_at=UPDATED_AT)
+        assert cached.hit_rate == 0.5
+
+    def test_newer_version_is_fetched_again(self, client: CodeflixClient) -> None:
+        cached = CachedCodeflixClient(client, path=None)
+        id = uuid4()
+
+        cached.get_video(id=id, updated_at=UPDATED_AT)
+        cached.get_video(id=id, updated_at=UPDATED_AT + timedelta(seconds=1))
+
+        assert client.get_video.call_count == 2
+
+    def test_calls_without_version_bypass_the_cache(self, client: CodeflixClient) -> None:
+        cached = CachedCodeflixClient(client, path=None)
+        id = uuid4()
+
+        cached.get_video(id=id)
+        cached.get_video(id=id)
+
+        assert client.get_video.call_count == 2
+
+    def test_least_recently_used_videos_are_evicted(self, client: CodeflixClient) -> None:
+        cached = CachedCodeflixClient(client, max_entries=2, path=None)
+        ids = [uuid4() for _ in range(3)]
+
+        for id in ids:
+            cached.get_video(id=id, updated_at=UPDATED_AT)
+        cached.get_video(id=ids[0], updated_at=UPDATED_AT)
+
+        assert client.get_video.call_count == 4
+
+    def test_batch_only_fetches_the_missing_videos(self, client: CodeflixClient) -> None:
+        cached = CachedCodeflixClient(client, path=None)
+        known, new = uuid4(), uuid4()
+        cached.get_video(id=known, updated_at=UPDATED_AT)
+
+        videos = cached.get_videos(ids=[known, new], versions={known: UPDATED_AT, new: UPDATED_AT})
+
+        assert set(videos) == {known, new}
+        client.get_videos.assert_called_once_with(ids=[new], versions={new: UPDATED_AT})
+
+    def test_disk_tier_survives_restarts(self, client: CodeflixClient, tmp_path: Path) -> None:
+        path = str(tmp_path / "cache.sqlite3")
+        id = uuid4()
+        CachedCodeflixClient(client, path=path).get_video(id=id, updated_at=UPDATED_AT)
+
+        restarted = CachedCodeflixClient(client, path=path)
+        video = restarted.get_video(id=id, updated_at=UPDATED_AT)
+
+        assert video.id == id
+        client.get_video.assert_called_once()
+        assert restarted.stats["disk_hit"] == 1
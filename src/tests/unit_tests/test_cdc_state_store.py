@@ -0,0 +1,76 @@
+from uuid import UUID, uuid4
+
+import pytest
+
+from src.domain.video import Video
+from src.infra.codeflix_client.cdc_state_store import CdcVideoStateStore, IncompleteVideoError
+from src.infra.kafka.operation import Operation
+from src.infra.kafka.parser import ParsedEvent
+
+
+def make_event(table: str, payload: dict, operation: Operation = Operation.CREATE) -> ParsedEvent:
+    return ParsedEvent(entity=Video, operation=operation, payload=payload, source={"table": table})
+
+
+def video_row(id: UUID) -> dict:
+    return {
+        "id": str(id),
+        "title": "The Godfather",
+        "launch_year": 1972,
+        "rating": "AGE_18",
+        "created_at": "2024-12-13T20:46:20Z",
+        "updated_at": "2024-12-13T20:46:20Z",
+        "is_active": True,
+    }
+
+
+def banner_row(video_id: UUID) -> dict:
+    return {"id": str(uuid4()), "video_id": str(video_id), "name": "banner", "raw_location": "https://banner.com/1"}
+
+
+class TestCdcVideoStateStore:
+    @pytest.fixture
+    def store(self) -> CdcVideoStateStore:
+        return CdcVideoStateStore()
+
+    def test_join_video_with_its_relations_and_banner(self, store: CdcVideoStateStore) -> None:
+        video_id, category_id, genre_id = uuid4(), uuid4(), uuid4()
+        store.apply(make_event("video_categories", {"id": str(uuid4()), "video_id": str(video_id), "category_id": str(category_id)}))
+        store.apply(make_event("video_genres", {"id": str(uuid4()), "video_id": str(video_id), "genre_id": str(genre_id)}))
+        store.apply(make_event("video_banners", banner_row(video_id)))
+        store.apply(make_event("videos", video_row(video_id)))
+
+        video = store.get_video(id=video_id)
+
+        assert video.title == "The Godfather"
+        assert video.categories == [{"id": str(category_id)}]
+        assert video.genres == [{"id": str(genre_id)}]
+        assert video.cast_members == []
+        assert video.banner["raw_location"] == "https://banner.com/1"
+
+    def test_deleted_relation_is_removed(self, store: CdcVideoStateStore) -> None:
+        video_id = uuid4()
+        relation = {"id": str(uuid4()), "video_id": str(video_id), "cast_member_id": str(uuid4())}
+        store.apply(make_event("videos", video_row(video_id)))
+        store.apply(make_event("video_banners", banner_row(video_id)))
+        store.apply(make_event("video_cast_members", relation))
+
+        store.apply(make_event("video_cast_members", relation, operation=Operation.DELETE))
+
+        assert store.get_video(id=video_id).cast_members == []
+
+    def test_video_without_banner_is_incomplete(self, store: CdcVideoStateStore) -> None:
+        video_id = uuid4()
+        store.apply(make_event("videos", video_row(video_id)))
+
+        assert store.is_complete(video_id) is False
+        with pytest.raises(IncompleteVideoError):
+            store.get_video(id=video_id)
+
+    def test_state_survives_restarts(self, tmp_path) -> None:
+        path, video_id = str(tmp_path / "state.sqlite3"), uuid4()
+        store = CdcVideoStateStore(path=path)
+        store.apply(make_event("videos", video_row(video_id)))
+        store.apply(make_event("video_banners", banner_row(video_id)))
+
+        assert CdcVideoStateStore(path=path).get_videos(ids=[video_id])[video_id].id == video_id
@@ -0,0 +1,114 @@
+import gzip
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from src.infra.api.http.compression import CompressedBodyCache, CompressionMiddleware, accepted_encoding
+
+ITEMS = [{"id": str(i), "name": f"Category {i}"} for i in range(100)]
+
+
+@pytest.fixture
+def cache() -> CompressedBodyCache:
+    return CompressedBodyCache()
+
+
+@pytest.fixture
+def client(cache) -> TestClient:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=500, cache=cache)
+
+    @app.get("/large")
+    def large():
+        return {"data": ITEMS}
+
+    @app.get("/small")
+    def small():
+        return {"status": "ok"}
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse((b"x" * 1000 for _ in range(3)), media_type="text/plain")
+
+    @app.get("/image")
+    def image():
+        return PlainTextResponse(b"\x89PNG" * 1000, media_type="image/png")
+
+    return TestClient(app)
+
+
+class TestAcceptedEncoding:
+    @pytest.mark.parametrize(
+        "header, expected",
+        [
+            ("gzip, deflate, br, zstd", "zstd"),
+            ("gzip, br", "br"),
+            ("gzip;q=0.5, br;q=0", "gzip"),
+            ("*", "zstd"),
+            ("identity", None),
+            ("", None),
+        ],
+    )
+    def test_pick_first_available_encoding_accepted(self, header, expected):
+        assert accepted_encoding(header, ["zstd", "br", "gzip"]) == expected
+
+
+class TestCompressionMiddleware:
+    def test_compress_large_json_response(self, client):
+        response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert response.headers["Vary"] == "Accept-Encoding"
+        assert int(response.headers["Content-Length"]) < len(response.content)
+        assert response.json() == {"data": ITEMS}
+
+    @pytest.mark.parametrize("encoding", ["br", "zstd"])
+    def test_compress_with_negotiated_encoding(self, client, encoding):
+        pytest.importorskip({"br": "brotli", "zstd": "zstandard"}[encoding])
+
+        response = client.get("/large", headers={"Accept-Encoding": encoding})
+
+        assert response.headers["Content-Encoding"] == encoding
+        assert response.json() == {"data": ITEMS}
+
+    def test_send_small_response_as_is(self, client):
+        response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+
+        assert "Content-Encoding" not in response.headers
+        assert response.json() == {"status": "ok"}
+
+    def test_send_response_as_is_without_accepted_encoding(self, client):
+        response = client.get("/large", headers={"Accept-Encoding": "identity"})
+
+        assert "Content-Encoding" not in response.headers
+
+    def test_do_not_compress_binary_content(self, client):
+        response = client.get("/image", headers={"Accept-Encoding": "gzip"})
+
+        assert "Content-Encoding" not in response.headers
+
+    def test_pass_streamed_response_through(self, client):
+        response = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+
+        assert "Content-Encoding" not in response.headers
+        assert response.content == b"x" * 3000
+
+    def test_compress_same_body_once(self, client, cache):
+        first = client.get("/large", headers={"Accept-Encoding": "gzip"})
+        second = client.get("/large", headers={"Accept-Encoding": "gzip"})
+
+        assert (cache.misses, cache.hits) == (1, 1)
+        assert first.content == second.content
+
+
+class TestCompressedBodyCache:
+    def test_evict_least_recently_used_body(self):
+        cache = CompressedBodyCache(max_entries=1)
+        cache.get_or_compress(b"first", "gzip", gzip.compress)
+        cache.get_or_compress(b"second", "gzip", gzip.compress)
+
+        cache.get_or_compress(b"first", "gzip", gzip.compress)
+
+        assert cache.misses == 3
\ No newline at end of file
@@ -0,0 +1,42 @@
+import pytest
+
+from src.application.cursor import Cursor, InvalidCursorError
+
+KEY = b"secret"
+
+
+@pytest.fixture
+def cursor() -> Cursor:
+    return Cursor(
+        sort_values=["Séries", "b8a3b2d1-0000-0000-0000-000000000000"],
+        backward=False,
+        sort="name",
+        direction="asc",
+        search=None,
+    )
+
+
+class TestCursor:
+    def test_decode_encoded_cursor(self, cursor):
+        assert Cursor.decode(cursor.encode(KEY), KEY) == cursor
+
+    def test_encode_url_safe(self, cursor):
+        encoded = cursor.encode(KEY)
+
+        assert all(char.isalnum() or char in "-_." for char in encoded)
+
+    def test_reject_cursor_signed_with_another_key(self, cursor):
+        with pytest.raises(InvalidCursorError):
+            Cursor.decode(cursor.encode(b"other"), KEY)
+
+    def test_reject_tampered_cursor(self, cursor):
+        signature = cursor.encode(KEY).split(".")[1]
+        tampered = Cursor(["A", "b8a3b2d1-0000-0000-0000-000000000000"], False, "name", "asc", None).encode(KEY)
+
+        with pytest.raises(InvalidCursorError):
+            Cursor.decode(f"{tampered.split('.')[0]}.{signature}", KEY)
+
+    @pytest.mark.parametrize("encoded", ["", "abc", "a.b.c", "!!!.???"])
+    def test_reject_malformed_cursor(self, encoded):
+        with pytest.raises(InvalidCursorError):
+            Cursor.decode(encoded, KEY)
\ No newline at end of file
@@ -0,0 +1,148 @@
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, create_autospec
+from uuid import uuid4
+
+import pytest
+from elasticsearch import ConflictError, Elasticsearch
+from elasticsearch.client import IndicesClient
+
+from src.domain.repository import StaleEntityError
+from src.domain.video import Rating, Video
+from src.infra.elasticsearch.elasticsearch_video_repository import ElasticsearchVideoRepository
+
+
+@pytest.fixture
+def video() -> Video:
+    return Video(
+        id=uuid4(),
+        title="The Godfather",
+        launch_year=1972,
+        rating=Rating.AGE_18,
+        categories={uuid4()},
+        genres={uuid4()},
+        cast_members={uuid4()},
+        banner_url="https://banner.com/the-godfather",
+        created_at=datetime(2024, 12, 13, 20, 46, 20, tzinfo=timezone.utc),
+        updated_at=datetime(2024, 12, 13, 20, 46, 20, tzinfo=timezone.utc),
+        is_active=True,
+    )
+
+
+@pytest.fixture
+def client() -> Elasticsearch:
+    client = create_autospec(Elasticsearch, instance=True)
+    client.indices = create_autospec(IndicesClient, instance=True)
+    return client
+
+
+class TestSearch:
+    def test_page_with_offset(self, client: Elasticsearch) -> None:
+        client.search.return_value = {"hits": {"hits": []}}
+
+        ElasticsearchVideoRepository(client=client).search(page=3, per_page=10, sort="title")
+
+        query = client.search.call_args.kwargs["body"]
+        assert query["from"] == 20
+        assert "search_after" not in query
+
+    def test_page_after_sort_values_with_id_as_tiebreaker(self, client: Elasticsearch) -> None:
+        client.search.return_value = {"hits": {"hits": []}}
+
+        ElasticsearchVideoRepository(client=client).search(
+            page=3,
+            per_page=10,
+            sort="title",
+            direction="desc",
+            search_after=["The Godfather", "9f1b2c3d-0000-0000-0000-000000000000"],
+        )
+
+        query = client.search.call_args.kwargs["body"]
+        assert "from" not in query
+        assert query["search_after"] == ["The Godfather", "9f1b2c3d-0000-0000-0000-000000000000"]
+        assert query["sort"] == [{"title.keyword": {"order": "desc"}}, {"id.keyword": {"order": "desc"}}]
+
+    def test_fetch_only_requested_fields(self, client: Elasticsearch, video: Video) -> None:
+        client.search.return_value = {
+            "hits": {"hits": [{"_source": {"id": str(video.id), "title": video.title}}]}
+        }
+
+        videos = ElasticsearchVideoRepository(client=client).search(fields=frozenset({"id", "title"}))
+
+        assert client.search.call_args.kwargs["body"]["_source"] == ["id", "title"]
+        assert videos[0].model_dump() == {"id": video.id, "title": "The Godfather"}
+
+
+class TestGetByIds:
+    def test_fetch_documents_in_one_mget_and_keep_order(self, client: Elasticsearch, video: Video) -> None:
+        missing = uuid4()
+        client.mget.return_value = {
+            "docs": [
+                {"_id": str(missing), "found": False},
+                {"_id": str(video.id), "found": True, "_source": video.model_dump(mode="json")},
+            ]
+        }
+
+        videos = ElasticsearchVideoRepository(client=client).get_by_ids([missing, video.id])
+
+        client.mget.assert_called_once_with(index=ElasticsearchVideoRepository.INDEX, ids=[str(missing), str(video.id)])
+        assert videos == [video]
+
+
+class TestSave:
+    def test_index_with_external_version_derived_from_updated_at(self, client: Elasticsearch, video: Video) -> None:
+        ElasticsearchVideoRepository(client=client).save(video)
+
+        client.index.assert_called_once_with(
+            index=ElasticsearchVideoRepository.INDEX,
+            id=str(video.id),
+            body=video.model_dump(mode="json"),
+            version=1734122780000000,
+            version_type="external_gte",
+        )
+
+    def test_when_newer_version_is_indexed_then_raise_stale_entity_error(
+        self,
+        client: Elasticsearch,
+        video: Video,
+    ) -> None:
+        client.index.side_effect = ConflictError("version_conflict", meta=MagicMock(status=409), body={})
+
+        with pytest.raises(StaleEntityError):
+            ElasticsearchVideoRepository(client=client).save(video)
+
+
+class TestBulkLoad:
+    def test_disable_refresh_and_replicas_then_restore_configured_settings(self, client: Elasticsearch) -> None:
+        client.indices.exists.return_value = True
+        repository = ElasticsearchVideoRepository(client=client, refresh_interval="5s", replicas="2")
+
+        repository.begin_bulk_load()
+        client.indices.put_settings.assert_called_once_with(
+            index=ElasticsearchVideoRepository.INDEX,
+            settings={"index.refresh_interval": "-1", "index.number_of_replicas": 0},
+        )
+
+        repository.end_bulk_load()
+        client.indices.put_settings.assert_called_with(
+            index=ElasticsearchVideoRepository.INDEX,
+            settings={"index.refresh_interval": "5s", "index.number_of_replicas": "2"},
+        )
+        client.indices.refresh.assert_called_once_with(index=ElasticsearchVideoRepository.INDEX)
+
+    def test_restart_during_bulk_load_restores_defaults_not_bulk_load_settings(self, client: Elasticsearch) -> None:
+        client.indices.exists.return_value = True
+        client.indices.get_settings.return_value = {
+            ElasticsearchVideoRepository.INDEX: {
+                "settings": {"index.refresh_interval": "-1", "index.number_of_replicas": "0"},
+            },
+        }
+        # A restarted process begins the bulk load again while the index still has the bulk-load settings
+        restarted = ElasticsearchVideoRepository(client=client)
+
+        restarted.begin_bulk_load()
+        restarted.end_bulk_load()
+
+        client.indices.put_settings.assert_called_with(
+            index=ElasticsearchVideoRepository.INDEX,
+            settings={"index.refresh_interval": None, "index.number_of_replicas": None},
+        )
\ No newline at end of file
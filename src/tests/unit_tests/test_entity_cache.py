@@ -0,0 +1,127 @@
+from datetime import datetime
+from unittest.mock import create_autospec
+from uuid import UUID, uuid4
+
+import pytest
+
+from src.domain.category import Category
+from src.domain.category_repository import CategoryRepository
+from src.infra.elasticsearch.entity_cache import CachedRepository, EntityCache
+
+
+def make_category(id: UUID | None = None, updated_at: datetime | None = None) -> Category:
+    return Category(
+        id=id or uuid4(),
+        name="Filme",
+        created_at=datetime.now(),
+        updated_at=updated_at or datetime.now(),
+        is_active=True,
+    )
+
+
+@pytest.fixture
+def clock() -> list[float]:
+    return [0.0]
+
+
+@pytest.fixture
+def cache(clock) -> EntityCache[Category]:
+    return EntityCache("category", max_entries=2, ttl=60, clock=lambda: clock[0])
+
+
+@pytest.fixture
+def repository() -> CategoryRepository:
+    repository = create_autospec(CategoryRepository)
+    repository.get_by_ids.side_effect = lambda ids: [make_category(id) for id in ids]
+    return repository
+
+
+class TestEntityCache:
+    def test_only_load_missing_entities(self, cache, repository):
+        first, second = uuid4(), uuid4()
+        cached = CachedRepository(repository, cache)
+        cached.get_by_ids([first])
+
+        categories = cached.get_by_ids([second, first])
+
+        assert [category.id for category in categories] == [second, first]
+        assert repository.get_by_ids.call_args_list[-1].args == ([second],)
+
+    def test_leave_out_unknown_ids(self, cache):
+        known = make_category()
+
+        categories = cache.get_many([uuid4(), known.id], lambda ids: [known])
+
+        assert categories == [known]
+
+    def test_load_again_once_expired(self, cache, repository, clock):
+        id = uuid4()
+        cached = CachedRepository(repository, cache)
+        cached.get_by_ids([id])
+
+        clock[0] = 61
+        cached.get_by_ids([id])
+
+        assert repository.get_by_ids.call_count == 2
+
+    def test_load_again_once_invalidated(self, cache, repository):
+        id = uuid4()
+        cached = CachedRepository(repository, cache)
+        cached.get_by_ids([id])
+
+        cache.invalidate(id)
+        cached.get_by_ids([id])
+
+        assert repository.get_by_ids.call_count == 2
+
+    def test_do_not_keep_entity_invalidated_while_loading(self, cache):
+        category = make_category()
+
+        def load(ids):
+            cache.invalidate(category.id)  # The CDC event arrives while the old version is being read
+            return [category]
+
+        cache.get_many([category.id], load)
+
+        assert len(cache) == 0
+
+    def test_neither_keep_nor_serve_versions_older_than_the_invalidation(self, cache):
+        old = make_category(updated_at=datetime(2024, 1, 1))
+        new = make_category(id=old.id, updated_at=datetime(2024, 1, 2))
+        cache.invalidate(old.id, updated_at=new.updated_at)
+
+        # The change is not indexed yet
+        assert cache.get_many([old.id], lambda ids: [old]) == []
+        assert len(cache) == 0
+
+        assert cache.get_many([old.id], lambda ids: [new]) == [new]
+        assert len(cache) == 1
+
+    def test_keep_the_newest_version_of_the_invalidations(self, cache):
+        category = make_category(updated_at=datetime(2024, 1, 2))
+        cache.invalidate(category.id, updated_at=datetime(2024, 1, 3))
+        cache.invalidate(category.id, updated_at=datetime(2024, 1, 1))  # Replayed event
+
+        assert cache.get_many([category.id], lambda ids: [category]) == []
+
+    def test_hold_entities_changed_without_version(self, cache, clock):
+        category = make_category()
+        cache.invalidate(category.id)
+
+        assert cache.get_many([category.id], lambda ids: [category]) == [category]
+        assert len(cache) == 0
+
+        clock[0] += cache.hold + 1
+        cache.get_many([category.id], lambda ids: [category])
+        assert len(cache) == 1
+
+    def test_evict_least_recently_used_entities(self, cache, repository):
+        first, second, third = uuid4(), uuid4(), uuid4()
+        cached = CachedRepository(repository, cache)
+        for id in (first, second, first, third):
+            cached.get_by_ids([id])
+
+        cached.get_by_ids([first])
+
+        assert len(cache) == 2
+        assert repository.get_by_ids.call_count == 3
\ No newline at end of file
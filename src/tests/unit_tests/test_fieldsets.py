@@ -0,0 +1,39 @@
+from uuid import uuid4
+
+import pytest
+
+from src.application.fieldsets import InvalidFieldsError, parse_fields, sparse_list_output, sparse_model
+from src.domain.video import Video
+
+
+class TestParseFields:
+    def test_always_include_id(self):
+        assert parse_fields("title, banner_url") == {"id", "title", "banner_url"}
+
+    @pytest.mark.parametrize("value", [None, ""])
+    def test_every_field_when_empty(self, value):
+        assert parse_fields(value) is None
+
+
+class TestSparseModel:
+    def test_model_with_requested_fields_in_entity_order(self):
+        model = sparse_model(Video, frozenset({"banner_url", "id", "title"}))
+
+        assert list(model.model_fields) == ["id", "title", "banner_url"]
+
+    def test_validate_and_serialize_like_entity(self):
+        id = uuid4()
+        model = sparse_model(Video, frozenset({"id", "banner_url"}))
+
+        video = model(id=str(id), banner_url="https://banner.com/the-godfather")
+
+        assert video.id == id
+        assert video.model_dump(mode="json") == {"id": str(id), "banner_url": "https://banner.com/the-godfather"}
+
+    def test_create_model_once_per_fieldset(self):
+        assert sparse_model(Video, frozenset({"id", "title"})) is sparse_model(Video, frozenset({"title", "id"}))
+        assert sparse_list_output(Video, frozenset({"id"})) is sparse_list_output(Video, frozenset({"id"}))
+
+    def test_unknown_field_raises_error(self):
+        with pytest.raises(InvalidFieldsError, match="Unknown Video fields: password"):
+            sparse_model(Video, frozenset({"id", "password"}))
\ No newline at end of file
@@ -0,0 +1,93 @@
+import time
+from uuid import uuid4
+
+import httpx
+import pytest
+
+from src.infra.codeflix_client.http_client import HttpClient
+from src.infra.codeflix_client.stub_server import StubCodeflixServer
+
+
+@pytest.fixture
+def sleeps() -> list[float]:
+    return []
+
+
+def make_client(url: str, sleeps: list[float], **kwargs) -> HttpClient:
+    return HttpClient(base_url=url, sleep=sleeps.append, **kwargs)
+
+
+class TestGetVideo:
+    def test_fetch_and_parse_video(self, sleeps: list[float]) -> None:
+        id = uuid4()
+        with StubCodeflixServer() as server:
+            video = make_client(server.url, sleeps).get_video(id=id)
+
+        assert video.id == id
+        assert video.title == "The Godfather"
+        assert str(video.banner["raw_location"]) == "https://banner.com/the-godfather"
+
+    def test_connections_are_kept_alive_and_reused(self, sleeps: list[float]) -> None:
+        with StubCodeflixServer() as server:
+            client = make_client(server.url, sleeps)
+            for _ in range(10):
+                client.get_video(id=uuid4())
+
+            assert server.requests == 10
+            assert server.connections == 1
+
+    def test_retry_unavailable_upstream_with_backoff(self, sleeps: list[float]) -> None:
+        with StubCodeflixServer(failures=2) as server:
+            video = make_client(server.url, sleeps, max_retries=3, backoff=0.1).get_video(id=uuid4())
+
+            assert video.title == "The Godfather"
+            assert server.requests == 3
+        assert len(sleeps) == 2
+        assert 0 <= sleeps[0] <= 0.1
+        assert 0 <= sleeps[1] <= 0.2
+
+    def test_give_up_after_max_retries(self, sleeps: list[float]) -> None:
+        with StubCodeflixServer(failures=10) as server:
+            with pytest.raises(httpx.HTTPStatusError):
+                make_client(server.url, sleeps, max_retries=2).get_video(id=uuid4())
+
+            assert server.requests == 3
+
+    def test_client_errors_are_not_retried(self, sleeps: list[float]) -> None:
+        with StubCodeflixServer() as server:
+            with pytest.raises(httpx.HTTPStatusError):
+                make_client(server.url, sleeps)._get("/api/unknown")
+
+            assert server.requests == 1
+        assert sleeps == []
+
+    def test_retry_connection_errors(self, sleeps: list[float]) -> None:
+        server = StubCodeflixServer()
+        url = server.url
+        server.stop()  # Nothing listens on the port anymore
+
+        with pytest.raises(httpx.ConnectError):
+            make_client(url, sleeps, max_retries=2).get_video(id=uuid4())
+        assert len(sleeps) == 2
+
+
+class TestGetVideos:
+    def test_fan_out_one_request_per_video_concurrently(self, sleeps: list[float]) -> None:
+        ids = [uuid4() for _ in range(8)]
+        with StubCodeflixServer(latency=0.1) as server:
+            started = time.monotonic()
+            videos = make_client(server.url, sleeps, max_concurrency=8).get_videos(ids=ids)
+            elapsed = time.monotonic() - started
+
+            assert server.requests == 8
+        assert set(videos) == set(ids)
+        assert elapsed < 0.5  # About one round trip, not eight sequential ones
+
+    def test_use_batch_endpoint_when_supported(self, sleeps: list[float]) -> None:
+        ids = [uuid4() for _ in range(150)]
+        with StubCodeflixServer() as server:
+            videos = make_client(server.url, sleeps, batch_endpoint=True).get_videos(ids=ids + ids[:10])
+
+            assert server.requests == 2
+        assert list(videos) == ids
+        assert videos[ids[0]].title == "The Godfather"
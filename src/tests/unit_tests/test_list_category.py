@@ -4,8 +4,11 @@ from uuid import uuid4
 
 import pytest
 
+from src.application.cursor import Cursor, InvalidCursorError
+from src.application.fieldsets import sparse_model
 from src.application.list_category import ListCategory, ListCategoryInput
 from src.application.listing import ListOutputMeta, SortDirection
+from src.application.read_models import CategoryReadModel, ReadModelListOutput
 from src.domain.category import Category
 from src.domain.category_repository import CategoryRepository
 
@@ -57,6 +60,9 @@ class TestListCategory:
             search=None,
             sort="name",
             direction="asc",
+            search_after=None,
+            fields=None,
+            read_models=False,
         )
 
     def test_list_with_invalid_sort_field_raises_error(self) -> None:
@@ -68,4 +74,124 @@ class TestListCategory:
                 input=ListCategoryInput(sort="invalid_field")  # type: ignore
             )
 
-        assert "Input should be 'name' or 'description'" in str(err.value)
\ No newline at end of file
+        assert "Input should be 'name' or 'description'" in str(err.value)
+
+
+class TestListCategoryWithCursor:
+    @pytest.fixture
+    def categories(self) -> list[Category]:
+        return [
+            Category(
+                id=uuid4(),
+                name=name,
+                created_at=datetime.now(),
+                updated_at=datetime.now(),
+                is_active=True,
+            )
+            for name in ("Animação", "Documentário")
+        ]
+
+    def test_full_first_page_has_next_cursor_after_last_category(self, categories: list[Category]) -> None:
+        repository = create_autospec(CategoryRepository)
+        repository.search.return_value = categories
+
+        output = ListCategory(repository).execute(input=ListCategoryInput(per_page=2))
+
+        assert output.meta.prev_cursor is None
+        assert Cursor.decode(output.meta.next_cursor).sort_values == ["Documentário", str(categories[1].id)]
+
+    def test_last_page_has_no_next_cursor(self, categories: list[Category]) -> None:
+        repository = create_autospec(CategoryRepository)
+        repository.search.return_value = categories
+
+        output = ListCategory(repository).execute(input=ListCategoryInput(per_page=5))
+
+        assert output.meta.next_cursor is None
+
+    def test_next_page_searches_after_cursor(self, categories: list[Category]) -> None:
+        repository = create_autospec(CategoryRepository)
+        repository.search.return_value = categories
+        next_cursor = ListCategory(repository).execute(input=ListCategoryInput(per_page=2)).meta.next_cursor
+
+        output = ListCategory(repository).execute(input=ListCategoryInput(per_page=2, cursor=next_cursor))
+
+        assert repository.search.call_args.kwargs["search_after"] == ["Documentário", str(categories[1].id)]
+        assert repository.search.call_args.kwargs["direction"] == SortDirection.ASC
+        assert Cursor.decode(output.meta.prev_cursor).backward is True
+
+    def test_previous_page_searches_backwards_and_keeps_order(self, categories: list[Category]) -> None:
+        repository = create_autospec(CategoryRepository)
+        repository.search.return_value = categories
+        prev_cursor = ListCategory(repository).execute(input=ListCategoryInput(page=2, per_page=2)).meta.prev_cursor
+        repository.search.return_value = list(reversed(categories))
+
+        output = ListCategory(repository).execute(input=ListCategoryInput(per_page=2, cursor=prev_cursor))
+
+        assert repository.search.call_args.kwargs["direction"] == SortDirection.DESC
+        assert output.data == categories
+        assert output.meta.next_cursor is not None
+
+    def test_cursor_of_another_listing_raises_error(self, categories: list[Category]) -> None:
+        repository = create_autospec(CategoryRepository)
+        repository.search.return_value = categories
+        next_cursor = ListCategory(repository).execute(input=ListCategoryInput(per_page=2)).meta.next_cursor
+
+        with pytest.raises(InvalidCursorError):
+            ListCategory(repository).execute(
+                input=ListCategoryInput(per_page=2, cursor=next_cursor, direction=SortDirection.DESC)
+            )
+
+
+class TestListCategoryWithFields:
+    def test_fetch_requested_fields_with_sort_field(self) -> None:
+        repository = create_autospec(CategoryRepository)
+        repository.search.return_value = []
+
+        ListCategory(repository).execute(input=ListCategoryInput(fields=frozenset({"id", "description"})))
+
+        assert repository.search.call_args.kwargs["fields"] == {"id", "description", "name"}
+
+    def test_output_has_only_requested_fields(self) -> None:
+        repository = create_autospec(CategoryRepository)
+        fields = frozenset({"id", "name"})
+        repository.search.return_value = [sparse_model(Category, fields)(id=uuid4(), name="Filme")]
+
+        output = ListCategory(repository).execute(input=ListCategoryInput(fields=fields))
+
+        assert output.model_dump(mode="json")["data"] == [{"id": str(output.data[0].id), "name": "Filme"}]
+
+
+class TestListCategoryReadModels:
+    @pytest.fixture
+    def read_models(self) -> list[CategoryReadModel]:
+        return [
+            CategoryReadModel(
+                id=str(uuid4()),
+                name=name,
+                description="",
+                created_at="2024-01-01T00:00:00+00:00",
+                updated_at="2024-01-01T00:00:00+00:00",
+                is_active=True,
+            )
+            for name in ["Documentário", "Filme"]
+        ]
+
+    def test_page_read_models_of_the_repository(self, read_models: list[CategoryReadModel]) -> None:
+        repository = create_autospec(CategoryRepository)
+        repository.search.return_value = read_models
+
+        output = ListCategory(repository, read_models=True).execute(input=ListCategoryInput(per_page=2))
+
+        assert repository.search.call_args.kwargs["read_models"] is True
+        assert output == ReadModelListOutput(data=read_models, meta=output.meta)
+        assert Cursor.decode(output.meta.next_cursor).sort_values == ["Filme", read_models[1].id]
+
+    def test_page_models_of_the_fieldset_when_fields_are_requested(self) -> None:
+        repository = create_autospec(CategoryRepository)
+        fields = frozenset({"id", "name"})
+        repository.search.return_value = [sparse_model(Category, fields)(id=uuid4(), name="Filme")]
+
+        output = ListCategory(repository, read_models=True).execute(input=ListCategoryInput(fields=fields))
+
+        assert not isinstance(output, ReadModelListOutput)
+        assert output.model_dump(mode="json")["data"][0]["name"] == "Filme"
\ No newline at end of file
@@ -1,9 +1,11 @@
 from typing import Iterator
+from uuid import uuid4
 from unittest.mock import create_autospec
 
 import pytest
 from fastapi.testclient import TestClient
 
+from src.application.read_models import CategoryReadModel
 from src.domain.category_repository import CategoryRepository
 from src.infra.api.http.auth import authenticate
 from src.infra.api.http.main import app
@@ -11,8 +13,14 @@ from src.infra.api.http.dependencies import get_category_repository
 
 
 @pytest.fixture
-def client() -> Iterator[TestClient]:
-    mock_category_repository = create_autospec(CategoryRepository)
+def mock_category_repository() -> CategoryRepository:
+    return create_autospec(CategoryRepository)
+
+
+@pytest.fixture
+def client(mock_category_repository) -> Iterator[TestClient]:
+    mock_category_repository.search.return_value = []
+    mock_category_repository.get_by_ids.return_value = []
     app.dependency_overrides[get_category_repository] = lambda: mock_category_repository
     app.dependency_overrides[authenticate] = lambda: None
     yield TestClient(app)
@@ -24,6 +32,24 @@ def test_categories_endpoint_with_default_pagination(client):
     assert response.status_code == 200
 
 
+def test_categories_endpoint_serializes_read_models(client, mock_category_repository):
+    document = {
+        "id": str(uuid4()),
+        "name": "Filme",
+        "description": "Categoria de filmes",
+        "created_at": "2024-01-01T00:00:00+00:00",
+        "updated_at": "2024-01-02T00:00:00+00:00",
+        "is_active": True,
+    }
+    mock_category_repository.search.return_value = [CategoryReadModel.from_source(document)]
+
+    response = client.get("/categories")
+
+    assert mock_category_repository.search.call_args.kwargs["read_models"] is True
+    assert response.json()["data"] == [document]
+    assert response.json()["meta"]["sort"] == "name"
+
+
 def test_categories_endpoint_with_custom_pagination(client):
     response = client.get("/categories", params={"page": 2, "per_page": 10})
     assert response.status_code == 200
@@ -41,4 +67,46 @@ def test_categories_endpoint_with_sorting_asc(client):
 
 def test_categories_endpoint_invalid_sort_field(client):
     response = client.get("/categories", params={"sort": "invalid_field"})
-    assert response.status_code == 422
\ No newline at end of file
+    assert response.status_code == 422
+
+
+def test_categories_endpoint_with_invalid_cursor(client):
+    response = client.get("/categories", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+
+def test_categories_endpoint_with_fields(client):
+    response = client.get("/categories", params={"fields": "name"})
+    assert response.status_code == 200
+
+
+def test_categories_endpoint_with_unknown_fields(client):
+    response = client.get("/categories", params={"fields": "name,password"})
+    assert response.status_code == 400
+
+
+def test_categories_endpoint_with_ids(client):
+    response = client.get("/categories", params={"ids": f"{uuid4()},{uuid4()}"})
+    assert response.status_code == 200
+    assert response.json() == {"data": []}
+
+
+def test_categories_endpoint_with_invalid_ids(client):
+    response = client.get("/categories", params={"ids": "not-an-id"})
+    assert response.status_code == 422
+
+
+def test_categories_batch_get_endpoint(client):
+    response = client.post("/categories/batch_get", json={"ids": [str(uuid4())]})
+    assert response.status_code == 200
+
+
+def test_categories_batch_get_endpoint_with_too_many_ids(client):
+    response = client.post("/categories/batch_get", json={"ids": [str(uuid4()) for _ in range(101)]})
+    assert response.status_code == 422
+
+def test_categories_graphql_query_uses_the_overridden_repository(client, mock_category_repository):
+    response = client.post("/graphql", json={"query": "{ categories { data { id } meta { page } } }"})
+
+    assert response.json() == {"data": {"categories": {"data": [], "meta": {"page": 1}}}}
+    mock_category_repository.search.assert_called_once()
\ No newline at end of file
@@ -0,0 +1,134 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import create_autospec
+
+import pytest
+from elasticsearch import Elasticsearch
+
+from src.infra.elasticsearch.elasticsearch_category_repository import ElasticsearchCategoryRepository
+from src.infra.elasticsearch.query_log import QueryLog, QueryShape, query_log
+from src.infra.structured_logging import TEXT_FORMAT
+
+QUERY = {"size": 10, "query": {"match_all": {}}}
+SHAPE = QueryShape.of("categories", "name", "asc", None, 1)
+
+
+@pytest.fixture
+def client() -> Elasticsearch:
+    client = create_autospec(Elasticsearch, instance=True)
+    client.search.return_value = {"took": 900, "profile": {"shards": [{"id": "shard-0"}]}, "hits": {"hits": []}}
+    return client
+
+
+class TestQueryShape:
+    @pytest.mark.parametrize(
+        "page, cursor, expected",
+        [(1, False, "1"), (7, False, "2-10"), (100, False, "11-100"), (500, False, "101+"), (500, True, "cursor")],
+    )
+    def test_buckets_page_depth(self, page: int, cursor: bool, expected: str) -> None:
+        assert QueryShape.of("videos", "title", "asc", None, page, cursor).page == expected
+
+    @pytest.mark.parametrize(
+        "search, expected",
+        [(None, "none"), ("", "none"), ("godfather", "short"), ("the godfather part two", "long")],
+    )
+    def test_buckets_free_text_search(self, search: str | None, expected: str) -> None:
+        assert QueryShape.of("videos", "title", "asc", search, 1).search == expected
+
+    def test_same_shape_whatever_the_terms_and_page(self) -> None:
+        assert QueryShape.of("videos", "title", "desc", "alien", 3) == QueryShape.of("videos", "title", "desc", "heat", 9)
+
+    def test_without_sort(self) -> None:
+        assert str(QueryShape.of("genres", None, "asc", "drama", 1)) == "genres sort=none search=short page=1"
+
+
+class TestQueryLog:
+    def test_ranks_shapes_by_total_time(self, client: Elasticsearch) -> None:
+        log = QueryLog(threshold=10.0)
+        deep = QueryShape.of("videos", "title", "asc", None, 200)
+
+        log.observe(SHAPE, 0.010, client, "categories", QUERY)
+        log.observe(SHAPE, 0.030, client, "categories", QUERY)
+        log.observe(deep, 0.300, client, "videos", QUERY)
+
+        top = log.top()
+        assert [(shape["entity"], shape["page"]) for shape in top] == [("videos", "101+"), ("categories", "1")]
+        assert top[1] == {
+            "entity": "categories",
+            "sort": "name:asc",
+            "search": "none",
+            "page": "1",
+            "count": 2,
+            "slow": 0,
+            "total_ms": 40.0,
+            "mean_ms": 20.0,
+            "max_ms": 30.0,
+        }
+        assert len(log.top(1)) == 1
+
+    def test_fast_queries_are_not_logged(self, client: Elasticsearch, caplog: pytest.LogCaptureFixture) -> None:
+        log = QueryLog(threshold=0.5, profile_rate=1.0)
+
+        with caplog.at_level(logging.WARNING):
+            log.observe(SHAPE, 0.1, client, "categories", QUERY)
+
+        assert caplog.records == []
+        client.search.assert_not_called()
+
+    def test_logs_slow_queries_without_profile_when_not_sampled(
+        self, client: Elasticsearch, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        log = QueryLog(threshold=0.5, profile_rate=0.1, rng=lambda: 0.5)
+
+        with caplog.at_level(logging.WARNING):
+            log.observe(SHAPE, 0.9, client, "categories", QUERY, took=850)
+
+        assert [logging.Formatter("%(message)s").format(record) for record in caplog.records] == [
+            'Slow query categories sort=name:asc search=none page=1: 900ms (took 850ms): '
+            '{"size": 10, "query": {"match_all": {}}}'
+        ]
+        assert caplog.records[0].took_ms == 850
+        assert log.top()[0]["slow"] == 1
+        client.search.assert_not_called()
+
+    def test_profiles_sampled_slow_queries_once_per_interval(
+        self, client: Elasticsearch, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        now = [0.0]
+        executor = ThreadPoolExecutor(1)
+        log = QueryLog(threshold=0.5, profile_rate=1.0, profile_interval=60.0, executor=executor, clock=lambda: now[0])
+
+        with caplog.at_level(logging.WARNING):
+            log.observe(SHAPE, 0.9, client, "categories", QUERY)
+            log.observe(SHAPE, 0.9, client, "categories", QUERY)
+            now[0] = 61.0
+            log.observe(SHAPE, 0.9, client, "categories", QUERY)
+            executor.shutdown(wait=True)
+
+        assert client.search.call_count == 2
+        client.search.assert_called_with(index="categories", body={**QUERY, "profile": True})
+        profiles = [record for record in caplog.records if record.getMessage().startswith("Profile")]
+        assert len(profiles) == 2
+        assert "shard-0" in logging.Formatter(TEXT_FORMAT).format(profiles[0])
+
+    def test_failed_profile_is_logged(self, client: Elasticsearch, caplog: pytest.LogCaptureFixture) -> None:
+        client.search.side_effect = ConnectionError("down")
+        executor = ThreadPoolExecutor(1)
+        log = QueryLog(threshold=0.5, profile_rate=1.0, executor=executor)
+
+        with caplog.at_level(logging.WARNING):
+            log.observe(SHAPE, 0.9, client, "categories", QUERY)
+            executor.shutdown(wait=True)
+
+        assert caplog.records[-1].getMessage().startswith("Could not profile the slow query")
+
+
+class TestRepositorySearch:
+    def test_search_is_recorded_by_shape(self, client: Elasticsearch) -> None:
+        query_log.reset()
+
+        ElasticsearchCategoryRepository(client=client).search(page=2, per_page=5, search="sci-fi", sort="name")
+
+        [shape] = query_log.top()
+        assert (shape["entity"], shape["sort"], shape["search"], shape["page"]) == ("categories", "name:asc", "short", "2-10")
+        query_log.reset()
\ No newline at end of file
@@ -0,0 +1,55 @@
+import dataclasses
+import json
+
+import pytest
+
+from src.application.listing import ListOutput, ListOutputMeta
+from src.application.read_models import (
+    CastMemberReadModel,
+    CategoryReadModel,
+    GenreReadModel,
+    ReadModelListOutput,
+    VideoReadModel,
+)
+from src.benchmarks.read_models import cast_member_source, category_source, genre_source, video_source
+from src.domain.cast_member import CastMember
+from src.domain.category import Category
+from src.domain.genre import Genre
+from src.domain.video import Video
+
+
+@pytest.mark.parametrize(
+    "read_model, entity, make_source",
+    [
+        (VideoReadModel, Video, video_source),
+        (GenreReadModel, Genre, genre_source),
+        (CategoryReadModel, Category, category_source),
+        (CastMemberReadModel, CastMember, cast_member_source),
+    ],
+)
+class TestReadModels:
+    def test_serialize_back_to_the_indexed_document(self, read_model, entity, make_source) -> None:
+        source = make_source()
+
+        assert read_model.from_source(source).to_dict() == source
+
+    def test_expose_the_same_fields_as_the_entity(self, read_model, entity, make_source) -> None:
+        assert {field.name for field in dataclasses.fields(read_model)} == set(entity.model_fields)
+
+    def test_are_slotted_and_read_only(self, read_model, entity, make_source) -> None:
+        model = read_model.from_source(make_source())
+
+        assert not hasattr(model, "__dict__")
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            model.id = "other"
+
+    def test_page_has_the_json_layout_of_the_entity_listing(self, read_model, entity, make_source) -> None:
+        sources = [make_source(), make_source()]
+        meta = ListOutputMeta(sort="name", next_cursor="cursor")
+
+        page = json.loads(ReadModelListOutput(data=[read_model.from_source(s) for s in sources], meta=meta).model_dump_json())
+        listing = json.loads(ListOutput[entity](data=[entity(**s) for s in sources], meta=meta).model_dump_json())
+
+        assert page["meta"] == listing["meta"]
+        assert [item["id"] for item in page["data"]] == [item["id"] for item in listing["data"]]
+        assert [set(item) for item in page["data"]] == [set(item) for item in listing["data"]]
\ No newline at end of file
@@ -0,0 +1,112 @@
+import threading
+import time
+from unittest.mock import create_autospec
+from uuid import uuid4
+
+import pytest
+
+from src.infra.codeflix_client.codeflix_client import CodeflixClient
+from src.infra.codeflix_client.dtos import VideoResponse
+from src.infra.codeflix_client.resilient_client import CircuitBreaker, CircuitOpenError, ResilientCodeflixClient
+from src.infra.codeflix_client.stub_server import video_payload
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def fail() -> None:
+    raise ConnectionError("upstream down")
+
+
+class TestCircuitBreaker:
+    @pytest.fixture
+    def clock(self) -> FakeClock:
+        return FakeClock()
+
+    @pytest.fixture
+    def breaker(self, clock: FakeClock) -> CircuitBreaker:
+        return CircuitBreaker(failure_rate=0.5, minimum_calls=4, open_duration=10, clock=clock)
+
+    def test_open_when_failure_rate_is_above_threshold(self, breaker: CircuitBreaker) -> None:
+        breaker.call(lambda: None)
+        for _ in range(3):
+            with pytest.raises(ConnectionError):
+                breaker.call(fail)
+
+        assert breaker.state == CircuitBreaker.OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.call(lambda: None)
+
+    def test_open_when_calls_are_too_slow(self, breaker: CircuitBreaker, clock: FakeClock) -> None:
+        def slow() -> None:
+            clock.now += breaker.slow_call_duration + 1
+
+        for _ in range(4):
+            breaker.call(slow)
+
+        assert breaker.state == CircuitBreaker.OPEN
+
+    def test_close_after_successful_trial_call(self, breaker: CircuitBreaker, clock: FakeClock) -> None:
+        for _ in range(4):
+            with pytest.raises(ConnectionError):
+                breaker.call(fail)
+
+        clock.now += 10
+        breaker.call(lambda: None)
+
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_open_again_after_failed_trial_call(self, breaker: CircuitBreaker, clock: FakeClock) -> None:
+        for _ in range(4):
+            with pytest.raises(ConnectionError):
+                breaker.call(fail)
+
+        clock.now += 10
+        with pytest.raises(ConnectionError):
+            breaker.call(fail)
+
+        assert breaker.state == CircuitBreaker.OPEN
+
+
+class TestResilientCodeflixClient:
+    def test_slow_request_is_hedged_and_first_answer_wins(self) -> None:
+        calls = []
+        first_call_released = threading.Event()
+
+        def get_video(id, updated_at=None) -> VideoResponse:
+            calls.append(id)
+            if len(calls) == 21:  # The request after the warm-up hangs
+                first_call_released.wait(timeout=5)
+            return VideoResponse(**video_payload(id))
+
+        client = create_autospec(CodeflixClient)
+        client.get_video.side_effect = get_video
+        resilient = ResilientCodeflixClient(client, min_hedge_delay=0.01)
+        for _ in range(20):
+            resilient.get_video(id=uuid4())
+
+        id = uuid4()
+        started = time.monotonic()
+        video = resilient.get_video(id=id)
+        first_call_released.set()
+
+        assert video.id == id
+        assert len(calls) == 22
+        assert time.monotonic() - started < 1
+
+    def test_fail_fast_while_circuit_is_open(self) -> None:
+        client = create_autospec(CodeflixClient)
+        client.get_videos.side_effect = ConnectionError("upstream down")
+        resilient = ResilientCodeflixClient(client, breaker=CircuitBreaker(minimum_calls=2))
+        for _ in range(2):
+            with pytest.raises(ConnectionError):
+                resilient.get_videos(ids=[uuid4()])
+
+        with pytest.raises(CircuitOpenError):
+            resilient.get_videos(ids=[uuid4()])
+        assert client.get_videos.call_count == 2
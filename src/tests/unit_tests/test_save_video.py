@@ -0,0 +1,66 @@
+from datetime import datetime
+from unittest.mock import create_autospec
+from uuid import UUID, uuid4
+
+import pytest
+
+from src.application.save_video import SaveVideo, SaveVideoInput
+from src.domain.video import Rating
+from src.domain.video_repository import VideoRepository
+from src.infra.codeflix_client.codeflix_client import CodeflixClient
+from src.infra.codeflix_client.dtos import VideoResponse
+from src.infra.codeflix_client.stub_server import video_payload
+
+
+def make_input() -> SaveVideoInput:
+    return SaveVideoInput(
+        id=uuid4(),
+        title="The Godfather",
+        launch_year=1972,
+        rating=Rating.AGE_18,
+        created_at=datetime.now(),
+        updated_at=datetime.now(),
+        is_active=True,
+    )
+
+
+class TestSaveVideo:
+    @pytest.fixture
+    def repository(self) -> VideoRepository:
+        repository = create_autospec(VideoRepository)
+        repository.save_many.return_value = 0
+        return repository
+
+    @pytest.fixture
+    def codeflix_client(self) -> CodeflixClient:
+        client = create_autospec(CodeflixClient)
+        client.get_video.side_effect = lambda id, updated_at: VideoResponse(**video_payload(id))
+        client.get_videos.side_effect = lambda ids, versions: {id: VideoResponse(**video_payload(id)) for id in ids}
+        return client
+
+    def test_save_enriched_video(self, repository: VideoRepository, codeflix_client: CodeflixClient) -> None:
+        input = make_input()
+
+        SaveVideo(repository=repository, codeflix_client=codeflix_client).execute(input=input)
+
+        video = repository.save.call_args.args[0]
+        assert video.id == input.id
+        assert video.genres == {UUID("442f2b4b-1b7b-4f3b-8eab-3f2f2b4b1b7b")}
+        assert str(video.banner_url) == "https://banner.com/the-godfather"
+
+    def test_enrich_whole_batch_at_once_before_saving_it(
+        self,
+        repository: VideoRepository,
+        codeflix_client: CodeflixClient,
+    ) -> None:
+        inputs = [make_input() for _ in range(3)]
+
+        SaveVideo(repository=repository, codeflix_client=codeflix_client).execute_many(inputs=inputs)
+
+        codeflix_client.get_videos.assert_called_once_with(
+            ids=[input.id for input in inputs],
+            versions={input.id: input.updated_at for input in inputs},
+        )
+        codeflix_client.get_video.assert_not_called()
+        videos = repository.save_many.call_args.args[0]
+        assert [video.id for video in videos] == [input.id for input in inputs]
@@ -0,0 +1,93 @@
+from unittest.mock import create_autospec
+
+import pytest
+from elasticsearch import Elasticsearch
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.application.timing import collect, record, timed
+from src.infra.api.http.server_timing import ServerTimingMiddleware
+from src.infra.elasticsearch import timed_search
+
+
+def parse_server_timing(header: str) -> dict[str, float]:
+    stages = {}
+    for entry in header.split(", "):
+        stage, duration = entry.split(";dur=")
+        stages[stage] = float(duration)
+    return stages
+
+
+class TestTimed:
+    def test_is_a_no_op_when_nothing_collects(self) -> None:
+        with timed("es"):
+            pass
+        record("es_took", 0.1)
+
+        with collect() as timings:
+            pass
+
+        assert timings.stages == {}
+
+    def test_adds_up_the_stages_timed_while_collecting(self) -> None:
+        with collect() as timings:
+            with timed("es"):
+                pass
+            with timed("es"):
+                pass
+            record("es_took", 0.002)
+
+        assert set(timings.stages) == {"es", "es_took"}
+        assert timings.stages["es"] >= 0
+        assert timings.stages["es_took"] == pytest.approx(0.002)
+
+    def test_timed_search_records_elasticsearch_took(self) -> None:
+        client = create_autospec(Elasticsearch)
+        client.search.return_value = {"took": 7, "hits": {"hits": []}}
+
+        with collect() as timings:
+            response = timed_search(client, index="categories", body={"query": {"match_all": {}}})
+
+        assert response == {"took": 7, "hits": {"hits": []}}
+        client.search.assert_called_once_with(index="categories", body={"query": {"match_all": {}}})
+        assert timings.stages["es_took"] == pytest.approx(0.007)
+        assert "es" in timings.stages
+
+
+class TestServerTimingMiddleware:
+    @pytest.fixture
+    def client(self) -> TestClient:
+        app = FastAPI()
+
+        @app.get("/sync")
+        def sync_endpoint() -> dict:
+            with timed("use_case"):
+                with timed("es"):
+                    record("es_took", 0.003)
+            return {"ok": True}
+
+        @app.get("/untimed")
+        async def untimed_endpoint() -> dict:
+            return {"ok": True}
+
+        return TestClient(ServerTimingMiddleware(app))
+
+    def test_reports_the_stages_timed_in_the_threadpool(self, client: TestClient) -> None:
+        response = client.get("/sync")
+
+        assert response.status_code == 200
+        stages = parse_server_timing(response.headers["Server-Timing"])
+        assert list(stages) == ["es_took", "es", "use_case", "render", "total"]
+        assert stages["es_took"] == 3.0
+        assert stages["total"] >= stages["use_case"] >= stages["es"]
+
+    def test_reports_only_the_total_without_stages(self, client: TestClient) -> None:
+        response = client.get("/untimed")
+
+        assert list(parse_server_timing(response.headers["Server-Timing"])) == ["total"]
+
+    def test_requests_do_not_share_timings(self, client: TestClient) -> None:
+        client.get("/sync")
+        response = client.get("/sync")
+
+        assert parse_server_timing(response.headers["Server-Timing"])["es_took"] == 3.0
\ No newline at end of file
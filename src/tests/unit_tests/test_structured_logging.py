@@ -0,0 +1,40 @@
+import json
+import logging
+
+from src.infra.structured_logging import SAMPLED, JsonFormatter, SamplingFilter, truncate
+
+
+def make_record(level: int = logging.INFO, msg: str = "Received %s", args: tuple = ("data",), **extra) -> logging.LogRecord:
+    record = logging.LogRecord("consumer", level, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+class TestTruncate:
+    def test_short_value_is_kept_whole(self) -> None:
+        assert str(truncate(b'{"id": 1}', limit=20)) == '{"id": 1}'
+
+    def test_long_value_is_cut_with_its_original_length(self) -> None:
+        assert str(truncate("x" * 100, limit=5)) == "xxxxx... (100 chars)"
+
+
+class TestSamplingFilter:
+    def test_sampled_records_are_kept_below_the_rate(self) -> None:
+        assert SamplingFilter(rate=0.1, rng=lambda: 0.05).filter(make_record(**SAMPLED)) is True
+        assert SamplingFilter(rate=0.1, rng=lambda: 0.5).filter(make_record(**SAMPLED)) is False
+
+    def test_records_not_flagged_as_sampled_are_always_kept(self) -> None:
+        assert SamplingFilter(rate=0, rng=lambda: 0.5).filter(make_record()) is True
+
+    def test_warnings_are_never_sampled_out(self) -> None:
+        assert SamplingFilter(rate=0, rng=lambda: 0.5).filter(make_record(logging.WARNING, **SAMPLED)) is True
+
+
+def test_json_formatter_emits_message_and_extra_fields() -> None:
+    line = JsonFormatter().format(make_record(topic="videos", **SAMPLED))
+
+    data = json.loads(line)
+    assert data["message"] == "Received data"
+    assert data["level"] == "INFO"
+    assert data["topic"] == "videos"
+    assert "sampled" not in data
@@ -0,0 +1,123 @@
+import gzip
+import io
+import itertools
+import json
+from pathlib import Path
+
+import pytest
+
+from src.benchmarks.synthetic_catalog import (
+    CatalogSize,
+    SyntheticCatalog,
+    change_events,
+    documents,
+    main,
+    produce_events,
+    write_bulk,
+)
+from src.domain.cast_member import CastMember
+from src.domain.category import Category
+from src.domain.genre import Genre
+from src.domain.video import Video
+from src.infra.kafka.in_memory_broker import InMemoryBroker, InMemoryProducer
+from src.infra.kafka.operation import Operation
+from src.infra.kafka.parser import parse_debezium_message
+
+SIZE = CatalogSize(categories=20, genres=15, cast_members=60, videos=30)
+
+
+@pytest.fixture
+def catalog() -> SyntheticCatalog:
+    return SyntheticCatalog(SIZE, seed=7)
+
+
+class TestSyntheticCatalog:
+    def test_same_catalog_for_a_seed(self, catalog: SyntheticCatalog) -> None:
+        assert list(documents(catalog)) == list(documents(SyntheticCatalog(SIZE, seed=7)))
+        assert list(documents(catalog)) != list(documents(SyntheticCatalog(SIZE, seed=8)))
+
+    def test_documents_are_valid_entities(self, catalog: SyntheticCatalog) -> None:
+        entities = {
+            "catalog-db.codeflix.categories": Category,
+            "catalog-db.codeflix.cast_members": CastMember,
+            # Categories are joined from the genre_categories index, as the genre repository does
+            "catalog-db.codeflix.genres": lambda **document: Genre(**document, categories=set()),
+            "catalog-db.codeflix.videos": Video,
+        }
+        counts: dict[str, int] = {}
+        for index, document in documents(catalog):
+            counts[index] = counts.get(index, 0) + 1
+            if index in entities:
+                entities[index](**document)
+
+        assert counts["catalog-db.codeflix.categories"] == 20
+        assert counts["catalog-db.codeflix.cast_members"] == 60
+        assert counts["catalog-db.codeflix.genres"] == 15
+        assert counts["catalog-db.codeflix.videos"] == 30
+
+    def test_videos_reference_existing_entities(self, catalog: SyntheticCatalog) -> None:
+        category_ids = {row["id"] for row in catalog.categories()}
+        cast_member_ids = {row["id"] for row in catalog.cast_members()}
+
+        for row, relations in catalog.videos():
+            assert 1 <= len(relations["video_categories"]) <= 3
+            assert {relation["category_id"] for relation in relations["video_categories"]} <= category_ids
+            assert {relation["cast_member_id"] for relation in relations["video_cast_members"]} <= cast_member_ids
+            assert [banner["video_id"] for banner in relations["video_banners"]] == [row["id"]]
+
+    def test_rows_are_generated_lazily(self) -> None:
+        catalog = SyntheticCatalog(CatalogSize(categories=20, genres=15, cast_members=10**9, videos=10**9))
+
+        assert len(list(itertools.islice(catalog.videos(), 3))) == 3
+
+
+class TestChangeEvents:
+    def test_events_are_parsed_by_the_consumer(self, catalog: SyntheticCatalog) -> None:
+        for topic, key, value in change_events(catalog):
+            event = parse_debezium_message(json.dumps(value).encode())
+
+            assert event is not None
+            assert event.operation == Operation.CREATE
+            assert topic == f"catalog-db.codeflix.{event.source['table']}"
+
+    def test_relations_are_keyed_by_video_and_follow_their_video(self, catalog: SyntheticCatalog) -> None:
+        seen_videos = set()
+        for topic, key, value in change_events(catalog):
+            row = value["payload"]["after"]
+            if topic == "catalog-db.codeflix.videos":
+                assert key == {"payload": {"id": row["id"]}}
+                seen_videos.add(row["id"])
+            elif topic.startswith("catalog-db.codeflix.video_"):
+                assert key == {"payload": {"video_id": row["video_id"]}}
+                assert row["video_id"] in seen_videos
+
+    def test_produce_to_a_broker(self, catalog: SyntheticCatalog) -> None:
+        broker = InMemoryBroker()
+
+        produced = produce_events(catalog, InMemoryProducer(broker))
+
+        assert produced == sum(1 for _ in change_events(catalog))
+        assert len(broker.messages("catalog-db.codeflix.videos")) == 30
+        assert len(broker.messages("catalog-db.codeflix.video_banners")) == 30
+
+
+class TestOutput:
+    def test_bulk_ndjson_alternates_actions_and_documents(self, catalog: SyntheticCatalog) -> None:
+        output = io.StringIO()
+
+        written = write_bulk(catalog, output)
+
+        lines = output.getvalue().splitlines()
+        assert len(lines) == 2 * written
+        action, document = json.loads(lines[0]), json.loads(lines[1])
+        assert action == {"index": {"_index": "catalog-db.codeflix.categories", "_id": document["id"]}}
+
+    def test_cli_writes_compressed_events(self, tmp_path: Path) -> None:
+        path = tmp_path / "events.ndjson.gz"
+
+        assert main(["--videos", "5", "--format", "debezium", "-o", str(path)]) == 0
+
+        with gzip.open(path, "rt") as file:
+            first = json.loads(file.readline())
+        assert first["topic"] == "catalog-db.codeflix.categories"
+        assert first["value"]["payload"]["op"] == "c"
\ No newline at end of file